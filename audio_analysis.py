@@ -0,0 +1,285 @@
+"""
+audio_analysis.py - Analyse audio par blocs (FFT) pour les effets réactifs au son
+
+Un thread lit la source par blocs (fichier WAV cadencé en temps réel, ou flux PCM brut
+quelconque : tube, socket...), calcule la FFT de chaque bloc et en déduit :
+    - l'énergie de chaque bande de fréquences, normalisée dans [0, 1] par un gain automatique
+    - les attaques (onsets) : flux spectral au-dessus de sa moyenne récente
+Les mesures sont publiées sous forme d'un objet AudioFeatures immuable, remplacé à chaque bloc :
+le moteur lit la dernière mesure sans verrou. La durée d'analyse et la latence sont mesurées.
+"""
+import array
+import cmath
+import math
+import sys
+import threading
+import time
+import wave
+from collections import deque
+from config import AUDIO_CONFIG
+
+PEAK_FLOOR = 1e-9
+
+class FFT:
+    """FFT radix 2 sur des blocs de taille fixe (tables de permutation et de rotation précalculées)"""
+
+    def __init__(self, size):
+        if size < 2 or size & (size - 1):
+            raise ValueError(f"taille de bloc FFT non puissance de 2: {size}")
+        self.size = size
+        bits = size.bit_length() - 1
+        self.reverse = [int(format(i, f'0{bits}b')[::-1], 2) for i in range(size)]
+        self.twiddles = [cmath.exp(-2j * math.pi * k / size) for k in range(size // 2)]
+        self.window = [0.5 - 0.5 * math.cos(2 * math.pi * i / (size - 1)) for i in range(size)]
+
+    def magnitudes(self, samples):
+        """Module des size // 2 premiers coefficients d'un bloc fenêtré (Hann)"""
+        size = self.size
+        window = self.window
+        data = [complex(samples[i] * window[i]) for i in self.reverse]
+        twiddles = self.twiddles
+        half = 1
+        while half < size:
+            stride = size // (2 * half)
+            factors = twiddles[::stride][:half]
+            for start in range(0, size, 2 * half):
+                for k in range(half):
+                    top = start + k
+                    product = factors[k] * data[top + half]
+                    data[top + half] = data[top] - product
+                    data[top] += product
+            half *= 2
+        return [abs(value) for value in data[:size // 2]]
+
+def _decode_pcm(frames, sample_width, channels):
+    """Convertit des octets PCM entrelacés en échantillons mono dans [-1, 1]"""
+    if sample_width == 1:
+        values = [value - 128 for value in frames]
+        scale = 128.0
+    elif sample_width == 2:
+        values = array.array('h', frames)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        scale = 32768.0
+    elif sample_width == 3:
+        values = [int.from_bytes(frames[i:i + 3], 'little', signed=True)
+                  for i in range(0, len(frames) - 2, 3)]
+        scale = 8388608.0
+    elif sample_width == 4:
+        values = array.array('i', frames)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        scale = 2147483648.0
+    else:
+        raise ValueError(f"largeur d'échantillon non prise en charge: {sample_width}")
+    if channels == 1:
+        return [value / scale for value in values]
+    scale *= channels
+    return [sum(values[i:i + channels]) / scale for i in range(0, len(values) - channels + 1, channels)]
+
+class WavSource:
+    """Fichier WAV PCM lu par blocs, cadencé en temps réel (ou au plus vite hors ligne)"""
+
+    def __init__(self, path, realtime=True, loop=None):
+        self.path = path
+        self.realtime = realtime
+        self.loop = AUDIO_CONFIG['loop'] if loop is None else loop
+        try:
+            self._wave = wave.open(path, 'rb')
+        except (wave.Error, EOFError) as e:
+            raise ValueError(f"fichier WAV PCM invalide: {e}") from None
+        self.sample_rate = self._wave.getframerate()
+        self.sample_width = self._wave.getsampwidth()
+        self.channels = self._wave.getnchannels()
+        self._started = None
+        self._position = 0
+
+    def read(self, count):
+        """Retourne le bloc suivant (mono, [-1, 1]) et l'instant où il a fini d'être joué ; None à la fin"""
+        frames = self._wave.readframes(count)
+        if len(frames) < count * self.sample_width * self.channels:
+            if not self.loop:
+                return None
+            self._wave.rewind()
+            frames = self._wave.readframes(count)
+            if len(frames) < count * self.sample_width * self.channels:
+                return None
+        if self._started is None:
+            self._started = time.perf_counter()
+        self._position += count
+        played_at = self._started + self._position / self.sample_rate
+        if self.realtime:
+            delay = played_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return _decode_pcm(frames, self.sample_width, self.channels), played_at
+
+    def close(self):
+        """Ferme le fichier"""
+        self._wave.close()
+
+class PCMStreamSource:
+    """Flux PCM brut entrelacé (par ex. la sortie d'un enregistreur redirigée dans un tube)"""
+
+    def __init__(self, stream, sample_rate, sample_width=2, channels=1):
+        self.stream = stream
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+
+    def read(self, count):
+        """Bloc suivant (mono, [-1, 1]) et instant de réception ; None à la fin du flux"""
+        size = count * self.sample_width * self.channels
+        frames = b''
+        while len(frames) < size:
+            chunk = self.stream.read(size - len(frames))
+            if not chunk:
+                return None
+            frames += chunk
+        return _decode_pcm(frames, self.sample_width, self.channels), time.perf_counter()
+
+    def close(self):
+        """Ferme le flux"""
+        self.stream.close()
+
+class AudioFeatures:
+    """Mesures d'un bloc : énergies normalisées par bande, attaque, nombre d'attaques depuis le début"""
+
+    __slots__ = ('timestamp', 'levels', 'onset', 'onset_count')
+
+    def __init__(self, timestamp, levels, onset, onset_count):
+        self.timestamp = timestamp
+        self.levels = levels
+        self.onset = onset
+        self.onset_count = onset_count
+
+class AudioAnalyzer:
+    """Thread d'analyse : lit la source par blocs et publie la dernière mesure"""
+
+    def __init__(self, source, block_size=None):
+        self.source = source
+        self.block_size = block_size or AUDIO_CONFIG['block_size']
+        self.fft = FFT(self.block_size)
+        resolution = source.sample_rate / self.block_size
+        self.bands = {name: (max(1, int(low / resolution)),
+                             max(2, min(self.block_size // 2, int(high / resolution) + 1)))
+                      for name, (low, high) in AUDIO_CONFIG['bands'].items()}
+
+        self.features = AudioFeatures(0.0, {name: 0.0 for name in self.bands}, False, 0)
+        self.peaks = {name: PEAK_FLOOR for name in self.bands}
+        self.previous = None
+        self.flux_history = deque(maxlen=AUDIO_CONFIG['onset_history'])
+        self.last_onset = -math.inf
+        self.onset_count = 0
+
+        self.blocks = 0
+        self.analysis_total = 0.0
+        self.analysis_max = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread d'analyse"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="audio-analysis", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête l'analyse et ferme la source"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.source.close()
+
+    def is_running(self):
+        """Indique si l'analyse est en cours"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """Boucle de lecture et d'analyse des blocs"""
+        try:
+            while self._running:
+                block = self.source.read(self.block_size)
+                if block is None:
+                    break
+                self.analyze(*block)
+        except (OSError, ValueError, EOFError, wave.Error) as e:
+            print(f"Erreur d'analyse audio: {e}")
+        self._running = False
+
+    def analyze(self, samples, captured_at):
+        """Analyse un bloc et publie ses mesures"""
+        started = time.perf_counter()
+        spectrum = self.fft.magnitudes(samples)
+
+        decay = AUDIO_CONFIG['peak_decay']
+        levels = {}
+        for name, (low, high) in self.bands.items():
+            energy = sum(value * value for value in spectrum[low:high]) / (high - low)
+            peak = max(energy, self.peaks[name] * decay, PEAK_FLOOR)
+            self.peaks[name] = peak
+            levels[name] = energy / peak
+
+        onset = False
+        if self.previous is not None:
+            flux = sum(value - before for value, before in zip(spectrum, self.previous) if value > before)
+            history = self.flux_history
+            if len(history) >= history.maxlen // 2:
+                mean = sum(history) / len(history)
+                deviation = math.sqrt(sum((value - mean) ** 2 for value in history) / len(history))
+                threshold = mean + AUDIO_CONFIG['onset_sensitivity'] * deviation
+                if flux > threshold and captured_at - self.last_onset >= AUDIO_CONFIG['min_onset_interval']:
+                    onset = True
+                    self.last_onset = captured_at
+                    self.onset_count += 1
+            history.append(flux)
+        self.previous = spectrum
+
+        self.features = AudioFeatures(captured_at, levels, onset, self.onset_count)
+
+        finished = time.perf_counter()
+        analysis = finished - started
+        latency = max(0.0, finished - captured_at)
+        self.blocks += 1
+        self.analysis_total += analysis
+        self.analysis_max = max(self.analysis_max, analysis)
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def get_status(self):
+        """Coût d'analyse et latence (ms) : moyenne et maximum, plus la durée d'un bloc"""
+        blocks = max(1, self.blocks)
+        return {
+            'running': self.is_running(),
+            'blocks': self.blocks,
+            'onsets': self.onset_count,
+            'block_ms': self.block_size * 1000 / self.source.sample_rate,
+            'analysis_avg_ms': self.analysis_total * 1000 / blocks,
+            'analysis_max_ms': self.analysis_max * 1000,
+            'latency_avg_ms': self.latency_total * 1000 / blocks,
+            'latency_max_ms': self.latency_max * 1000,
+            'levels': dict(self.features.levels)
+        }
+
+    def format_status(self):
+        """Ligne d'état pour l'incrustation"""
+        status = self.get_status()
+        return (f"audio: bloc {status['block_ms']:.1f} ms, analyse {status['analysis_avg_ms']:.2f} ms "
+                f"(max {status['analysis_max_ms']:.2f}), latence {status['latency_avg_ms']:.1f} ms, "
+                f"{status['onsets']} attaques")
+
+def open_audio(path=None, realtime=True):
+    """Ouvre l'analyse d'un fichier WAV, ou de l'entrée standard (PCM brut) si path vaut '-'"""
+    path = path or AUDIO_CONFIG['source']
+    if path == '-':
+        source = PCMStreamSource(sys.stdin.buffer, AUDIO_CONFIG['stream_rate'],
+                                 AUDIO_CONFIG['stream_width'], AUDIO_CONFIG['stream_channels'])
+    else:
+        source = WavSource(path, realtime=realtime)
+    return AudioAnalyzer(source)
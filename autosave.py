@@ -0,0 +1,135 @@
+"""
+autosave.py - Sauvegarde automatique de l'état en direct dans un thread de fond
+"""
+import json
+import os
+import threading
+import time
+from config import AUTOSAVE_CONFIG, FILES_CONFIG
+
+class AutosaveManager:
+    """Capture l'état à chaque tick et l'écrit sur disque depuis un thread dédié"""
+
+    def __init__(self, projectors, effects_manager, autosave_file=None):
+        self.projectors = projectors
+        self.effects_manager = effects_manager
+        self.autosave_file = autosave_file or FILES_CONFIG['autosave_file']
+        self.interval = AUTOSAVE_CONFIG['interval'] / 1000.0
+
+        self.last_snapshot = None
+        self.last_snapshot_time = 0.0
+        self.pending = None
+        self.writes = 0
+        self.skipped = 0
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread d'écriture"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop, name="autosave", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le thread d'écriture après avoir écrit le dernier état en attente"""
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        self._flush()
+
+    def tick(self, force=False):
+        """Appelé à chaque tick : capture un instantané léger si l'intervalle est écoulé (ou si force)"""
+        now = time.monotonic()
+        if not force and now - self.last_snapshot_time < self.interval:
+            return
+        self.last_snapshot_time = now
+
+        snapshot = self.take_snapshot()
+        if snapshot == self.last_snapshot:
+            self.skipped += 1
+            return
+        self.last_snapshot = snapshot
+
+        with self._lock:
+            self.pending = snapshot
+        self._wakeup.set()
+
+    def take_snapshot(self):
+        """Capture l'état courant sous une forme comparable (sans sérialisation)"""
+        projectors = tuple(
+            (proj_id, projector.base_color, projector.is_on, projector.intensity)
+            for proj_id, projector in self.projectors.items()
+        )
+        effects = None
+        if self.effects_manager:
+            effects = self.effects_manager.get_state()
+        return (projectors, effects)
+
+    def _writer_loop(self):
+        """Boucle du thread d'écriture : écrit uniquement le dernier instantané en attente"""
+        while self._running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self._flush()
+
+    def _flush(self):
+        """Sérialise et écrit l'instantané en attente (les précédents sont fusionnés)"""
+        with self._lock:
+            snapshot = self.pending
+            self.pending = None
+        if snapshot is None:
+            return
+        self._write(snapshot)
+
+    def _write(self, snapshot):
+        """Écrit un instantané de manière atomique"""
+        projectors, effects = snapshot
+        state = {
+            'projectors': {
+                str(proj_id): {'color': color, 'is_on': is_on, 'intensity': intensity}
+                for proj_id, color, is_on, intensity in projectors
+            },
+            'effects': effects,
+            'saved_at': time.time()
+        }
+        temp_file = f"{self.autosave_file}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.autosave_file)
+            self.writes += 1
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde automatique: {e}")
+
+    def load_snapshot(self):
+        """Lit le dernier état sauvegardé automatiquement (None si absent ou invalide)"""
+        try:
+            if os.path.exists(self.autosave_file):
+                with open(self.autosave_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                if isinstance(state, dict) and 'projectors' in state:
+                    return state
+        except Exception as e:
+            print(f"Erreur lors de la lecture de la sauvegarde automatique: {e}")
+        return None
+
+    def restore(self, scene_manager):
+        """Restaure le dernier état sauvegardé au démarrage"""
+        state = self.load_snapshot()
+        if state is None:
+            return False
+        try:
+            scene_manager.apply_scene_data(state)
+        except Exception as e:
+            print(f"Erreur lors de la restauration de la sauvegarde automatique: {e}")
+            return False
+        self.last_snapshot = self.take_snapshot()
+        return True
@@ -0,0 +1,103 @@
+"""
+beat_clock.py - Horloge de tempo (BPM, tap tempo) avec phase de temps et de mesure
+
+La position est exprimée en temps (beats) depuis une origine sur la base de temps de l'horloge
+(monotone par défaut, heure de spectacle quand une horloge partagée est associée) :
+    position = (maintenant - origine) * bpm / 60
+Un changement de tempo recalcule l'origine pour que la position courante soit conservée :
+la phase reste continue, seule la vitesse change.
+"""
+import time
+from collections import deque
+from config import BEAT_CONFIG
+
+class BeatClock:
+    """Tempo, temps par mesure et phase, sur l'horloge monotone ou une horloge de spectacle"""
+
+    def __init__(self, bpm=None, beats_per_bar=None):
+        self.bpm = float(bpm or BEAT_CONFIG['default_bpm'])
+        self.beats_per_bar = beats_per_bar or BEAT_CONFIG['beats_per_bar']
+        self.time_source = time.monotonic
+        self.origin = self.time_source()
+        self.taps = deque(maxlen=BEAT_CONFIG['tap_history'])
+
+    def position(self, now=None):
+        """Nombre de temps (fractionnaire) écoulés depuis l'origine"""
+        now = self.time_source() if now is None else now
+        return (now - self.origin) * self.bpm / 60.0
+
+    def beat_phase(self, now=None):
+        """Phase dans le temps courant, dans [0, 1)"""
+        return self.position(now) % 1.0
+
+    def bar_phase(self, now=None):
+        """Phase dans la mesure courante, dans [0, 1)"""
+        return (self.position(now) % self.beats_per_bar) / self.beats_per_bar
+
+    def beat_in_bar(self, now=None):
+        """Numéro du temps dans la mesure (0 pour le premier temps)"""
+        return int(self.position(now) % self.beats_per_bar)
+
+    def set_bpm(self, bpm, now=None):
+        """Change le tempo sans saut de phase ; retourne le tempo retenu"""
+        now = self.time_source() if now is None else now
+        bpm = max(BEAT_CONFIG['min_bpm'], min(BEAT_CONFIG['max_bpm'], float(bpm)))
+        position = self.position(now)
+        self.bpm = bpm
+        self.origin = now - position * 60.0 / bpm
+        return self.bpm
+
+    def tap(self, now=None):
+        """Frappe de tap tempo : au-delà de deux frappes rapprochées, le tempo suit leur intervalle moyen
+
+        Retourne le tempo courant. Une frappe isolée (après tap_timeout secondes) repart de zéro.
+        """
+        now = self.time_source() if now is None else now
+        if self.taps and now - self.taps[-1] > BEAT_CONFIG['tap_timeout']:
+            self.taps.clear()
+        self.taps.append(now)
+        if len(self.taps) >= 2:
+            interval = (self.taps[-1] - self.taps[0]) / (len(self.taps) - 1)
+            if interval > 0:
+                self.set_bpm(60.0 / interval, now)
+        return self.bpm
+
+    def downbeat(self, now=None):
+        """Place le premier temps de la mesure à l'instant présent (recalage explicite de l'opérateur)"""
+        self.origin = self.time_source() if now is None else now
+
+    def set_time_source(self, time_source):
+        """Change de base de temps (fonction sans argument, en secondes) sans saut de phase"""
+        position = self.position()
+        self.time_source = time_source
+        self.origin = time_source() - position * 60.0 / self.bpm
+
+    def align(self, origin, bpm, beats_per_bar=None):
+        """Reprend l'origine et le tempo d'une autre console (même base de temps partagée)"""
+        if beats_per_bar:
+            self.set_beats_per_bar(beats_per_bar)
+        if (origin, bpm) != (self.origin, self.bpm):
+            self.bpm = float(bpm)
+            self.origin = origin
+
+    def set_beats_per_bar(self, beats_per_bar):
+        """Change le nombre de temps par mesure"""
+        self.beats_per_bar = max(1, int(beats_per_bar))
+        return self.beats_per_bar
+
+    def get_state(self):
+        """Retourne le tempo pour sauvegarde (la phase n'est pas sauvegardée)"""
+        return {'bpm': self.bpm, 'beats_per_bar': self.beats_per_bar}
+
+    def set_state(self, state):
+        """Restaure le tempo sans saut de phase"""
+        if 'beats_per_bar' in state:
+            self.set_beats_per_bar(state['beats_per_bar'])
+        if 'bpm' in state:
+            self.set_bpm(state['bpm'])
+
+    def format_status(self, now=None):
+        """Ligne d'état : tempo et position dans la mesure"""
+        position = self.position(now)
+        beat = int(position % self.beats_per_bar) + 1
+        return f"{self.bpm:.1f} BPM {beat}/{self.beats_per_bar}"
@@ -0,0 +1,247 @@
+"""
+benchmarks.py - Mesures de performance : boucle des effets, rendu, entrées/sorties des scènes
+
+    python benchmarks.py                              # balayage complet, résultats JSON
+    python benchmarks.py --output bench.json          # écrit les résultats dans un fichier
+    python benchmarks.py --baseline bench.json        # compare à une référence (code 1 si régression)
+    python benchmarks.py --quick                      # balayage réduit
+
+Le rendu du canevas (ProjectorDisplay) nécessite un affichage : un serveur X virtuel (Xvfb)
+est lancé s'il est disponible, sinon ces mesures sont ignorées.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from config import BENCHMARK_CONFIG
+
+def measure(function, repeat, number):
+    """Chronomètre une fonction ; retourne les statistiques par appel (ms)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - started) * 1000 / number)
+    return {
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+        'max_ms': max(timings),
+        'repeat': repeat,
+        'number': number
+    }
+
+def calls_for(count, budget=20000):
+    """Nombre d'appels par mesure, adapté à la taille du problème"""
+    return max(1, budget // max(1, count))
+
+def make_projectors(count):
+    """Crée des projecteurs allumés aux couleurs variées"""
+    from projector import Projector
+    projectors = {}
+    for i in range(count):
+        projector = Projector(i)
+        projector.set_color(f"#{(i * 37) % 256:02x}{(i * 91) % 256:02x}{(i * 53) % 256:02x}")
+        projector.set_intensity(20 + i % 80)
+        projector.turn_on()
+        projectors[i] = projector
+    return projectors
+
+def bench_effects(counts, repeat):
+    """process_all_effects sans effet, avec fondu + chaser et avec clignotements"""
+    from effects_manager import EffectsManager
+    results = {}
+    for count in counts:
+        projectors = make_projectors(count)
+        scenarios = {
+            'idle': lambda manager: None,
+            'fade_chaser': lambda manager: (manager.toggle_fade(), manager.toggle_chaser()),
+            'blinks': lambda manager: [manager.toggle_blink(i) for i in range(0, count, 2)]
+        }
+        for name, setup in scenarios.items():
+            manager = EffectsManager(projectors)
+            setup(manager)
+            results[f"process_all_effects[{name},n={count}]"] = measure(
+                manager.process_all_effects, repeat, calls_for(count))
+    return results
+
+def bench_dimmed_color(counts, repeat):
+    """get_dimmed_color sur tous les projecteurs"""
+    results = {}
+    for count in counts:
+        projectors = list(make_projectors(count).values())
+
+        def run():
+            for projector in projectors:
+                projector.get_dimmed_color()
+        results[f"get_dimmed_color[n={count}]"] = measure(run, repeat, calls_for(count))
+    return results
+
+def start_virtual_display():
+    """Lance Xvfb si aucun affichage n'est disponible ; retourne le processus ou None"""
+    if os.environ.get('DISPLAY') or not shutil.which('Xvfb'):
+        return None
+    display = BENCHMARK_CONFIG['virtual_display']
+    process = subprocess.Popen(['Xvfb', display, '-screen', '0', '1280x1024x24'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ['DISPLAY'] = display
+    return process
+
+def bench_display(counts, repeat):
+    """update_all_projectors (toutes couleurs changées) et show_frame (trame inchangée)"""
+    import tkinter as tk
+    from engine import Frame
+    from gui_components import ProjectorDisplay
+
+    xvfb = start_virtual_display()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        if xvfb is not None:
+            xvfb.terminate()
+        return {}, f"affichage indisponible: {e}"
+
+    results = {}
+    try:
+        root.withdraw()
+        for count in counts:
+            canvas = tk.Canvas(root, width=800, height=120)
+            projectors = make_projectors(count)
+            display = ProjectorDisplay(canvas, projectors)
+            colors = ['#ff0000', '#0000ff']
+            state = {'flip': 0}
+
+            def repaint():
+                state['flip'] ^= 1
+                for projector in projectors.values():
+                    projector.color = colors[state['flip']]
+                display.update_all_projectors()
+                root.update_idletasks()
+            results[f"update_all_projectors[n={count}]"] = measure(repaint, repeat, calls_for(count, 2000))
+
+            frame = Frame(1, 0.0, tuple(projectors.keys()),
+                          tuple(p.get_dimmed_color() for p in projectors.values()))
+            display.show_frame(frame)
+            results[f"show_frame_static[n={count}]"] = measure(
+                lambda: display.show_frame(frame), repeat, calls_for(count))
+            canvas.destroy()
+    finally:
+        root.destroy()
+        if xvfb is not None:
+            xvfb.terminate()
+    return results, None
+
+def bench_scenes(library_sizes, fixture_count, repeat):
+    """SceneManager : sauvegarde, chargement, import et recherche selon la taille de la bibliothèque"""
+    from effects_manager import EffectsManager
+    from scene_manager import SceneManager
+
+    results = {}
+    previous_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for size in library_sizes:
+                projectors = make_projectors(fixture_count)
+                effects = EffectsManager(projectors)
+                manager = SceneManager(projectors, effects)
+                for i in range(size):
+                    manager.scenes[f"Scene_{i:05d}"] = {
+                        'projectors': {str(j): p.get_state() for j, p in projectors.items()},
+                        'effects': effects.get_state()
+                    }
+                manager.index.rebuild(manager.scenes)
+                manager.save_scenes_to_file()
+                manager.export_scenes('export.json')
+
+                number = max(1, 200 // size)
+                results[f"save_scene[library={size}]"] = measure(
+                    lambda: manager.save_scene('Bench'), repeat, number)
+                results[f"load_scene[library={size}]"] = measure(
+                    lambda: manager.load_scene('Scene_00000'), repeat, calls_for(fixture_count, 2000))
+                results[f"load_scenes_from_file[library={size}]"] = measure(
+                    manager.load_scenes_from_file, repeat, number)
+                results[f"import_scenes[library={size}]"] = measure(
+                    lambda: manager.import_scenes('export.json'), repeat, number)
+                results[f"find_scenes[library={size}]"] = measure(
+                    lambda: manager.find_scenes(color='#000000', prefix='Scene_0'), repeat, 100)
+        finally:
+            os.chdir(previous_directory)
+    return results
+
+def compare(results, baseline, threshold):
+    """Compare aux résultats de référence ; retourne la liste des régressions"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference or reference['median_ms'] <= 0:
+            continue
+        ratio = result['median_ms'] / reference['median_ms']
+        result['baseline_ratio'] = ratio
+        if ratio > 1 + threshold:
+            regressions.append((name, reference['median_ms'], result['median_ms'], ratio))
+    return regressions
+
+def run(quick=False):
+    """Exécute tout le balayage ; retourne le rapport"""
+    config = BENCHMARK_CONFIG
+    counts = config['quick_fixture_counts'] if quick else config['fixture_counts']
+    libraries = config['quick_library_sizes'] if quick else config['library_sizes']
+    repeat = config['repeat']
+
+    results = {}
+    results.update(bench_effects(counts, repeat))
+    results.update(bench_dimmed_color(counts, repeat))
+    display_results, skipped = bench_display(counts, repeat)
+    results.update(display_results)
+    results.update(bench_scenes(libraries, config['scene_fixture_count'], repeat))
+
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'quick': quick,
+            'display_skipped': skipped
+        },
+        'results': results
+    }
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Mesures de performance de LightControl")
+    parser.add_argument('--output', help="fichier JSON de résultats")
+    parser.add_argument('--baseline', help="fichier JSON de référence à comparer")
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_CONFIG['regression_threshold'],
+                        help="ralentissement toléré (0.2 = +20%%)")
+    parser.add_argument('--quick', action='store_true', help="balayage réduit")
+    args = parser.parse_args()
+
+    report = run(args.quick)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report['results'], json.load(f), args.threshold)
+        report['regressions'] = [name for name, *_ in regressions]
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for name, reference, current, ratio in regressions:
+        print(f"RÉGRESSION {name}: {reference:.3f} ms → {current:.3f} ms (x{ratio:.2f})",
+              file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+chase_patterns.py - Motifs de chaser programmables compilés en tables de masques
+
+Un motif est une liste de pas ; chaque pas allume un ensemble de projecteurs, avec une couleur
+optionnelle. À l'activation, le motif est compilé en une table pas × projecteurs (un masque de
+bits par position du cycle, comme blink_mask) : par tick, le chaser fait une seule lecture indexée.
+    sequence : les pas dans l'ordre
+    bounce   : aller-retour, sans répéter les extrémités
+    random   : ordre aléatoire, chaque pas une fois par cycle, jamais deux fois de suite
+"""
+import random
+from color_space import validate_hex_color
+from config import EFFECTS_CONFIG
+from fixture_groups import mask_from_ids
+
+CHASE_MODES = ('sequence', 'bounce', 'random')
+
+def normalize_pattern(pattern, num_projectors):
+    """Valide une définition de motif et la remet sous forme canonique
+
+    Chaque pas est une liste d'identifiants ou {'fixtures': [...], 'color': '#rrggbb'}.
+    Sans pas fournis : un projecteur par pas, dans l'ordre des identifiants.
+    Lève ValueError si le mode, un pas ou une couleur est invalide.
+    """
+    mode = pattern.get('mode', 'sequence')
+    if mode not in CHASE_MODES:
+        raise ValueError(f"mode de chaser inconnu: {mode}")
+
+    raw_steps = pattern.get('steps')
+    if raw_steps is None:
+        raw_steps = [[i] for i in range(num_projectors)]
+
+    steps = []
+    for raw in raw_steps:
+        if isinstance(raw, dict):
+            fixtures, color = raw.get('fixtures', []), raw.get('color')
+        else:
+            fixtures, color = raw, None
+        fixtures = sorted({int(i) for i in fixtures} & set(range(num_projectors)))
+        if color is not None:
+            validate_hex_color(color)
+        steps.append({'fixtures': fixtures, 'color': color})
+    if not steps:
+        raise ValueError("motif de chaser sans pas")
+
+    normalized = {'mode': mode, 'steps': steps}
+    if mode == 'random':
+        normalized['seed'] = int(pattern.get('seed', 0))
+    return normalized
+
+def builtin_patterns(num_projectors):
+    """Motifs fournis d'office : un projecteur par pas, en aller-retour ou en ordre aléatoire"""
+    return {
+        'bounce': normalize_pattern({'mode': 'bounce'}, num_projectors),
+        'random': normalize_pattern({'mode': 'random'}, num_projectors)
+    }
+
+def _step_order(pattern):
+    """Ordre des pas sur un cycle complet du motif"""
+    count = len(pattern['steps'])
+    if pattern['mode'] == 'bounce':
+        return list(range(count)) + list(range(count - 2, 0, -1))
+    if pattern['mode'] == 'random':
+        rng = random.Random(pattern.get('seed', 0))
+        cycles = EFFECTS_CONFIG['chase_random_cycles']
+        order = []
+        for cycle_index in range(cycles):
+            cycle = list(range(count))
+            rng.shuffle(cycle)
+            while count > 1 and ((order and cycle[0] == order[-1]) or
+                                 (cycle_index == cycles - 1 and cycle[-1] == (order or cycle)[0])):
+                rng.shuffle(cycle)
+            order.extend(cycle)
+        return order
+    return list(range(count))
+
+class ChaseTable:
+    """Motif compilé : masque et couleur (None : couleur de base) de chaque position du cycle"""
+
+    def __init__(self, pattern):
+        step_masks = [mask_from_ids(step['fixtures']) for step in pattern['steps']]
+        step_colors = [step['color'] for step in pattern['steps']]
+        order = _step_order(pattern)
+        self.masks = [step_masks[i] for i in order]
+        self.colors = [step_colors[i] for i in order]
+
+    def __len__(self):
+        return len(self.masks)
+
+    def lookup(self, position):
+        """Masque et couleur d'une position du cycle"""
+        position %= len(self.masks)
+        return self.masks[position], self.colors[position]
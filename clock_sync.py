@@ -0,0 +1,196 @@
+"""
+clock_sync.py - Horloge de spectacle partagée entre plusieurs consoles (meneur/suiveurs, UDP)
+
+Le suiveur envoie {"type": "sync_req", "t0": ...} ; le meneur répond avec son heure de
+spectacle t1, l'origine de phase des effets et, si un tempo lui est associé, l'origine des
+temps et le BPM. Le suiveur estime son décalage par t1 + rtt/2 - t2 en retenant l'échantillon
+de plus faible aller-retour.
+"""
+import json
+import socket
+import threading
+import time
+from collections import deque
+from config import EFFECTS_CONFIG, SYNC_CONFIG
+
+class ShowClock:
+    """Horloge de spectacle : temps monotone local corrigé d'un décalage, et origine de phase"""
+
+    def __init__(self, interval=None):
+        self.offset = 0.0
+        self.phase_origin = 0.0
+        self.interval = (interval or EFFECTS_CONFIG['loop_interval']) / 1000.0
+
+    def now(self):
+        """Retourne l'heure de spectacle (secondes)"""
+        return time.monotonic() + self.offset
+
+    def effect_tick(self, at=None):
+        """Retourne l'indice de tick des effets depuis l'origine de phase"""
+        show_time = self.now() if at is None else at
+        return int((show_time - self.phase_origin) // self.interval)
+
+    def tick_time(self, tick):
+        """Retourne l'heure de spectacle du début d'un tick des effets"""
+        return self.phase_origin + tick * self.interval
+
+    def next_tick_delay(self):
+        """Retourne le délai (secondes) jusqu'à la prochaine frontière de tick"""
+        elapsed = (self.now() - self.phase_origin) % self.interval
+        return self.interval - elapsed
+
+    def reset_phase(self):
+        """Place l'origine de phase des effets à l'instant présent"""
+        self.phase_origin = self.now()
+
+class ClockLeader:
+    """Répond aux demandes de synchronisation des suiveurs"""
+
+    def __init__(self, clock, host=None, port=None, beat_clock=None):
+        self.clock = clock
+        self.beat_clock = beat_clock
+        self.host = host or SYNC_CONFIG['host']
+        self.port = SYNC_CONFIG['port'] if port is None else port
+        self.requests = 0
+
+        self._socket = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Ouvre le socket UDP et démarre le thread de réponse ; retourne le port"""
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((self.host, self.port))
+        self._socket.settimeout(0.5)
+        self.port = self._socket.getsockname()[1]
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="clock-leader", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        """Arrête le meneur"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _serve(self):
+        """Boucle de réponse aux suiveurs"""
+        while self._running:
+            try:
+                data, address = self._socket.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            if message.get('type') != 'sync_req':
+                continue
+
+            self.requests += 1
+            response = {
+                'type': 'sync_resp',
+                't0': message.get('t0'),
+                't1': self.clock.now(),
+                'origin': self.clock.phase_origin,
+                'interval': self.clock.interval
+            }
+            if self.beat_clock is not None:
+                response.update({'beat_origin': self.beat_clock.origin, 'bpm': self.beat_clock.bpm,
+                                 'beats_per_bar': self.beat_clock.beats_per_bar})
+            try:
+                self._socket.sendto(json.dumps(response).encode('utf-8'), address)
+            except OSError as e:
+                print(f"Erreur d'envoi de synchronisation: {e}")
+
+class ClockFollower:
+    """Aligne l'horloge locale sur celle du meneur en compensant la latence mesurée"""
+
+    def __init__(self, clock, host=None, port=None, beat_clock=None):
+        self.clock = clock
+        self.beat_clock = beat_clock
+        self.host = host or SYNC_CONFIG['host']
+        self.port = SYNC_CONFIG['port'] if port is None else port
+        self.request_interval = SYNC_CONFIG['request_interval'] / 1000.0
+        self.samples = deque(maxlen=SYNC_CONFIG['samples'])
+
+        self.rtt = None
+        self.synchronized = False
+
+        self._socket = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Démarre le thread de synchronisation"""
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.settimeout(self.request_interval)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="clock-follower", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le suiveur"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0 + self.request_interval)
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _run(self):
+        """Envoie une demande à intervalle régulier et traite la réponse"""
+        while self._running:
+            started = time.monotonic()
+            self.sync_once()
+            remaining = self.request_interval - (time.monotonic() - started)
+            if remaining > 0 and self._running:
+                time.sleep(remaining)
+
+    def sync_once(self):
+        """Effectue un échange avec le meneur ; retourne True si l'horloge a été mise à jour"""
+        t0 = time.monotonic()
+        request = {'type': 'sync_req', 't0': t0}
+        try:
+            self._socket.sendto(json.dumps(request).encode('utf-8'), (self.host, self.port))
+            while True:
+                data, _ = self._socket.recvfrom(1024)
+                response = json.loads(data)
+                if response.get('type') == 'sync_resp' and response.get('t0') == t0:
+                    break
+        except (socket.timeout, OSError, ValueError):
+            return False
+        t2 = time.monotonic()
+
+        rtt = t2 - t0
+        offset = response['t1'] + rtt / 2 - t2
+        self.samples.append((rtt, offset))
+        self.apply_sample(response['origin'], response.get('interval'))
+        if self.beat_clock is not None and response.get('bpm'):
+            self.beat_clock.align(response['beat_origin'], response['bpm'], response.get('beats_per_bar'))
+        return True
+
+    def apply_sample(self, origin, interval=None):
+        """Applique le décalage de l'échantillon de plus faible aller-retour et l'origine de phase"""
+        self.rtt, self.clock.offset = min(self.samples)
+        self.clock.phase_origin = origin
+        if interval:
+            self.clock.interval = interval
+        self.synchronized = True
+
+    def get_status(self):
+        """Retourne l'état de synchronisation (décalage, aller-retour, erreur estimée en ms)"""
+        return {
+            'synchronized': self.synchronized,
+            'offset_ms': self.clock.offset * 1000,
+            'rtt_ms': (self.rtt or 0.0) * 1000,
+            'error_ms': (self.rtt or 0.0) * 500
+        }
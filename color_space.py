@@ -0,0 +1,80 @@
+"""
+color_space.py - Conversions RGB ↔ HSV par lots et tables précalculées pour les effets de couleur
+
+Les conversions opèrent sur des listes de couleurs : le gestionnaire d'effets convertit en un
+seul appel, à chaque tick, les couleurs de base des projecteurs absentes de son cache. Les
+effets évitent les fonctions trigonométriques par tick : la teinte est quantifiée et lue dans
+une table de composantes unitaires, puis combinée à la saturation et à la valeur par
+    canal = v * (1 - s + s * table[teinte])
+"""
+import colorsys
+import math
+import re
+
+HEX_COLOR = re.compile(r'#[0-9a-fA-F]{6}')
+
+def validate_hex_color(color):
+    """Retourne la couleur si elle est de la forme '#rrggbb', lève ValueError sinon"""
+    if not isinstance(color, str) or not HEX_COLOR.fullmatch(color):
+        raise ValueError(f"couleur invalide (format #rrggbb attendu): {color!r}")
+    return color
+
+def hex_to_rgb(hex_color):
+    """Convertit '#rrggbb' en tuple (r, g, b) 0-255"""
+    hex_color = hex_color.lstrip('#')
+    return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16))
+
+def rgb_to_hex(rgb):
+    """Convertit un tuple (r, g, b) 0-255 en '#rrggbb' (valeurs bornées)"""
+    r, g, b = (max(0, min(255, int(round(c)))) for c in rgb)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def rgb_to_hsv_batch(colors):
+    """Convertit une liste de couleurs '#rrggbb' en liste de (h, s, v) dans [0, 1]"""
+    return [colorsys.rgb_to_hsv(*(c / 255.0 for c in hex_to_rgb(color))) for color in colors]
+
+def hsv_to_rgb_batch(hsv_values):
+    """Convertit une liste de (h, s, v) en liste de couleurs '#rrggbb'"""
+    return [rgb_to_hex(tuple(c * 255.0 for c in colorsys.hsv_to_rgb(h, s, v)))
+            for h, s, v in hsv_values]
+
+class HueTable:
+    """Composantes unitaires (r, g, b) de chaque teinte pure, quantifiée sur un nombre de pas"""
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.units = [colorsys.hsv_to_rgb(i / steps, 1.0, 1.0) for i in range(steps)]
+        self.pure_colors = [rgb_to_hex(tuple(c * 255.0 for c in unit)) for unit in self.units]
+
+    def index(self, hue):
+        """Indice de table d'une teinte dans [0, 1]"""
+        return int(round(hue * self.steps)) % self.steps
+
+    def color(self, hue_index, saturation=1.0, value=1.0):
+        """Couleur '#rrggbb' d'un indice de teinte, pour une saturation et une valeur données"""
+        if saturation >= 1.0 and value >= 1.0:
+            return self.pure_colors[hue_index % self.steps]
+        r, g, b = self.units[hue_index % self.steps]
+        base = 1.0 - saturation
+        scale = 255.0 * value
+        return rgb_to_hex(((base + saturation * r) * scale,
+                           (base + saturation * g) * scale,
+                           (base + saturation * b) * scale))
+
+def kelvin_to_rgb(kelvin):
+    """Approximation du blanc d'un corps noir (1000 K - 40000 K) en (r, g, b) 0-255"""
+    temperature = max(1000, min(40000, kelvin)) / 100.0
+    if temperature <= 66:
+        r = 255.0
+        g = 99.4708025861 * math.log(temperature) - 161.1195681661
+        b = 0.0 if temperature <= 19 else 138.5177312231 * math.log(temperature - 10) - 305.0447927307
+    else:
+        r = 329.698727446 * (temperature - 60) ** -0.1332047592
+        g = 288.1221695283 * (temperature - 60) ** -0.0755148492
+        b = 255.0
+    return (max(0.0, min(255.0, r)), max(0.0, min(255.0, g)), max(0.0, min(255.0, b)))
+
+def build_temperature_table(minimum, maximum, step):
+    """Table {kelvin: '#rrggbb'} pour les températures de minimum à maximum"""
+    return {kelvin: rgb_to_hex(kelvin_to_rgb(kelvin))
+            for kelvin in range(minimum, maximum + 1, step)}
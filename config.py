@@ -18,17 +18,170 @@ DISPLAY_CONFIG = {
     'spacing': 20,
     'start_x': 20,
     'canvas_width': 820,
-    'canvas_height': 120
+    'canvas_height': 120,
+    'refresh_interval': 50
+}
+
+# === CONFIGURATION DU VISUALISEUR (PROCESSUS SÉPARÉ) ===
+VISUALIZER_CONFIG = {
+    'separate_process': False,
+    'ring_slots': 8,
+    'refresh_interval': 33
+}
+
+# === CONFIGURATION DE L'ENREGISTREMENT DES TRAMES ===
+RECORDER_CONFIG = {
+    'initial_capacity': 4096,
+    'file_pattern': 'recording_%Y%m%d_%H%M%S.lcrec'
+}
+
+# === CONFIGURATION DU PRÉ-CALCUL HORS LIGNE ===
+PRERENDER_CONFIG = {
+    'workers': None,
+    'chunks_per_worker': 4
+}
+
+# === CONFIGURATION DU CHRONOMÉTRAGE DES TICKS ===
+METRICS_CONFIG = {
+    'enabled': True,
+    'window': 1000,
+    'late_factor': 1.5,
+    'overlay_interval': 500,
+    'histogram_buckets_ms': [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100],
+    'export_pattern': 'metrics_%Y%m%d_%H%M%S.json'
+}
+
+# === CONFIGURATION DU DÉLESTAGE SOUS CHARGE ===
+SHEDDING_CONFIG = {
+    'enabled': True,
+    'smoothing': 0.2,
+    'high_water': 0.9,
+    'low_water': 0.6,
+    'raise_after': 3,
+    'recover_after': 20,
+    'secondary_divisor': 2,
+    'canvas_divisor': 3,
+    'input_limit': 64
+}
+
+# === CONFIGURATION DU DÉMARRAGE ===
+STARTUP_CONFIG = {
+    'background_scene_load': True,
+    'deferred_panels': True,
+    'report': True
+}
+
+# === CONFIGURATION DES MESURES DE PERFORMANCE ===
+BENCHMARK_CONFIG = {
+    'fixture_counts': [4, 16, 100, 1000, 10000],
+    'library_sizes': [10, 100, 1000, 10000],
+    'quick_fixture_counts': [4, 100],
+    'quick_library_sizes': [10, 100],
+    'scene_fixture_count': 16,
+    'repeat': 5,
+    'regression_threshold': 0.2,
+    'virtual_display': ':99'
 }
 
 # === CONFIGURATION DES EFFETS ===
+# Vitesses en ticks de loop_interval par cycle (ou par pas de chaser), indépendantes du nombre de projecteurs
 EFFECTS_CONFIG = {
     'loop_interval': 100,
-    'blink_speed': 10,
-    'strobe_speed': 6,
-    'fade_speed': 200,
-    'chaser_speed': 5, 
-    'default_fade_colors': ['#ff0000', "#0000ff"]
+    'blink_speed': 2,
+    'strobe_speed': 3,
+    'fade_speed': 50,
+    'chaser_speed': 1,
+    'default_fade_colors': ['#ff0000', "#0000ff"],
+    'hue_steps': 360,
+    'rainbow_speed': 100,
+    'rainbow_spread': 1.0,
+    'hue_rotate_speed': 100,
+    'saturation_pulse_speed': 40,
+    'saturation_pulse_min': 0.2,
+    'color_temperature': 3200,
+    'temperature_range': [1000, 12000, 100],
+    'chase_random_cycles': 8,
+    'hsv_cache_size': 1024
+}
+
+# === CONFIGURATION DU PIXEL MAPPING ===
+PIXELMAP_CONFIG = {
+    'layout_file': 'pixel_layout.json',
+    'preload_frames': 16,
+    'frame_ticks': 1
+}
+
+# === CONFIGURATION DU PROFILEUR À LA DEMANDE ===
+PROFILER_CONFIG = {
+    'default_seconds': 10,
+    'filename_pattern': 'profile_%Y%m%d_%H%M%S.prof',
+    'summary_lines': 40
+}
+
+# === CONFIGURATION DU TEMPO ===
+BEAT_CONFIG = {
+    'default_bpm': 120,
+    'beats_per_bar': 4,
+    'min_bpm': 20,
+    'max_bpm': 300,
+    'tap_timeout': 2.0,
+    'tap_history': 8,
+    'sync_divisions': {'strobe': 0.25, 'blink': 1, 'chaser': 1}
+}
+
+# === CONFIGURATION DE L'ANALYSE AUDIO ===
+AUDIO_CONFIG = {
+    'enabled': False,
+    'source': 'audio.wav',
+    'loop': True,
+    'block_size': 1024,
+    'bands': {'bass': [20, 250], 'mid': [250, 2000], 'high': [2000, 8000]},
+    'peak_decay': 0.995,
+    'onset_history': 43,
+    'onset_sensitivity': 1.5,
+    'min_onset_interval': 0.1,
+    'stream_rate': 44100,
+    'stream_width': 2,
+    'stream_channels': 1,
+    'dimmer_steps': 32,
+    'dimmer_floor': 0.1
+}
+
+# === CONFIGURATION DE LA SAUVEGARDE AUTOMATIQUE ===
+AUTOSAVE_CONFIG = {
+    'enabled': True,
+    'interval': 2000,
+    'restore_on_startup': True
+}
+
+# === CONFIGURATION DE L'HISTORIQUE (ANNULER/RÉTABLIR) ===
+HISTORY_CONFIG = {
+    'max_depth': 200,
+    'max_memory': 2 * 1024 * 1024,
+    'merge_window': 1000
+}
+
+# === CONFIGURATION DE LA FILE D'ENTRÉES ===
+INPUT_CONFIG = {
+    'latency_samples': 500
+}
+
+# === CONFIGURATION DU CONTRÔLE À DISTANCE ===
+REMOTE_CONFIG = {
+    'enabled': False,
+    'host': '127.0.0.1',
+    'port': 9750,
+    'max_message_size': 1024 * 1024,
+    'max_subscriber_backlog': 1024 * 1024
+}
+
+# === CONFIGURATION DE LA SYNCHRONISATION MULTI-CONSOLES ===
+SYNC_CONFIG = {
+    'role': None,
+    'host': '127.0.0.1',
+    'port': 9760,
+    'request_interval': 1000,
+    'samples': 8
 }
 
 # === CONFIGURATION DE L'INTERFACE ===
@@ -38,7 +191,9 @@ UI_CONFIG = {
     'background_color': '#1a1a1a',
     'panel_color': '#2a2a2a',
     'control_color': '#333333',
-    'quick_scenes_count': 6
+    'quick_scenes_count': 6,
+    'selector_page_size': 4,
+    'scene_prompt_max_names': 20
 }
 
 # === STYLES DES BOUTONS ===
@@ -85,6 +240,9 @@ BUTTON_STYLES = {
     'selected': {
         'bg': '#ff6600'
     },
+    'multi_selected': {
+        'bg': '#995500'
+    },
     'programmed': {
         'bg': '#006666'
     }
@@ -94,6 +252,9 @@ BUTTON_STYLES = {
 FILES_CONFIG = {
     'scenes_file': 'light_scenes.json',
     'config_file': 'app_config.json',
+    'autosave_file': 'autosave_state.json',
+    'groups_file': 'fixture_groups.json',
+    'watch_interval': 1000,
     'export_extension': '.json'
 }
 
@@ -111,6 +272,8 @@ MESSAGES = {
     'scene_loaded': 'Scène \'{name}\' chargée!',
     'scene_deleted': 'Scène \'{name}\' supprimée!',
     'scene_not_found': 'Scène \'{name}\' introuvable!',
+    'scene_matches': 'Plusieurs scènes commencent par \'{prefix}\':\n{scenes}',
+    'scene_list_truncated': '{scenes} … (+{count})',
     'scene_delete_error': 'Impossible de supprimer la scène \'{name}\'',
     'quick_scene_programmed': 'Scène rapide {number} programmée!',
     'quick_scene_loaded': 'Scène rapide {number} chargée!',
@@ -125,7 +288,18 @@ MESSAGES = {
     'invalid_scene_name': 'Le nom ne peut pas commencer par \'Quick_\'',
     'save_error': 'Erreur lors de la sauvegarde',
     'load_error': 'Erreur lors du chargement',
-    'delete_error': 'Erreur lors de la suppression'
+    'delete_error': 'Erreur lors de la suppression',
+    'group_prompt': 'Groupes: {groups}\nNom du groupe (un nouveau nom crée le groupe à partir de la sélection):',
+    'group_created': 'Groupe \'{name}\' créé ({count} projecteurs)',
+    'temperature_prompt': 'Température de couleur en kelvins (actuelle: {current} K):',
+    'chase_pattern_prompt': 'Motif existant ({patterns}), vide pour l\'ordre des projecteurs,\nou nouveau nom pour créer un motif à partir de la sélection:',
+    'chase_pattern_selection': 'Sélectionnez au moins deux projecteurs (Ctrl+clic) pour créer un motif',
+    'pixel_map_missing': 'Chargez d\'abord une image ou une séquence (Contenu pixel map)',
+    'pixel_map_size_prompt': 'Taille des trames brutes (largeur x hauteur):',
+    'pixel_map_size_invalid': 'Taille invalide, format attendu: 320x240',
+    'pixel_map_error': 'Impossible de charger le contenu: {error}',
+    'pixel_map_loaded': '{count} trame(s) {width}x{height} chargée(s)',
+    'bpm_prompt': 'Tempo en BPM (actuel: {current:.1f}):'
 }
 
 # === LABELS DE L'INTERFACE ===
@@ -155,5 +329,18 @@ LABELS = {
     'save_scene': 'SAUVER\nSCÈNE',
     'load_scene': 'CHARGER\nSCÈNE',
     'delete_scene': 'SUPPR\nSCÈNE',
-    'clear_quick_scenes': 'EFFACER\nSCÈNES RAPIDES'
+    'clear_quick_scenes': 'EFFACER\nSCÈNES RAPIDES',
+    'groups': 'GROUPES',
+    'rainbow': 'ARC-EN-CIEL',
+    'hue_rotate': 'TEINTE',
+    'saturation_pulse': 'SATURATION',
+    'color_temperature': 'TEMPÉRATURE',
+    'temperature': 'Température (K)',
+    'chase_pattern': 'Motif chaser',
+    'pixel_map': 'PIXEL MAP',
+    'pixel_map_source': 'Contenu pixel map',
+    'tempo': 'TEMPO',
+    'tap': 'TAP',
+    'bpm': 'BPM',
+    'beat_sync': 'SYNC'
 }
\ No newline at end of file
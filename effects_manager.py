@@ -2,11 +2,23 @@
 effects_manager.py - Gestionnaire des effets lumineux avec synchronisation des clignotements
 Version avec support de sauvegarde/restauration d'état
 """
-from config import EFFECTS_CONFIG
+import math
+import threading
+import time
+from beat_clock import BeatClock
+from chase_patterns import ChaseTable, builtin_patterns, normalize_pattern
+from color_space import HueTable, build_temperature_table, hex_to_rgb, rgb_to_hsv_batch
+from config import AUDIO_CONFIG, EFFECTS_CONFIG, PIXELMAP_CONFIG
+from events import EffectsChanged
 
 class EffectsManager:
-    def __init__(self, projectors):
+    COLOR_EFFECTS = ('rainbow', 'hue_rotate', 'saturation_pulse', 'color_temperature')
+    AUDIO_TARGETS = ('chaser', 'strobe', 'blink', 'dimmer')
+    BEAT_TARGETS = ('chaser', 'strobe', 'blink')
+
+    def __init__(self, projectors, bus=None):
         self.projectors = projectors
+        self.bus = bus
         self.num_projectors = len(projectors)
 
         self.active_effects = {
@@ -14,17 +26,80 @@ class EffectsManager:
             'fade': {'active': False, 'step': 0},
             'chaser': {'active': False, 'step': 0},
             'blink_all': {'active': False, 'step': 0},
-            'individual_blinks': {}
+            'rainbow': {'active': False, 'step': 0},
+            'hue_rotate': {'active': False, 'step': 0},
+            'saturation_pulse': {'active': False, 'step': 0},
+            'color_temperature': {'active': False, 'step': 0},
+            'pixel_map': {'active': False, 'step': 0}
         }
+        self.blink_mask = 0
+        
+        self.hue_table = HueTable(EFFECTS_CONFIG['hue_steps'])
+        self.temperature_table = build_temperature_table(*EFFECTS_CONFIG['temperature_range'])
+        self.color_temperature = EFFECTS_CONFIG['color_temperature']
+        self.color_effect = None
+        self.color_phase = 0
+        self.color_cache = {}
+        self.hsv_cache = {}
+        
+        self.chase_patterns = builtin_patterns(self.num_projectors)
+        self.chase_pattern = None
+        self.chase_table = None
+        self.chase_mask = 0
+        self.chase_color = None
+        
+        self.pixel_map = None
+        self.pixel_colors = None
+        
+        self.strobe_lit = False
+        self.blink_lit = False
+        self.fade_color = None
+        
+        self.beat_clock = BeatClock()
+        self.beat_divisions = {}
+        self.beat_position = 0.0
+        
+        self.audio = None
+        self.audio_bindings = {}
+        self.audio_onsets = 0
+        self.audio_new_onset = False
+        self.audio_dimmer = None
+        self.dimmer_cache = {}
         
         self.fade_colors = EFFECTS_CONFIG['default_fade_colors']
         self.blink_speed = EFFECTS_CONFIG['blink_speed']
         self.strobe_speed = EFFECTS_CONFIG['strobe_speed']
         self.fade_speed = EFFECTS_CONFIG['fade_speed']
         self.chaser_speed = EFFECTS_CONFIG['chaser_speed']
-        
-        for i in range(self.num_projectors):
-            self.active_effects['individual_blinks'][i] = {'active': False, 'step': 0}
+
+        self.clock = None
+        self.clock_tick = 0
+
+    def _notify(self, effect=None):
+        """Publie un changement d'état des effets sur le bus d'événements"""
+        if self.bus is not None:
+            self.bus.publish(EffectsChanged(effect))
+
+    def set_clock(self, clock):
+        """Associe une horloge de spectacle partagée (None pour revenir aux compteurs de ticks)
+
+        Le tempo suit alors l'heure de spectacle : la phase des temps est la même sur toutes les
+        consoles synchronisées et dans le pré-calcul.
+        """
+        self.clock = clock
+        self.beat_clock.set_time_source(clock.now if clock is not None else time.monotonic)
+
+    def _advance(self, effect_data, period):
+        """Avance le pas d'un effet : compteur local, ou tick de l'horloge partagée si présente"""
+        if self.clock is not None:
+            effect_data['step'] = self.clock_tick % period
+        else:
+            effect_data['step'] = (effect_data['step'] + 1) % period
+        return effect_data['step']
+
+    def is_blinking(self, projector_id):
+        """Indique si le clignotement individuel est actif pour un projecteur (bit du masque)"""
+        return bool((self.blink_mask >> projector_id) & 1)
 
     def get_state(self):
         """Retourne l'état complet des effets pour sauvegarde"""
@@ -32,16 +107,33 @@ class EffectsManager:
             'strobe_active': self.active_effects['strobe']['active'],
             'fade_active': self.active_effects['fade']['active'],
             'chaser_active': self.active_effects['chaser']['active'],
+            'chase_pattern': self._chase_pattern_state(),
             'blink_all_active': self.active_effects['blink_all']['active'],
             'individual_blinks_active': {
-                str(i): self.active_effects['individual_blinks'][i]['active'] 
+                str(i): self.is_blinking(i)
                 for i in range(self.num_projectors)
             },
-            'fade_colors': self.fade_colors.copy()
+            'fade_colors': self.fade_colors.copy(),
+            'rainbow_active': self.active_effects['rainbow']['active'],
+            'hue_rotate_active': self.active_effects['hue_rotate']['active'],
+            'saturation_pulse_active': self.active_effects['saturation_pulse']['active'],
+            'color_temperature_active': self.active_effects['color_temperature']['active'],
+            'color_temperature': self.color_temperature,
+            'pixel_map_active': self.active_effects['pixel_map']['active'],
+            'beat': {**self.beat_clock.get_state(), 'divisions': dict(self.beat_divisions)}
         }
     
     def set_state(self, state):
         """Restaure l'état complet des effets depuis une sauvegarde"""
+        bus, self.bus = self.bus, None
+        try:
+            self._apply_state(state)
+        finally:
+            self.bus = bus
+        self._notify()
+
+    def _apply_state(self, state):
+        """Applique un état d'effets sans notification"""
         self.stop_all_effects()
         
         if 'fade_colors' in state:
@@ -50,9 +142,8 @@ class EffectsManager:
         if 'individual_blinks_active' in state:
             for proj_id_str, is_active in state['individual_blinks_active'].items():
                 proj_id = int(proj_id_str)
-                if proj_id < self.num_projectors and is_active:
-                    self.active_effects['individual_blinks'][proj_id]['active'] = True
-                    self.active_effects['individual_blinks'][proj_id]['step'] = 0
+                if 0 <= proj_id < self.num_projectors and is_active:
+                    self.blink_mask |= 1 << proj_id
 
         if state.get('blink_all_active', False):
             self.active_effects['blink_all']['active'] = True
@@ -62,18 +153,72 @@ class EffectsManager:
             self.active_effects['strobe']['active'] = True
             self.active_effects['strobe']['step'] = 0
 
+        chase_pattern = None
+        pattern = state.get('chase_pattern')
+        if isinstance(pattern, dict) and pattern.get('name'):
+            self.chase_patterns[pattern['name']] = normalize_pattern(pattern, self.num_projectors)
+            chase_pattern = pattern['name']
+        table = self._build_chase_table(chase_pattern)
+        self.chase_pattern = chase_pattern
+        self.chase_table = table
+        
         if state.get('chaser_active', False):
-            self.active_effects['chaser']['active'] = True
             self.active_effects['chaser']['step'] = 0
+            self.active_effects['chaser']['active'] = True
         
         if state.get('fade_active', False):
             self.active_effects['fade']['active'] = True
             self.active_effects['fade']['step'] = 0
+        
+        if 'color_temperature' in state:
+            self.set_color_temperature(state['color_temperature'], notify=False)
+        if 'beat' in state:
+            self.beat_clock.set_state(state['beat'])
+            for target, division in state['beat'].get('divisions', {}).items():
+                if target in self.BEAT_TARGETS and division:
+                    try:
+                        self.beat_divisions[target] = self._beat_division(division)
+                    except (TypeError, ValueError) as e:
+                        print(f"Synchronisation sur le tempo ignorée ({target}): {e}")
+        
+        if state.get('pixel_map_active', False) and self.pixel_map is not None:
+            self.active_effects['pixel_map']['active'] = True
+        
+        for effect in self.COLOR_EFFECTS:
+            if state.get(f'{effect}_active', False) and not self.active_effects['fade']['active']:
+                self.active_effects[effect]['active'] = True
+                self.color_effect = effect
+                break
 
     def process_all_effects(self):
         """Traite tous les effets actifs et met à jour les couleurs des projecteurs"""
+        if self.clock is not None:
+            self.clock_tick = self.clock.effect_tick()
+        if self.audio is not None and self.audio_bindings:
+            self._read_audio()
+        if self.beat_divisions:
+            if self.clock is not None:
+                self.beat_position = self.beat_clock.position(self.clock.tick_time(self.clock_tick))
+            else:
+                self.beat_position = self.beat_clock.position()
+        if self.active_effects['fade']['active']:
+            self._prepare_fade()
+        if self.color_effect is not None:
+            self._prepare_color_effect()
+        if self.active_effects['chaser']['active']:
+            self._prepare_chaser()
+        if self.active_effects['pixel_map']['active']:
+            self._prepare_pixel_map()
+        elif self.pixel_colors is not None:
+            self.pixel_colors = None
+        if self.color_effect is not None:
+            self._prepare_base_hsv()
+        self._prepare_rhythm()
+        dimmer = self.audio_dimmer
         for projector_id, projector in self.projectors.items():
             final_color = self._calculate_final_color(projector_id, projector)
+            if dimmer is not None and final_color != '#000000':
+                final_color = self._dim_color(final_color)
             projector.color = final_color
 
     def _calculate_final_color(self, projector_id, projector):
@@ -82,32 +227,44 @@ class EffectsManager:
             return '#000000'
         
         base_color = projector.base_color
+        if self.pixel_colors is not None:
+            base_color = self.pixel_colors[projector_id] or base_color
         
         if self.active_effects['fade']['active']:
-            base_color = self._get_fade_color()
+            base_color = self.fade_color
+        elif self.color_effect is not None:
+            base_color = self._get_color_effect_color(projector_id, base_color)
 
         if self.active_effects['chaser']['active']:
             if not self._is_chaser_active_for_projector(projector_id):
                 return '#000000'
-            return base_color
+            return self.chase_color or base_color
         elif self.active_effects['strobe']['active']:
-            if not self._is_strobe_active():
+            if not self.strobe_lit:
                 return '#000000'
             return base_color
         else:
             has_blink_effects = (self.active_effects['blink_all']['active'] or 
-                                self.active_effects['individual_blinks'][projector_id]['active'])
+                                self.is_blinking(projector_id))
             
             if has_blink_effects:
-                should_blink = self._is_blink_synchronized()
-                if not should_blink:
+                if not self.blink_lit:
                     return '#000000'
             return base_color
 
-    def _get_fade_color(self):
-        """Calcule la couleur actuelle pour l'effet fade avec cycle complet"""
+    def _prepare_rhythm(self):
+        """Avance le strobe ou le clignotement une fois par tick (état commun à tous les projecteurs)"""
+        if self.active_effects['chaser']['active']:
+            return
+        if self.active_effects['strobe']['active']:
+            self.strobe_lit = self._is_strobe_active()
+        else:
+            self.blink_lit = self._is_blink_synchronized()
+
+    def _prepare_fade(self):
+        """Avance le fondu une fois par tick et calcule sa couleur (commune à tous les projecteurs)"""
         fade_data = self.active_effects['fade']
-        fade_data['step'] = (fade_data['step'] + 1) % self.fade_speed
+        self._advance(fade_data, self.fade_speed)
         half_speed = self.fade_speed // 2
         
         if fade_data['step'] <= half_speed:
@@ -115,12 +272,86 @@ class EffectsManager:
         else:
             progress = (self.fade_speed - fade_data['step']) / half_speed
 
-        return self._interpolate_colors(self.fade_colors[0], self.fade_colors[1], progress)
+        self.fade_color = self._interpolate_colors(self.fade_colors[0], self.fade_colors[1], progress)
+
+    def _prepare_color_effect(self):
+        """Avance l'effet de couleur une fois par tick et vide le cache des couleurs calculées"""
+        effect = self.color_effect
+        effect_data = self.active_effects[effect]
+        self.color_cache.clear()
+        
+        if effect == 'rainbow':
+            step = self._advance(effect_data, EFFECTS_CONFIG['rainbow_speed'])
+            self.color_phase = step * self.hue_table.steps // EFFECTS_CONFIG['rainbow_speed']
+        elif effect == 'hue_rotate':
+            step = self._advance(effect_data, EFFECTS_CONFIG['hue_rotate_speed'])
+            self.color_phase = step * self.hue_table.steps // EFFECTS_CONFIG['hue_rotate_speed']
+        elif effect == 'saturation_pulse':
+            period = EFFECTS_CONFIG['saturation_pulse_speed']
+            step = self._advance(effect_data, period)
+            half = period // 2
+            progress = step / half if step <= half else (period - step) / half
+            minimum = EFFECTS_CONFIG['saturation_pulse_min']
+            self.color_phase = minimum + (1.0 - minimum) * progress
+        else:
+            self.color_phase = self.temperature_table[self.color_temperature]
+
+    def _get_color_effect_color(self, projector_id, base_color):
+        """Couleur de l'effet de couleur actif (tables de teintes, cache par couleur de base)"""
+        effect = self.color_effect
+        if effect == 'rainbow':
+            spread = EFFECTS_CONFIG['rainbow_spread'] * self.hue_table.steps
+            offset = int(projector_id * spread / max(1, self.num_projectors))
+            return self.hue_table.pure_colors[(self.color_phase + offset) % self.hue_table.steps]
+        if effect == 'color_temperature':
+            return self.color_phase
+        
+        color = self.color_cache.get(base_color)
+        if color is None:
+            hue_index, saturation, value = self._base_hsv(base_color)
+            if effect == 'hue_rotate':
+                color = self.hue_table.color(hue_index + self.color_phase, saturation, value)
+            else:
+                color = self.hue_table.color(hue_index, saturation * self.color_phase, value)
+            self.color_cache[base_color] = color
+        return color
+
+    def _prepare_base_hsv(self):
+        """Convertit en un seul lot les couleurs de base des projecteurs allumés absentes du cache"""
+        if self.color_effect in ('rainbow', 'color_temperature') or self.active_effects['fade']['active']:
+            return
+        missing = set()
+        for projector_id, projector in self.projectors.items():
+            if not projector.is_on:
+                continue
+            base_color = projector.base_color
+            if self.pixel_colors is not None:
+                base_color = self.pixel_colors[projector_id] or base_color
+            if base_color not in self.hsv_cache:
+                missing.add(base_color)
+        if missing:
+            self._cache_base_hsv(list(missing))
+
+    def _cache_base_hsv(self, colors):
+        """Ajoute au cache la teinte quantifiée, la saturation et la valeur de couleurs de base
+        (le cache est vidé avant de dépasser sa taille)"""
+        if len(self.hsv_cache) + len(colors) > EFFECTS_CONFIG['hsv_cache_size']:
+            self.hsv_cache.clear()
+        for color, (hue, saturation, value) in zip(colors, rgb_to_hsv_batch(colors)):
+            self.hsv_cache[color] = (self.hue_table.index(hue), saturation, value)
+
+    def _base_hsv(self, base_color):
+        """Teinte quantifiée, saturation et valeur d'une couleur de base (mémorisées, en nombre borné)"""
+        hsv = self.hsv_cache.get(base_color)
+        if hsv is None:
+            self._cache_base_hsv([base_color])
+            hsv = self.hsv_cache[base_color]
+        return hsv
 
     def _interpolate_colors(self, color1, color2, progress):
         """Interpole entre deux couleurs hexadécimales"""
-        r1, g1, b1 = self._hex_to_rgb(color1)
-        r2, g2, b2 = self._hex_to_rgb(color2)
+        r1, g1, b1 = hex_to_rgb(color1)
+        r2, g2, b2 = hex_to_rgb(color2)
 
         r = int(r1 + (r2 - r1) * progress)
         g = int(g1 + (g2 - g1) * progress)
@@ -128,44 +359,242 @@ class EffectsManager:
         
         return f"#{r:02x}{g:02x}{b:02x}"
 
-    def _hex_to_rgb(self, hex_color):
-        """Convertit une couleur hex en tuple RGB"""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
     def _is_strobe_active(self):
         """Détermine si le strobe doit allumer les projecteurs"""
         strobe_data = self.active_effects['strobe']
-        strobe_data['step'] = (strobe_data['step'] + 1) % self.strobe_speed
+        self._advance_rhythm(strobe_data, self.strobe_speed, 'strobe')
         return strobe_data['step'] < (self.strobe_speed // 3)
 
+    def _on_beat(self, target):
+        """Indique si un effet de rythme est cadencé par les attaques audio"""
+        return self.audio is not None and self.audio_bindings.get(target) == 'onset'
+
+    def _advance_rhythm(self, effect_data, period, target):
+        """Avance un effet de rythme ; lié aux attaques, il repart de zéro à chaque attaque et
+        s'arrête en fin de période (un éclair par attaque)"""
+        if not self._on_beat(target):
+            division = self.beat_divisions.get(target)
+            if division is None:
+                return self._advance(effect_data, period)
+            effect_data['step'] = int((self.beat_position / division) % 1.0 * period)
+            return effect_data['step']
+        if self.audio_new_onset:
+            effect_data['step'] = 0
+        elif effect_data['step'] < period - 1:
+            effect_data['step'] += 1
+        return effect_data['step']
+
+    def set_beat_sync(self, target, division):
+        """Cadence un effet de rythme sur le tempo : un cycle (ou un pas de chaser) toutes les
+        'division' temps ; None revient aux compteurs de ticks"""
+        if target not in self.BEAT_TARGETS:
+            raise ValueError(f"effet non synchronisable sur le tempo: {target}")
+        if division is None:
+            self.beat_divisions.pop(target, None)
+        else:
+            self.beat_divisions[target] = self._beat_division(division)
+        self._notify('beat')
+        return dict(self.beat_divisions)
+
+    def _beat_division(self, division):
+        """Valide une division de temps : nombre fini strictement positif"""
+        division = float(division)
+        if not math.isfinite(division) or division <= 0:
+            raise ValueError(f"division de temps invalide: {division}")
+        return division
+
+    def set_bpm(self, bpm):
+        """Change le tempo sans saut de phase ; retourne le tempo retenu"""
+        bpm = self.beat_clock.set_bpm(bpm)
+        self._notify('beat')
+        return bpm
+
+    def tap_tempo(self):
+        """Frappe de tap tempo ; retourne le tempo courant"""
+        bpm = self.beat_clock.tap()
+        self._notify('beat')
+        return bpm
+
+    def _read_audio(self):
+        """Lit la dernière mesure audio une fois par tick : nouvelle attaque et gradateur"""
+        features = self.audio.features
+        self.audio_new_onset = features.onset_count != self.audio_onsets
+        self.audio_onsets = features.onset_count
+        band = self.audio_bindings.get('dimmer')
+        if band is None:
+            return
+        steps = AUDIO_CONFIG['dimmer_steps']
+        floor = AUDIO_CONFIG['dimmer_floor']
+        level = min(1.0, max(0.0, features.levels.get(band, 0.0)))
+        dimmer = round((floor + (1.0 - floor) * level) * steps) / steps
+        if dimmer != self.audio_dimmer:
+            self.audio_dimmer = dimmer
+            self.dimmer_cache.clear()
+
+    def _dim_color(self, color):
+        """Couleur atténuée par le gradateur audio (mémorisée par couleur jusqu'au prochain palier)"""
+        dimmed = self.dimmer_cache.get(color)
+        if dimmed is None:
+            r, g, b = hex_to_rgb(color)
+            factor = self.audio_dimmer
+            dimmed = f"#{int(r * factor):02x}{int(g * factor):02x}{int(b * factor):02x}"
+            self.dimmer_cache[color] = dimmed
+        return dimmed
+
+    def set_audio(self, analyzer):
+        """Associe une analyse audio (None pour la retirer) ; les liaisons sont conservées
+
+        L'analyse précédente est arrêtée dans un thread à part : l'attente de la fin de son
+        thread ne retarde pas le tick du moteur.
+        """
+        previous = self.audio
+        self.audio = analyzer
+        self.audio_onsets = analyzer.features.onset_count if analyzer is not None else 0
+        self.audio_new_onset = False
+        self.audio_dimmer = None
+        self.dimmer_cache.clear()
+        if previous is not None and previous is not analyzer:
+            threading.Thread(target=previous.stop, name="audio-stop", daemon=True).start()
+        self._notify('audio')
+
+    def bind_audio(self, target, feature):
+        """Lie un effet à une mesure audio : 'onset' pour chaser/strobe/blink, une bande pour dimmer"""
+        if target not in self.AUDIO_TARGETS:
+            raise ValueError(f"cible audio inconnue: {target}")
+        if target == 'dimmer':
+            if feature not in AUDIO_CONFIG['bands']:
+                raise ValueError(f"bande audio inconnue: {feature}")
+        elif feature != 'onset':
+            raise ValueError(f"{target} ne peut être lié qu'aux attaques ('onset')")
+        self.audio_bindings[target] = feature
+        self._notify('audio')
+        return dict(self.audio_bindings)
+
+    def unbind_audio(self, target):
+        """Retire la liaison audio d'un effet"""
+        self.audio_bindings.pop(target, None)
+        if target == 'dimmer':
+            self.audio_dimmer = None
+            self.dimmer_cache.clear()
+        self._notify('audio')
+        return dict(self.audio_bindings)
+
+    def _prepare_pixel_map(self):
+        """Avance la lecture du pixel map une fois par tick et lit les couleurs de la trame courante"""
+        pixel_data = self.active_effects['pixel_map']
+        frame_ticks = PIXELMAP_CONFIG['frame_ticks']
+        step = self._advance(pixel_data, self.pixel_map.frame_count * frame_ticks)
+        self.pixel_colors = self.pixel_map.colors(step // frame_ticks)
+
+    def set_pixel_map(self, player):
+        """Remplace le contenu du pixel map (None pour le retirer)
+
+        L'ancien lecteur est fermé dans un thread à part : l'arrêt de son thread de décodage
+        ne retarde pas le tick du moteur. Les couleurs de la trame courante ne sont remplacées
+        qu'au tick suivant.
+        """
+        previous = self.pixel_map
+        if player is None:
+            self.active_effects['pixel_map']['active'] = False
+        self.active_effects['pixel_map']['step'] = 0
+        self.pixel_map = player
+        if previous is not None and previous is not player:
+            threading.Thread(target=previous.close, name="pixel-map-close", daemon=True).start()
+        self._notify('pixel_map')
+
+    def toggle_pixel_map(self):
+        """Active/désactive la lecture du pixel map (sans effet si aucun contenu n'est chargé)"""
+        pixel_data = self.active_effects['pixel_map']
+        if pixel_data['active'] or self.pixel_map is None:
+            pixel_data['active'] = False
+        else:
+            pixel_data['active'] = True
+        pixel_data['step'] = 0
+        self._notify('pixel_map')
+        return pixel_data['active']
+
+    def _prepare_chaser(self):
+        """Avance le chaser une fois par tick et lit le masque et la couleur du pas courant"""
+        if self.chase_table is None:
+            self._compile_chase()
+        chaser_data = self.active_effects['chaser']
+        period = self.chaser_speed * len(self.chase_table)
+        if self._on_beat('chaser'):
+            if self.audio_new_onset:
+                chaser_data['step'] = (chaser_data['step'] + self.chaser_speed) % period
+        elif 'chaser' in self.beat_divisions:
+            position = int(self.beat_position / self.beat_divisions['chaser'])
+            chaser_data['step'] = position * self.chaser_speed % period
+        else:
+            self._advance(chaser_data, period)
+        self.chase_mask, self.chase_color = self.chase_table.lookup(
+            chaser_data['step'] // self.chaser_speed)
+
     def _is_chaser_active_for_projector(self, projector_id):
         """Détermine si un projecteur spécifique doit être allumé pour l'effet chaser"""
-        chaser_data = self.active_effects['chaser']
-        chaser_data['step'] = (chaser_data['step'] + 1) % (self.chaser_speed * self.num_projectors)
-        
-        active_projector = (chaser_data['step'] // self.chaser_speed) % self.num_projectors
-        return projector_id == active_projector
+        return bool((self.chase_mask >> projector_id) & 1)
+
+    def _build_chase_table(self, name):
+        """Compile un motif (ordre des identifiants par défaut) en table de masques"""
+        pattern = self.chase_patterns.get(name)
+        if pattern is None:
+            pattern = normalize_pattern({}, self.num_projectors)
+        return ChaseTable(pattern)
+
+    def _compile_chase(self):
+        """Compile le motif courant ; la table est remplacée en une seule affectation"""
+        self.chase_table = self._build_chase_table(self.chase_pattern)
+
+    def _chase_pattern_state(self):
+        """Définition du motif courant pour sauvegarde (None : ordre des identifiants)"""
+        pattern = self.chase_patterns.get(self.chase_pattern)
+        if pattern is None:
+            return None
+        return {'name': self.chase_pattern, **pattern}
+
+    def define_chase_pattern(self, name, pattern):
+        """Crée ou remplace un motif de chaser ; retourne son nombre de pas"""
+        self.chase_patterns[name] = normalize_pattern(pattern, self.num_projectors)
+        if name == self.chase_pattern and self.active_effects['chaser']['active']:
+            self._compile_chase()
+        return len(self.chase_patterns[name]['steps'])
+
+    def remove_chase_pattern(self, name):
+        """Supprime un motif de chaser (le chaser revient à l'ordre des identifiants s'il l'utilisait)"""
+        if name not in self.chase_patterns:
+            return False
+        del self.chase_patterns[name]
+        if name == self.chase_pattern:
+            self.set_chase_pattern(None)
+        return True
+
+    def set_chase_pattern(self, name):
+        """Choisit le motif du chaser (None : un projecteur à la fois, par identifiant)"""
+        if name is not None and name not in self.chase_patterns:
+            raise ValueError(f"motif de chaser inconnu: {name}")
+        table = self._build_chase_table(name)
+        self.chase_pattern = name
+        self.chase_table = table
+        if self.active_effects['chaser']['active']:
+            self.active_effects['chaser']['step'] = 0
+        self._notify('chaser')
+        return name
+
+    def get_chase_pattern_list(self):
+        """Retourne les noms des motifs de chaser, triés"""
+        return sorted(self.chase_patterns)
 
     def _is_blink_synchronized(self):
         """Détermine l'état synchronisé pour tous les clignotements"""
-        has_active_blink = (self.active_effects['blink_all']['active'] or 
-                        any(self.active_effects['individual_blinks'][i]['active'] 
-                            for i in range(self.num_projectors)))
+        has_active_blink = self.active_effects['blink_all']['active'] or self.blink_mask != 0
         
         if not has_active_blink:
             return False  
         
         blink_all_data = self.active_effects['blink_all']
-        blink_all_data['step'] = (blink_all_data['step'] + 1) % self.blink_speed
-        
-        is_on = blink_all_data['step'] < (self.blink_speed // 2)
-
-        for i in range(self.num_projectors):
-            if self.active_effects['individual_blinks'][i]['active']:
-                self.active_effects['individual_blinks'][i]['step'] = blink_all_data['step']
+        self._advance_rhythm(blink_all_data, self.blink_speed, 'blink')
         
-        return is_on
+        return blink_all_data['step'] < (self.blink_speed // 2)
 
     def _stop_rhythm_effects_except_blinks(self):
         """Arrête tous les effets de rythme sauf les clignotements"""
@@ -182,27 +611,34 @@ class EffectsManager:
         self.active_effects['chaser']['step'] = 0
         self.active_effects['blink_all']['active'] = False
         self.active_effects['blink_all']['step'] = 0
-        
-        for i in range(self.num_projectors):
-            self.active_effects['individual_blinks'][i]['active'] = False
-            self.active_effects['individual_blinks'][i]['step'] = 0
+        self.blink_mask = 0
 
     def toggle_blink(self, projector_id):
         """Active/désactive le clignotement d'un projecteur spécifique"""
-        if projector_id >= self.num_projectors:
+        if not 0 <= projector_id < self.num_projectors:
             return False
         
-        blink_data = self.active_effects['individual_blinks'][projector_id]
-        
-        if blink_data['active']:
-            blink_data['active'] = False
-            blink_data['step'] = 0
+        bit = 1 << projector_id
+        if self.blink_mask & bit:
+            self.blink_mask &= ~bit
         else:
             self._stop_rhythm_effects_except_blinks()
-            blink_data['active'] = True
-            blink_data['step'] = 0
+            self.blink_mask |= bit
         
-        return blink_data['active']
+        self._notify('blink')
+        return self.is_blinking(projector_id)
+
+    def set_blink_mask(self, mask, active=True):
+        """Active ou désactive d'un coup le clignotement des projecteurs d'un masque"""
+        mask &= (1 << self.num_projectors) - 1
+        if active:
+            if mask & ~self.blink_mask:
+                self._stop_rhythm_effects_except_blinks()
+            self.blink_mask |= mask
+        else:
+            self.blink_mask &= ~mask
+        self._notify('blink')
+        return self.blink_mask
 
     def toggle_blink_all(self):
         """Active/désactive le clignotement collectif de tous les projecteurs"""
@@ -216,6 +652,7 @@ class EffectsManager:
             blink_all_data['active'] = True
             blink_all_data['step'] = 0
         
+        self._notify('blink_all')
         return blink_all_data['active']
 
     def toggle_strobe(self):
@@ -230,6 +667,7 @@ class EffectsManager:
             strobe_data['active'] = True
             strobe_data['step'] = 0
         
+        self._notify('strobe')
         return strobe_data['active']
 
     def toggle_chaser(self):
@@ -241,9 +679,11 @@ class EffectsManager:
             chaser_data['step'] = 0
         else:
             self._stop_rhythm_effects()
-            chaser_data['active'] = True
+            self._compile_chase()
             chaser_data['step'] = 0
+            chaser_data['active'] = True
         
+        self._notify('chaser')
         return chaser_data['active']
 
     def toggle_fade(self):
@@ -256,14 +696,68 @@ class EffectsManager:
             for projector in self.projectors.values():
                 projector.color = projector.base_color
         else:
+            self._stop_color_effects()
             fade_data['active'] = True
             fade_data['step'] = 0
         
+        self._notify('fade')
         return fade_data['active']
 
+    def _stop_color_effects(self):
+        """Arrête les effets de l'espace colorimétrique (exclusifs entre eux et avec le fondu)"""
+        for effect in self.COLOR_EFFECTS:
+            self.active_effects[effect]['active'] = False
+            self.active_effects[effect]['step'] = 0
+        self.color_effect = None
+
+    def toggle_color_effect(self, effect):
+        """Active/désactive un effet de couleur (arc-en-ciel, teinte, saturation, température)"""
+        if effect not in self.COLOR_EFFECTS:
+            return False
+        
+        if self.active_effects[effect]['active']:
+            self._stop_color_effects()
+            for projector in self.projectors.values():
+                projector.color = projector.base_color
+        else:
+            self._stop_color_effects()
+            self.active_effects['fade']['active'] = False
+            self.active_effects['fade']['step'] = 0
+            self.active_effects[effect]['active'] = True
+            self.color_effect = effect
+        
+        self._notify(effect)
+        return self.active_effects[effect]['active']
+
+    def toggle_rainbow(self):
+        """Active/désactive l'arc-en-ciel réparti sur les projecteurs"""
+        return self.toggle_color_effect('rainbow')
+
+    def toggle_hue_rotate(self):
+        """Active/désactive la rotation de teinte des couleurs de base"""
+        return self.toggle_color_effect('hue_rotate')
+
+    def toggle_saturation_pulse(self):
+        """Active/désactive la pulsation de saturation des couleurs de base"""
+        return self.toggle_color_effect('saturation_pulse')
+
+    def toggle_color_temperature(self):
+        """Active/désactive le blanc à température de couleur fixe"""
+        return self.toggle_color_effect('color_temperature')
+
+    def set_color_temperature(self, kelvin, notify=True):
+        """Règle la température de couleur (arrondie au pas de la table) ; retourne la valeur retenue"""
+        minimum, maximum, step = EFFECTS_CONFIG['temperature_range']
+        kelvin = max(minimum, min(maximum, int(kelvin)))
+        self.color_temperature = minimum + (kelvin - minimum) // step * step
+        if notify:
+            self._notify('color_temperature')
+        return self.color_temperature
+
     def set_fade_colors(self, color1, color2):
         """Définit les couleurs pour l'effet fade"""
         self.fade_colors = [color1, color2]
+        self._notify('fade')
 
     def stop_all_effects(self):
         """Arrête tous les effets"""
@@ -275,13 +769,16 @@ class EffectsManager:
         self.active_effects['chaser']['step'] = 0
         self.active_effects['blink_all']['active'] = False 
         self.active_effects['blink_all']['step'] = 0
-        
-        for i in range(self.num_projectors):
-            self.active_effects['individual_blinks'][i]['active'] = False
-            self.active_effects['individual_blinks'][i]['step'] = 0
+        self.blink_mask = 0
+        self._stop_color_effects()
+        self.active_effects['pixel_map']['active'] = False
+        self.active_effects['pixel_map']['step'] = 0
+        self.pixel_colors = None
+        self.beat_divisions = {}
         
         for projector in self.projectors.values():
             projector.color = projector.base_color
+        self._notify()
 
     def get_effects_status(self):
         """Retourne l'état de tous les effets"""
@@ -291,7 +788,14 @@ class EffectsManager:
             'chaser': self.active_effects['chaser']['active'],
             'blink_all': self.active_effects['blink_all']['active'],
             'individual_blinks': {
-                i: data['active'] 
-                for i, data in self.active_effects['individual_blinks'].items()
-            }
+                i: self.is_blinking(i)
+                for i in range(self.num_projectors)
+            },
+            'color_effect': self.color_effect,
+            'color_temperature': self.color_temperature,
+            'chase_pattern': self.chase_pattern,
+            'pixel_map': self.active_effects['pixel_map']['active'],
+            'audio_bindings': dict(self.audio_bindings),
+            'bpm': self.beat_clock.bpm,
+            'beat_divisions': dict(self.beat_divisions)
         }
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+engine.py - Moteur de rendu : calcul et sortie des trames dans un thread dédié
+"""
+import threading
+import time
+from collections import deque
+from config import EFFECTS_CONFIG
+
+class Frame:
+    """Trame de sortie immuable : couleur atténuée de chaque projecteur à un instant donné"""
+    __slots__ = ('sequence', 'timestamp', 'projector_ids', 'colors')
+
+    def __init__(self, sequence, timestamp, projector_ids, colors):
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.projector_ids = projector_ids
+        self.colors = colors
+
+class FrameBuffer:
+    """Publication sans verrou de la dernière trame complète
+
+    Le moteur construit chaque trame à part puis la publie par une seule affectation de
+    référence (atomique) : le lecteur obtient toujours une trame complète, jamais une
+    trame en cours d'écriture, et n'attend jamais l'écrivain.
+    """
+
+    def __init__(self):
+        self._latest = None
+
+    def publish(self, frame):
+        """Publie une trame complète"""
+        self._latest = frame
+
+    def latest(self):
+        """Retourne la dernière trame publiée (None si aucune)"""
+        return self._latest
+
+class RenderEngine:
+    """Calcule les effets et produit les trames à cadence fixe, indépendamment de l'interface"""
+
+    def __init__(self, projectors, effects_manager, input_queue=None, history=None, clock=None,
+                 metrics=None, shedder=None):
+        self.projectors = projectors
+        self.effects_manager = effects_manager
+        self.input_queue = input_queue
+        self.history = history
+        self.clock = clock
+        self.metrics = metrics
+        self.shedder = shedder
+        self.interval = EFFECTS_CONFIG['loop_interval'] / 1000.0
+
+        self.frames = FrameBuffer()
+        self.outputs = []
+        self.secondary_outputs = []
+        self.tick_listeners = []
+        self.pending_calls = deque()
+        self.state_lock = history.lock if history is not None else threading.RLock()
+        self.sequence = 0
+        self.late_ticks = 0
+
+        self._running = False
+        self._thread = None
+
+    def add_output(self, callback, secondary=False):
+        """Ajoute une sortie appelée avec chaque trame (depuis le thread du moteur)
+
+        Une sortie secondaire (affichage, diffusion) peut voir sa cadence réduite sous charge.
+        """
+        if secondary:
+            self.secondary_outputs.append(callback)
+        else:
+            self.outputs.append(callback)
+
+    def remove_output(self, callback):
+        """Retire une sortie"""
+        for outputs in (self.outputs, self.secondary_outputs):
+            if callback in outputs:
+                outputs.remove(callback)
+
+    def add_tick_listener(self, callback):
+        """Ajoute une fonction appelée à la fin de chaque tick (depuis le thread du moteur)"""
+        self.tick_listeners.append(callback)
+
+    def call_soon(self, callback):
+        """Planifie une fonction au début du prochain tick (sûr depuis n'importe quel thread)"""
+        self.pending_calls.append(callback)
+
+    def is_running(self):
+        """Indique si le thread du moteur tourne"""
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Démarre le thread du moteur"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="render-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le thread du moteur"""
+        if not self._running:
+            return
+        self._running = False
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _run(self):
+        """Boucle du moteur à échéances fixes (sans dérive, rattrapage limité en cas de retard)"""
+        if self.clock is not None:
+            self._run_on_clock()
+            return
+
+        next_deadline = time.monotonic()
+        while self._running:
+            self._safe_tick()
+
+            next_deadline += self.interval
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self._count_late(1)
+                next_deadline = time.monotonic()
+
+    def _run_on_clock(self):
+        """Boucle alignée sur les frontières de tick de l'horloge de spectacle partagée"""
+        time.sleep(self.clock.next_tick_delay())
+        last_tick = None
+        while self._running:
+            current_tick = self.clock.effect_tick()
+            if last_tick is not None and current_tick - last_tick > 1:
+                self._count_late(current_tick - last_tick - 1)
+            last_tick = current_tick
+
+            self._safe_tick()
+            time.sleep(self.clock.next_tick_delay())
+
+    def _count_late(self, count):
+        """Compte des ticks en retard"""
+        self.late_ticks += count
+        if self.metrics is not None:
+            self.metrics.count_late('engine', count)
+
+    def _safe_tick(self):
+        """Exécute un tick ; une erreur est signalée sans arrêter la boucle du moteur"""
+        try:
+            self.tick()
+        except Exception as e:
+            print(f"Erreur dans le tick du moteur: {e}")
+
+    def tick(self):
+        """Calcule une trame : commandes planifiées, entrées, effets, sortie
+
+        L'état des projecteurs et des effets n'est lu et modifié que sous le verrou d'état,
+        partagé avec l'historique : les actions de l'interface ne s'intercalent pas dans un tick.
+        """
+        started = time.perf_counter()
+        with self.state_lock:
+            while self.pending_calls:
+                callback = self.pending_calls.popleft()
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Erreur dans une commande planifiée du moteur: {e}")
+            if self.input_queue is not None:
+                self._apply_inputs()
+            inputs_done = time.perf_counter()
+            self.effects_manager.process_all_effects()
+            effects_done = time.perf_counter()
+
+            frame = self.render_frame()
+        self.frames.publish(frame)
+        render_done = time.perf_counter()
+        self._send(frame, self.outputs)
+        if self.secondary_outputs and (self.shedder is None
+                                       or self.shedder.allows('secondary_outputs', self.sequence)):
+            self._send(frame, self.secondary_outputs)
+
+        with self.state_lock:
+            for listener in self.tick_listeners:
+                try:
+                    listener()
+                except Exception as e:
+                    print(f"Erreur dans un écouteur du moteur: {e}")
+
+        finished = time.perf_counter()
+        if self.shedder is not None:
+            self.shedder.update('engine', finished - started, self.interval)
+        if self.metrics is not None:
+            self.metrics.record('engine.inputs', inputs_done - started)
+            self.metrics.record('engine.effects', effects_done - inputs_done)
+            self.metrics.record('engine.render', render_done - effects_done)
+            self.metrics.record('engine.outputs', finished - render_done)
+            self.metrics.record('engine.total', finished - started)
+        return frame
+
+    def _apply_inputs(self):
+        """Applique les entrées en attente (en nombre limité sous forte charge)"""
+        limit = self.shedder.input_limit() if self.shedder is not None else None
+        self.input_queue.apply(self.projectors, self.history, limit)
+        if limit is not None:
+            self.shedder.count('inputs', self.input_queue.last_deferred)
+
+    def _send(self, frame, outputs):
+        """Transmet une trame à une liste de sorties"""
+        for output in outputs:
+            try:
+                output(frame)
+            except Exception as e:
+                print(f"Erreur dans une sortie du moteur: {e}")
+
+    def render_frame(self):
+        """Construit la trame à partir de l'état courant des projecteurs"""
+        self.sequence += 1
+        projector_ids = tuple(self.projectors.keys())
+        colors = tuple(self.projectors[i].get_dimmed_color() for i in projector_ids)
+        return Frame(self.sequence, time.monotonic(), projector_ids, colors)
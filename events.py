@@ -0,0 +1,110 @@
+"""
+events.py - Bus d'événements typés pour notifier les changements d'état
+"""
+import threading
+from collections import deque
+
+class ProjectorChanged:
+    """Un projecteur a changé (couleur, intensité ou état on/off)"""
+    __slots__ = ('projector_id', 'fields')
+
+    def __init__(self, projector_id, fields):
+        self.projector_id = projector_id
+        self.fields = fields
+
+class EffectsChanged:
+    """L'état des effets a changé (activation, couleurs du fondu...)"""
+    __slots__ = ('effect',)
+
+    def __init__(self, effect=None):
+        self.effect = effect
+
+class ScenesChanged:
+    """La bibliothèque de scènes a changé (sauvegarde, suppression, import, relecture)"""
+    __slots__ = ('names',)
+
+    def __init__(self, names):
+        self.names = names
+
+class EventBus:
+    """Distribue les événements aux abonnés de leur type
+
+    Les événements publiés depuis le thread propriétaire (celui de l'interface) sont
+    distribués immédiatement ; ceux des autres threads (moteur) sont mis en file et
+    distribués par drain() dans le thread propriétaire.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.owner_thread = threading.get_ident()
+        self.pending = deque()
+        self.coalesced = 0
+
+    def subscribe(self, event_type, callback):
+        """Abonne une fonction à un type d'événement"""
+        self.subscribers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        """Désabonne une fonction d'un type d'événement"""
+        callbacks = self.subscribers.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, event):
+        """Publie un événement à tous les abonnés de son type"""
+        if threading.get_ident() != self.owner_thread:
+            self.pending.append(event)
+            return
+        self._dispatch(event)
+
+    def drain(self, coalesce=False):
+        """Distribue les événements publiés depuis d'autres threads ; retourne leur nombre
+
+        Avec coalesce, les événements redondants (même projecteur, effets, scènes) sont
+        fusionnés avant distribution et ne sont distribués qu'une fois.
+        """
+        if coalesce:
+            return self._drain_coalesced()
+        count = 0
+        while self.pending:
+            self._dispatch(self.pending.popleft())
+            count += 1
+        return count
+
+    def _drain_coalesced(self):
+        """Fusionne les événements en attente puis les distribue ; retourne le nombre distribué"""
+        merged = {}
+        received = 0
+        while self.pending:
+            event = self.pending.popleft()
+            received += 1
+            if isinstance(event, ProjectorChanged):
+                key = (ProjectorChanged, event.projector_id)
+                previous = merged.get(key)
+                if previous is not None:
+                    fields = previous.fields + tuple(f for f in event.fields if f not in previous.fields)
+                    event = ProjectorChanged(event.projector_id, fields)
+            elif isinstance(event, ScenesChanged):
+                key = ScenesChanged
+                previous = merged.get(key)
+                if previous is not None:
+                    event = ScenesChanged(set(previous.names) | set(event.names))
+            elif isinstance(event, EffectsChanged):
+                key = EffectsChanged
+            else:
+                key = (type(event), received)
+            merged.pop(key, None)
+            merged[key] = event
+
+        self.coalesced += received - len(merged)
+        for event in merged.values():
+            self._dispatch(event)
+        return len(merged)
+
+    def _dispatch(self, event):
+        """Appelle les abonnés du type de l'événement"""
+        for callback in list(self.subscribers.get(type(event), ())):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Erreur dans un abonné à {type(event).__name__}: {e}")
@@ -0,0 +1,171 @@
+"""
+fixture_groups.py - Groupes nommés de projecteurs et opérations groupées sur des masques de bits
+
+Une sélection est un entier dont le bit i correspond au projecteur i (comme blink_mask) :
+union, intersection et appartenance sont des opérations entières uniques.
+"""
+import json
+import os
+import threading
+from contextlib import nullcontext
+from config import FILES_CONFIG
+
+def mask_from_ids(projector_ids, count=None):
+    """Construit un masque à partir d'identifiants de projecteurs
+
+    Lève ValueError pour un identifiant négatif ou, si count est donné, hors de range(count)
+    (un identifiant démesuré produirait sinon un entier géant).
+    """
+    mask = 0
+    for projector_id in projector_ids:
+        projector_id = int(projector_id)
+        if projector_id < 0 or (count is not None and projector_id >= count):
+            raise ValueError(f"identifiant de projecteur invalide: {projector_id}")
+        mask |= 1 << projector_id
+    return mask
+
+def ids_from_mask(mask):
+    """Retourne les identifiants des bits actifs d'un masque, dans l'ordre croissant"""
+    projector_ids = []
+    while mask:
+        lowest = mask & -mask
+        projector_ids.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return projector_ids
+
+class FixtureGroups:
+    """Groupes nommés de projecteurs, conservés sous forme de masques
+
+    Une modification remplace le dictionnaire des groupes au lieu de le modifier : les lecteurs
+    des autres threads (moteur, interface) parcourent toujours un dictionnaire complet.
+    """
+
+    def __init__(self, projectors, groups_file=None):
+        self.projectors = projectors
+        self.groups_file = groups_file or FILES_CONFIG['groups_file']
+        self._file_lock = threading.Lock()
+        self.groups = {}
+        self.load_groups_from_file()
+
+    def all_mask(self):
+        """Masque de tous les projecteurs"""
+        return mask_from_ids(self.projectors.keys())
+
+    def define(self, name, projector_ids):
+        """Crée ou remplace un groupe ; retourne son masque"""
+        mask = mask_from_ids(projector_ids, len(self.projectors))
+        self.groups = {**self.groups, name: mask}
+        self.save_groups_to_file()
+        return mask
+
+    def remove(self, name):
+        """Supprime un groupe"""
+        if name not in self.groups:
+            return False
+        self.groups = {key: mask for key, mask in self.groups.items() if key != name}
+        return self.save_groups_to_file()
+
+    def get_mask(self, name):
+        """Retourne le masque d'un groupe (0 si inconnu)"""
+        return self.groups.get(name, 0)
+
+    def get_ids(self, name):
+        """Retourne les projecteurs d'un groupe"""
+        return ids_from_mask(self.get_mask(name))
+
+    def union(self, names):
+        """Masque réunissant plusieurs groupes"""
+        mask = 0
+        for name in names:
+            mask |= self.get_mask(name)
+        return mask
+
+    def get_group_list(self):
+        """Retourne les noms des groupes, triés"""
+        return sorted(self.groups)
+
+    def save_groups_to_file(self):
+        """Sauvegarde les groupes (listes d'identifiants) dans un fichier JSON"""
+        try:
+            with self._file_lock:
+                data = {name: ids_from_mask(mask) for name, mask in self.groups.items()}
+                with open(self.groups_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde des groupes: {e}")
+            return False
+
+    def load_groups_from_file(self):
+        """Charge les groupes depuis le fichier JSON"""
+        self.groups = {}
+        if not os.path.exists(self.groups_file):
+            return
+        groups = {}
+        try:
+            with open(self.groups_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            count = len(self.projectors)
+            for name, projector_ids in data.items():
+                if isinstance(projector_ids, list):
+                    groups[name] = mask_from_ids(i for i in projector_ids if 0 <= int(i) < count)
+        except Exception as e:
+            print(f"Erreur lors du chargement des groupes: {e}")
+        self.groups = groups
+
+class BulkOperations:
+    """Applique une opération à tous les projecteurs d'un masque, en une seule action annulable"""
+
+    def __init__(self, projectors, effects_manager, history=None):
+        self.projectors = projectors
+        self.effects_manager = effects_manager
+        self.history = history
+
+    def _targets(self, mask):
+        """Projecteurs désignés par un masque"""
+        projectors = self.projectors
+        return [projectors[i] for i in ids_from_mask(mask) if i in projectors]
+
+    def _action(self, label, mask, effects=False):
+        """Contexte d'historique couvrant tout le masque"""
+        if self.history is None:
+            return nullcontext()
+        return self.history.action(label, projector_ids=ids_from_mask(mask), effects=effects)
+
+    def set_color(self, mask, color):
+        """Règle la couleur de tous les projecteurs du masque ; retourne leur nombre"""
+        targets = self._targets(mask)
+        with self._action('group_color', mask):
+            for projector in targets:
+                projector.set_color(color)
+        return len(targets)
+
+    def set_intensity(self, mask, intensity):
+        """Règle l'intensité de tous les projecteurs du masque ; retourne leur nombre"""
+        targets = self._targets(mask)
+        with self._action('group_intensity', mask):
+            for projector in targets:
+                projector.set_intensity(intensity)
+        return len(targets)
+
+    def set_on(self, mask, is_on):
+        """Allume ou éteint tous les projecteurs du masque ; retourne leur nombre"""
+        targets = self._targets(mask)
+        with self._action('group_on' if is_on else 'group_off', mask):
+            for projector in targets:
+                if is_on:
+                    projector.turn_on()
+                else:
+                    projector.turn_off()
+        return len(targets)
+
+    def toggle(self, mask):
+        """Bascule ensemble les projecteurs du masque : tous allumés si l'un d'eux est éteint"""
+        targets = self._targets(mask)
+        return self.set_on(mask, not all(projector.is_on for projector in targets))
+
+    def set_blink(self, mask, active):
+        """Active ou désactive le clignotement individuel de tous les projecteurs du masque"""
+        with self._action('group_blink', 0, effects=True):
+            self.effects_manager.set_blink_mask(mask, active)
+        return self.effects_manager.blink_mask
@@ -0,0 +1,188 @@
+"""
+frame_recorder.py - Enregistrement et relecture des trames de sortie dans un fichier mappé en mémoire
+
+Format : un en-tête fixe (magic, version, nombre de projecteurs, nombre de trames) suivi
+d'enregistrements de taille fixe (horodatage relatif en secondes + RGB empaqueté par projecteur).
+"""
+import mmap
+import struct
+import threading
+import time
+from config import RECORDER_CONFIG
+from engine import Frame
+from shared_frames import pack_colors, unpack_colors
+
+HEADER = struct.Struct('<4sHIQ')
+TIMESTAMP = struct.Struct('<d')
+MAGIC = b'LCRC'
+VERSION = 1
+
+class FrameRecorder:
+    """Ajoute chaque trame de sortie à un fichier mappé en mémoire (sortie de RenderEngine)"""
+
+    def __init__(self, filename, num_projectors):
+        self.filename = filename
+        self.num_projectors = num_projectors
+        self.record_size = TIMESTAMP.size + 3 * num_projectors
+        self.frame_count = 0
+        self.start_time = None
+        self._lock = threading.Lock()
+
+        self.capacity = RECORDER_CONFIG['initial_capacity']
+        self._file = open(filename, 'w+b')
+        self._file.truncate(self._file_size(self.capacity))
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._write_header()
+
+    def _file_size(self, capacity):
+        """Taille du fichier pour une capacité donnée (en trames)"""
+        return HEADER.size + capacity * self.record_size
+
+    def _write_header(self):
+        """Met à jour l'en-tête (le nombre de trames y est écrit après chaque ajout)"""
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, self.num_projectors, self.frame_count)
+
+    def _grow(self):
+        """Double la capacité du fichier et le remappe"""
+        self._map.close()
+        self.capacity *= 2
+        self._file.truncate(self._file_size(self.capacity))
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def write(self, frame):
+        """Ajoute une trame du moteur"""
+        self.write_packed(frame.timestamp, pack_colors(frame.colors))
+
+    def write_packed(self, timestamp, packed):
+        """Ajoute une trame déjà empaquetée ; l'horodatage est rendu relatif au début"""
+        with self._lock:
+            if self._map is None:
+                return
+            if self.start_time is None:
+                self.start_time = timestamp
+            if self.frame_count >= self.capacity:
+                self._grow()
+
+            offset = HEADER.size + self.frame_count * self.record_size
+            TIMESTAMP.pack_into(self._map, offset, timestamp - self.start_time)
+            data_offset = offset + TIMESTAMP.size
+            self._map[data_offset:data_offset + len(packed)] = packed
+            self.frame_count += 1
+            self._write_header()
+
+    def close(self):
+        """Termine l'enregistrement et ramène le fichier à sa taille utile"""
+        with self._lock:
+            if self._map is None:
+                return
+            self._map.flush()
+            self._map.close()
+            self._map = None
+            self._file.truncate(self._file_size(self.frame_count))
+            self._file.close()
+
+class FrameReplayer:
+    """Relit un enregistrement sans le charger en mémoire : accès par indice ou par temps"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._thread = None
+        self._playing = False
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Fichier d'enregistrement vide: {filename}") from None
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"Fichier d'enregistrement tronqué: {filename}")
+        magic, version, self.num_projectors, frame_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Fichier d'enregistrement invalide: {filename}")
+
+        self.record_size = TIMESTAMP.size + 3 * self.num_projectors
+        available = (len(self._map) - HEADER.size) // self.record_size
+        self.frame_count = min(frame_count, available)
+        self.projector_ids = tuple(range(self.num_projectors))
+
+    def __len__(self):
+        return self.frame_count
+
+    def timestamp_at(self, index):
+        """Retourne l'horodatage relatif (secondes) d'une trame"""
+        return TIMESTAMP.unpack_from(self._map, HEADER.size + index * self.record_size)[0]
+
+    def packed_at(self, index):
+        """Retourne les octets RGB d'une trame (sans conversion)"""
+        offset = HEADER.size + index * self.record_size + TIMESTAMP.size
+        return self._map[offset:offset + 3 * self.num_projectors]
+
+    def frame_at(self, index):
+        """Retourne une trame prête pour ProjectorDisplay ou une autre sortie"""
+        return Frame(index + 1, self.timestamp_at(index), self.projector_ids,
+                     unpack_colors(self.packed_at(index)))
+
+    def duration(self):
+        """Retourne la durée de l'enregistrement (secondes)"""
+        if self.frame_count == 0:
+            return 0.0
+        return self.timestamp_at(self.frame_count - 1)
+
+    def index_at(self, seconds):
+        """Retourne l'indice de la dernière trame dont l'horodatage est <= seconds (recherche binaire)"""
+        low, high = 0, self.frame_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp_at(middle) <= seconds:
+                low = middle + 1
+            else:
+                high = middle
+        return max(0, low - 1)
+
+    def frames_between(self, start, end):
+        """Itère sur les trames entre deux instants (secondes), sans tout charger"""
+        index = self.index_at(start)
+        if index < self.frame_count and self.timestamp_at(index) < start:
+            index += 1
+        while index < self.frame_count and self.timestamp_at(index) <= end:
+            yield self.frame_at(index)
+            index += 1
+
+    def play(self, output, start=0.0, speed=1.0):
+        """Relit les trames vers une sortie, au rythme enregistré, dans un thread de fond"""
+        self.stop()
+        self._playing = True
+        self._thread = threading.Thread(target=self._play, args=(output, start, speed),
+                                        name="frame-replayer", daemon=True)
+        self._thread.start()
+
+    def _play(self, output, start, speed):
+        """Boucle de relecture"""
+        index = self.index_at(start)
+        origin = time.monotonic() - start / speed
+        while self._playing and index < self.frame_count:
+            delay = origin + self.timestamp_at(index) / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            output(self.frame_at(index))
+            index += 1
+        self._playing = False
+
+    def is_playing(self):
+        """Indique si une relecture est en cours"""
+        return self._playing
+
+    def stop(self):
+        """Arrête la relecture en cours"""
+        self._playing = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def close(self):
+        """Ferme le fichier"""
+        self.stop()
+        self._map.close()
+        self._file.close()
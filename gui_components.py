@@ -2,9 +2,41 @@
 gui_components.py - Composants de l'interface utilisateur utilisant config.py
 Version avec support de suppression de scènes
 """
+import importlib
 import tkinter as tk
-from tkinter import colorchooser, messagebox, simpledialog
-from config import DISPLAY_CONFIG, BUTTON_STYLES, LABELS, MESSAGES, UI_CONFIG
+from contextlib import nullcontext
+from config import BEAT_CONFIG, DISPLAY_CONFIG, BUTTON_STYLES, EFFECTS_CONFIG, LABELS, MESSAGES, UI_CONFIG
+from events import EffectsChanged, ProjectorChanged, ScenesChanged
+from fixture_groups import ids_from_mask, mask_from_ids
+
+class LazyModule:
+    """Module importé au premier accès (les dialogues ne ralentissent pas le démarrage)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attribute):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return getattr(self.module, attribute)
+
+colorchooser = LazyModule('tkinter.colorchooser')
+filedialog = LazyModule('tkinter.filedialog')
+messagebox = LazyModule('tkinter.messagebox')
+simpledialog = LazyModule('tkinter.simpledialog')
+
+def record_action(history, label, **kwargs):
+    """Retourne le contexte d'enregistrement d'une action (aucun si pas d'historique)"""
+    if history is None:
+        return nullcontext()
+    return history.action(label, **kwargs)
+
+def state_lock(history):
+    """Retourne le verrou d'état partagé avec le moteur, pour une modification non enregistrée"""
+    if history is None:
+        return nullcontext()
+    return history.lock
 
 class ProjectorDisplay:
     """Affichage des projecteurs sur le canvas"""
@@ -12,6 +44,8 @@ class ProjectorDisplay:
     def __init__(self, canvas, projectors):
         self.canvas = canvas
         self.projectors = projectors
+        self.drawn_colors = {}
+        self.shown_sequence = None
         self.create_projector_rectangles()
     
     def create_projector_rectangles(self):
@@ -33,11 +67,25 @@ class ProjectorDisplay:
                                   fill="yellow", font=("Arial", 12, 'bold'))
     
     def update_projector(self, projector_id):
-        """Met à jour l'affichage d'un projecteur"""
+        """Met à jour l'affichage d'un projecteur (uniquement si sa couleur a changé)"""
         projector = self.projectors[projector_id]
         color = projector.get_dimmed_color()
+        if self.drawn_colors.get(projector_id) == color:
+            return
+        self.drawn_colors[projector_id] = color
         self.canvas.itemconfig(projector.rect, fill=color)
     
+    def show_frame(self, frame):
+        """Affiche une trame calculée par le moteur (seules les couleurs modifiées sont redessinées)"""
+        if frame.sequence == self.shown_sequence:
+            return
+        self.shown_sequence = frame.sequence
+        for projector_id, color in zip(frame.projector_ids, frame.colors):
+            if self.drawn_colors.get(projector_id) == color:
+                continue
+            self.drawn_colors[projector_id] = color
+            self.canvas.itemconfig(self.projectors[projector_id].rect, fill=color)
+    
     def update_all_projectors(self):
         """Met à jour l'affichage de tous les projecteurs"""
         for i in self.projectors.keys():
@@ -45,18 +93,31 @@ class ProjectorDisplay:
 
 class ControlPanel:
     """Panneau de contrôle des projecteurs"""
-    def __init__(self, parent, projectors, on_projector_select, on_intensity_change):
+    def __init__(self, parent, projectors, on_projector_select, on_intensity_change, history=None,
+                 bus=None, input_queue=None, groups=None, bulk=None):
         self.parent = parent
         self.projectors = projectors
+        self.history = history
+        self.input_queue = input_queue
+        self.groups = groups
+        self.bulk = bulk
         self.selected_projector = 0
+        self.selection_mask = 1
+        self.page = 0
+        self.page_size = min(UI_CONFIG['selector_page_size'], len(projectors))
+        self.page_label = None
         self.on_projector_select = on_projector_select
         self.on_intensity_change = on_intensity_change
         
         self.projector_buttons = []
         self.intensity_scale = None
         self.info_label = None
+        self.info_text = None
+        self._updating = False
         
         self.create_controls()
+        if bus is not None:
+            bus.subscribe(ProjectorChanged, self.on_projector_changed)
     
     def create_controls(self):
         """Crée les contrôles de sélection et d'intensité"""
@@ -71,14 +132,23 @@ class ControlPanel:
         selection_frame = tk.Frame(self.parent, bg=UI_CONFIG['control_color'])
         selection_frame.pack(pady=5)
         
-        for i in range(len(self.projectors)):
-            btn = tk.Button(selection_frame, text=f"P{i+1}", width=6, height=2,
-                           command=lambda x=i: self.select_projector(x), **default_style)
-            btn.grid(row=0, column=i, padx=2)
+        for slot in range(self.page_size):
+            btn = tk.Button(selection_frame, text=f"P{slot+1}", width=6, height=2,
+                           command=lambda x=slot: self.select_slot(x), **default_style)
+            btn.grid(row=0, column=slot, padx=2)
+            btn.bind('<Control-Button-1>', lambda event, x=slot: self.toggle_slot(x) or "break")
             self.projector_buttons.append(btn)
         
         self.projector_buttons[0].config(bg=selected_style['bg'])
         
+        if len(self.projectors) > self.page_size:
+            self.create_page_navigation()
+        
+        if self.groups is not None:
+            self.btn_groups = tk.Button(self.parent, text=LABELS['groups'], width=12,
+                                       command=self.choose_group, **default_style)
+            self.btn_groups.pack(pady=2)
+        
         tk.Label(self.parent, text=LABELS['individual_controls'], 
                 bg=UI_CONFIG['control_color'], fg="white", font=('Arial', 10, 'bold')).pack(pady=(20, 5))
         
@@ -100,7 +170,7 @@ class ControlPanel:
                                        length=150, command=self.on_intensity_changed,
                                        bg='#444444', fg='white', highlightbackground=UI_CONFIG['control_color'],
                                        troughcolor='#666666', font=('Arial', 8))
-        self.intensity_scale.set(100)
+        self._show_intensity(self.projectors[self.selected_projector].intensity)
         self.intensity_scale.pack(pady=5)
         self.info_label = tk.Label(self.parent, text="", bg=UI_CONFIG['control_color'], fg="white", 
                                   font=('Arial', 8), wraplength=180)
@@ -108,38 +178,204 @@ class ControlPanel:
         
         self.update_info_display()
     
+    def create_page_navigation(self):
+        """Crée la navigation par pages et la saisie directe d'un numéro de projecteur"""
+        default_style = BUTTON_STYLES['default']
+        navigation_frame = tk.Frame(self.parent, bg=UI_CONFIG['control_color'])
+        navigation_frame.pack(pady=2)
+        
+        tk.Button(navigation_frame, text="◀", width=2, command=lambda: self.show_page(self.page - 1),
+                  **default_style).pack(side=tk.LEFT, padx=2)
+        self.page_label = tk.Label(navigation_frame, text="", width=14, bg=UI_CONFIG['control_color'],
+                                   fg="white", font=('Arial', 8))
+        self.page_label.pack(side=tk.LEFT)
+        tk.Button(navigation_frame, text="▶", width=2, command=lambda: self.show_page(self.page + 1),
+                  **default_style).pack(side=tk.LEFT, padx=2)
+        
+        self.goto_entry = tk.Entry(navigation_frame, width=6, bg='#444444', fg='white',
+                                   insertbackground='white')
+        self.goto_entry.pack(side=tk.LEFT, padx=(6, 0))
+        self.goto_entry.bind('<Return>', self.on_goto_projector)
+        self.update_page_label()
+    
+    def page_count(self):
+        """Nombre de pages du sélecteur"""
+        return -(-len(self.projectors) // self.page_size)
+    
+    def slot_projector(self, slot):
+        """Projecteur affiché dans un emplacement (None au-delà du dernier)"""
+        projector_id = self.page * self.page_size + slot
+        return projector_id if projector_id < len(self.projectors) else None
+    
+    def show_page(self, page):
+        """Affiche une page du sélecteur : seuls les boutons visibles sont reconfigurés"""
+        page = max(0, min(self.page_count() - 1, page))
+        if page == self.page:
+            return
+        self.page = page
+        for slot, btn in enumerate(self.projector_buttons):
+            projector_id = self.slot_projector(slot)
+            if projector_id is None:
+                btn.config(text="", state=tk.DISABLED, bg=BUTTON_STYLES['default']['bg'])
+            else:
+                btn.config(text=f"P{projector_id+1}", state=tk.NORMAL,
+                           bg=self._selection_color(projector_id))
+        self.update_page_label()
+    
+    def update_page_label(self):
+        """Met à jour l'indication de la plage affichée"""
+        if self.page_label is None:
+            return
+        first = self.page * self.page_size + 1
+        last = min(first + self.page_size - 1, len(self.projectors))
+        self.page_label.config(text=f"{first}-{last} / {len(self.projectors)}")
+    
+    def on_goto_projector(self, event=None):
+        """Sélectionne le projecteur dont le numéro a été saisi"""
+        try:
+            projector_id = int(self.goto_entry.get()) - 1
+        except ValueError:
+            return
+        if 0 <= projector_id < len(self.projectors):
+            self.select_projector(projector_id)
+        self.goto_entry.delete(0, tk.END)
+    
+    def select_slot(self, slot):
+        """Clic sur un emplacement du sélecteur"""
+        projector_id = self.slot_projector(slot)
+        if projector_id is not None:
+            self.select_projector(projector_id)
+    
+    def toggle_slot(self, slot):
+        """Ctrl+clic sur un emplacement du sélecteur"""
+        projector_id = self.slot_projector(slot)
+        if projector_id is not None:
+            self.toggle_in_selection(projector_id)
+    
+    def _selection_color(self, projector_id):
+        """Couleur du bouton d'un projecteur selon la sélection"""
+        if projector_id == self.selected_projector:
+            return BUTTON_STYLES['selected']['bg']
+        if self.selection_mask >> projector_id & 1:
+            return BUTTON_STYLES['multi_selected']['bg']
+        return BUTTON_STYLES['default']['bg']
+    
     def select_projector(self, projector_id):
-        """Sélectionne un projecteur"""
-        for btn in self.projector_buttons:
-            btn.config(bg=BUTTON_STYLES['default']['bg'])
+        """Sélectionne un projecteur (la sélection multiple est remplacée)"""
+        self.set_selection(1 << projector_id, projector_id)
+    
+    def toggle_in_selection(self, projector_id):
+        """Ajoute ou retire un projecteur de la sélection multiple (Ctrl+clic)"""
+        mask = self.selection_mask ^ (1 << projector_id)
+        if not mask:
+            return
+        focus = projector_id if mask >> projector_id & 1 else self.selected_projector
+        self.set_selection(mask, focus)
+    
+    def set_selection(self, mask, focus=None):
+        """Définit la sélection (masque) et le projecteur affiché dans les informations"""
+        if not mask:
+            return
+        if focus is None or not mask >> focus & 1:
+            focus = ids_from_mask(mask)[0]
+        changed = (self.selection_mask ^ mask) | (1 << self.selected_projector) | (1 << focus)
+        self.selection_mask = mask
+        self.selected_projector = focus
         
-        self.projector_buttons[projector_id].config(bg=BUTTON_STYLES['selected']['bg'])
-        self.selected_projector = projector_id
+        if focus // self.page_size != self.page:
+            self.show_page(focus // self.page_size)
+        else:
+            first = self.page * self.page_size
+            visible = ((1 << self.page_size) - 1) << first
+            for projector_id in ids_from_mask(changed & visible):
+                self.projector_buttons[projector_id - first].config(
+                    bg=self._selection_color(projector_id))
         
-        self.intensity_scale.set(self.projectors[projector_id].intensity)
+        self._show_intensity(self.projectors[focus].intensity)
         
         self.update_info_display()
-        self.on_projector_select(projector_id)
+        self.on_projector_select(focus)
+    
+    def is_multi_selection(self):
+        """Indique si plusieurs projecteurs sont sélectionnés"""
+        return self.selection_mask & (self.selection_mask - 1) != 0
+    
+    def choose_group(self):
+        """Sélectionne un groupe existant, ou crée un groupe à partir de la sélection"""
+        names = self.groups.get_group_list()
+        name = simpledialog.askstring(LABELS['groups'], MESSAGES['group_prompt'].format(
+            groups=", ".join(names) or "-"))
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        if name in self.groups.groups:
+            self.set_selection(self.groups.get_mask(name))
+        else:
+            self.groups.define(name, ids_from_mask(self.selection_mask))
+            messagebox.showinfo(LABELS['groups'], MESSAGES['group_created'].format(
+                name=name, count=len(ids_from_mask(self.selection_mask))))
     
     def toggle_light(self):
-        """Active/désactive le projecteur sélectionné"""
-        self.projectors[self.selected_projector].toggle()
+        """Active/désactive le projecteur sélectionné (ou toute la sélection)"""
+        if self.bulk is not None and self.is_multi_selection():
+            self.bulk.toggle(self.selection_mask)
+        else:
+            with record_action(self.history, 'toggle', projector_ids=[self.selected_projector]):
+                self.projectors[self.selected_projector].toggle()
         self.update_info_display()
     
     def pick_color(self):
         """Ouvre le sélecteur de couleur"""
         color_code = colorchooser.askcolor(title=MESSAGES['color_picker_title'])[1]
         if color_code:
-            self.projectors[self.selected_projector].set_color(color_code)
+            if self.bulk is not None and self.is_multi_selection():
+                self.bulk.set_color(self.selection_mask, color_code)
+            else:
+                with record_action(self.history, 'color', projector_ids=[self.selected_projector]):
+                    self.projectors[self.selected_projector].set_color(color_code)
             self.update_info_display()
     
+    def _show_intensity(self, intensity):
+        """Place la glissière sans appliquer la valeur à la sélection
+
+        Tk appelle la commande de la glissière au premier moment d'inactivité : elle est traitée
+        ici, pendant que _updating la neutralise.
+        """
+        self._updating = True
+        try:
+            self.intensity_scale.set(intensity)
+            self.intensity_scale.update_idletasks()
+        finally:
+            self._updating = False
+    
     def on_intensity_changed(self, value):
-        """Callback pour le changement d'intensité"""
+        """Callback pour le changement d'intensité (fusionné par la file d'entrées si présente)"""
+        if self._updating:
+            return
         intensity = int(value)
-        self.projectors[self.selected_projector].set_intensity(intensity)
-        self.update_info_display()
+        if self.input_queue is not None:
+            for projector_id in ids_from_mask(self.selection_mask):
+                self.input_queue.submit(projector_id, 'intensity', intensity)
+        elif self.bulk is not None and self.is_multi_selection():
+            self.bulk.set_intensity(self.selection_mask, intensity)
+            self.update_info_display()
+        else:
+            with record_action(self.history, 'intensity', projector_ids=[self.selected_projector],
+                               merge_key=('intensity', self.selected_projector)):
+                self.projectors[self.selected_projector].set_intensity(intensity)
+            self.update_info_display()
         self.on_intensity_change(self.selected_projector, intensity)
     
+    def refresh(self):
+        """Resynchronise la glissière et les informations avec l'état du projecteur sélectionné"""
+        self._show_intensity(self.projectors[self.selected_projector].intensity)
+        self.update_info_display()
+    
+    def on_projector_changed(self, event):
+        """Met à jour les informations si le projecteur sélectionné a changé"""
+        if event.projector_id == self.selected_projector:
+            self.update_info_display()
+    
     def update_info_display(self):
         """Met à jour l'affichage des informations du projecteur"""
         projector = self.projectors[self.selected_projector]
@@ -147,17 +383,29 @@ class ControlPanel:
         info_text = (f"PROJ {self.selected_projector + 1}\n{status}\n"
                     f"Couleur: {projector.base_color}\n"
                     f"Intensité: {projector.intensity}%")
-        self.info_label.config(text=info_text)
+        if self.is_multi_selection():
+            info_text += f"\nSélection: {bin(self.selection_mask).count('1')} projecteurs"
+
+        if info_text != self.info_text:
+            self.info_text = info_text
+            self.info_label.config(text=info_text)
 
 class EffectsPanel:
     """Panneau des effets spéciaux avec exclusion mutuelle"""   
-    def __init__(self, parent, effects_manager, get_selected_projector_callback):
+    def __init__(self, parent, effects_manager, get_selected_projector_callback, history=None,
+                 bus=None, get_selection_mask_callback=None):
         self.parent = parent
         self.effects_manager = effects_manager
+        self.history = history
         self.get_selected_projector = get_selected_projector_callback
+        self.get_selection_mask = get_selection_mask_callback
         self.status_labels = {}
+        self.status_texts = {}
         
         self.create_effects_controls()
+        self.on_effects_changed(None)
+        if bus is not None:
+            bus.subscribe(EffectsChanged, self.on_effects_changed)
     
     def create_effects_controls(self):
         """Crée les contrôles d'effets"""
@@ -202,6 +450,39 @@ class EffectsPanel:
         self.btn_fade = tk.Button(fade_frame, text=LABELS['fade'], width=21, height=2,
                                  command=self.toggle_fade, **effect_style)
         self.btn_fade.pack(pady=2)
+        
+        color_buttons_frame = tk.Frame(fade_frame, bg=UI_CONFIG['control_color'])
+        color_buttons_frame.pack(pady=2)
+        
+        self.color_effect_buttons = {}
+        for position, effect in enumerate(self.effects_manager.COLOR_EFFECTS):
+            btn = tk.Button(color_buttons_frame, text=LABELS[effect], width=10,
+                           command=lambda x=effect: self.toggle_color_effect(x), **effect_style)
+            btn.grid(row=position // 2, column=position % 2, padx=1, pady=1)
+            self.color_effect_buttons[effect] = btn
+        
+        self.btn_pixel_map = tk.Button(fade_frame, text=LABELS['pixel_map'], width=21,
+                                      command=self.toggle_pixel_map, **effect_style)
+        self.btn_pixel_map.pack(pady=2)
+        
+        tempo_frame = tk.Frame(self.parent, bg=UI_CONFIG['control_color'])
+        tempo_frame.pack(pady=5)
+        
+        tk.Label(tempo_frame, text=LABELS['tempo'], 
+                bg=UI_CONFIG['control_color'], fg="lightgreen", font=('Arial', 8, 'bold')).grid(
+                    row=0, column=0, columnspan=3)
+        
+        self.btn_tap = tk.Button(tempo_frame, text=LABELS['tap'], width=6,
+                                command=self.tap_tempo, **effect_style)
+        self.btn_tap.grid(row=1, column=0, padx=1, pady=2)
+        
+        self.btn_bpm = tk.Button(tempo_frame, text=LABELS['bpm'], width=6,
+                                command=self.set_bpm, **effect_style)
+        self.btn_bpm.grid(row=1, column=1, padx=1, pady=2)
+        
+        self.btn_beat_sync = tk.Button(tempo_frame, text=LABELS['beat_sync'], width=6,
+                                      command=self.toggle_beat_sync, **effect_style)
+        self.btn_beat_sync.grid(row=1, column=2, padx=1, pady=2)
  
         config_frame = tk.Frame(self.parent, bg=UI_CONFIG['control_color'])
         config_frame.pack(pady=10)
@@ -213,6 +494,18 @@ class EffectsPanel:
                                         command=self.set_fade_colors, **default_style)
         self.btn_fade_colors.pack(pady=2)
         
+        self.btn_temperature = tk.Button(config_frame, text=LABELS['temperature'], width=15,
+                                        command=self.set_color_temperature, **default_style)
+        self.btn_temperature.pack(pady=2)
+        
+        self.btn_chase_pattern = tk.Button(config_frame, text=LABELS['chase_pattern'], width=15,
+                                          command=self.choose_chase_pattern, **default_style)
+        self.btn_chase_pattern.pack(pady=2)
+        
+        self.btn_pixel_map_source = tk.Button(config_frame, text=LABELS['pixel_map_source'], width=15,
+                                             command=self.load_pixel_map, **default_style)
+        self.btn_pixel_map_source.pack(pady=2)
+        
         self.btn_stop_effects = tk.Button(config_frame, text=LABELS['stop_effects'], width=15, height=2,
                                          command=self.stop_all_effects, **stop_style)
         self.btn_stop_effects.pack(pady=5)
@@ -231,7 +524,11 @@ class EffectsPanel:
             'rhythm': tk.Label(status_frame, text="RYTHME: OFF", 
                               bg=UI_CONFIG['control_color'], fg="gray", font=('Arial', 7)),
             'fade': tk.Label(status_frame, text="FONDU: OFF", 
-                            bg=UI_CONFIG['control_color'], fg="gray", font=('Arial', 7))
+                            bg=UI_CONFIG['control_color'], fg="gray", font=('Arial', 7)),
+            'color': tk.Label(status_frame, text="COULEUR: OFF", 
+                             bg=UI_CONFIG['control_color'], fg="gray", font=('Arial', 7)),
+            'tempo': tk.Label(status_frame, text="TEMPO: -", 
+                             bg=UI_CONFIG['control_color'], fg="gray", font=('Arial', 7))
         }
         
         for label in self.status_labels.values():
@@ -257,10 +554,19 @@ class EffectsPanel:
             self.btn_chaser.config(bg=active_bg)
     
     def toggle_blink(self):
-        """Active/désactive le clignotement du projecteur sélectionné"""
+        """Active/désactive le clignotement du projecteur sélectionné (ou de toute la sélection)"""
+        mask = self.get_selection_mask() if self.get_selection_mask else 0
+        if mask & (mask - 1):
+            with record_action(self.history, 'blink', projector_ids=[], effects=True):
+                is_active = (self.effects_manager.blink_mask & mask) != mask
+                self.effects_manager.set_blink_mask(mask, is_active)
+            self._update_rhythm_buttons('blink' if self.effects_manager.blink_mask else None)
+            return
+        
         selected_id = self.get_selected_projector()
         if selected_id is not None:
-            is_active = self.effects_manager.toggle_blink(selected_id)
+            with record_action(self.history, 'blink', projector_ids=[], effects=True):
+                is_active = self.effects_manager.toggle_blink(selected_id)
             if is_active:
                 self._update_rhythm_buttons('blink')
             else:
@@ -268,7 +574,8 @@ class EffectsPanel:
     
     def toggle_blink_all(self):
         """Active/désactive le clignotement collectif"""
-        is_active = self.effects_manager.toggle_blink_all()
+        with record_action(self.history, 'blink_all', projector_ids=[], effects=True):
+            is_active = self.effects_manager.toggle_blink_all()
         if is_active:
             self._update_rhythm_buttons('blink_all')
         else:
@@ -276,7 +583,8 @@ class EffectsPanel:
     
     def toggle_strobe(self):
         """Active/désactive l'effet strobe"""
-        is_active = self.effects_manager.toggle_strobe()
+        with record_action(self.history, 'strobe', projector_ids=[], effects=True):
+            is_active = self.effects_manager.toggle_strobe()
         if is_active:
             self._update_rhythm_buttons('strobe')
         else:
@@ -284,7 +592,8 @@ class EffectsPanel:
     
     def toggle_chaser(self):
         """Active/désactive l'effet chaser"""
-        is_active = self.effects_manager.toggle_chaser()
+        with record_action(self.history, 'chaser', projector_ids=[], effects=True):
+            is_active = self.effects_manager.toggle_chaser()
         if is_active:
             self._update_rhythm_buttons('chaser')
         else:
@@ -292,17 +601,124 @@ class EffectsPanel:
     
     def toggle_fade(self):
         """Active/désactive l'effet de fondu"""
-        is_active = self.effects_manager.toggle_fade()
+        with record_action(self.history, 'fade', projector_ids=[], effects=True):
+            is_active = self.effects_manager.toggle_fade()
         if is_active:
             self.btn_fade.config(bg='#ff4400')
         else:
             self.btn_fade.config(bg=BUTTON_STYLES['effect']['bg'])
+        self._update_color_buttons()
+    
+    def toggle_color_effect(self, effect):
+        """Active/désactive un effet de couleur (exclusif avec le fondu)"""
+        with record_action(self.history, effect, projector_ids=[], effects=True):
+            self.effects_manager.toggle_color_effect(effect)
+        self.sync_buttons()
+    
+    def _update_color_buttons(self):
+        """Met à jour l'apparence des boutons d'effets de couleur et du pixel map"""
+        active = self.effects_manager.color_effect
+        for effect, btn in self.color_effect_buttons.items():
+            btn.config(bg='#ff4400' if effect == active else BUTTON_STYLES['effect']['bg'])
+        synced = bool(self.effects_manager.beat_divisions)
+        self.btn_beat_sync.config(bg='#ff4400' if synced else BUTTON_STYLES['effect']['bg'])
+        pixel_map_active = self.effects_manager.active_effects['pixel_map']['active']
+        self.btn_pixel_map.config(bg='#ff4400' if pixel_map_active else BUTTON_STYLES['effect']['bg'])
+    
+    def tap_tempo(self, event=None):
+        """Frappe de tap tempo (bouton ou F7)"""
+        with state_lock(self.history):
+            self.effects_manager.tap_tempo()
+    
+    def set_bpm(self):
+        """Saisie du tempo en BPM"""
+        bpm = simpledialog.askfloat(LABELS['bpm'], MESSAGES['bpm_prompt'].format(
+            current=self.effects_manager.beat_clock.bpm),
+            minvalue=BEAT_CONFIG['min_bpm'], maxvalue=BEAT_CONFIG['max_bpm'])
+        if bpm:
+            with record_action(self.history, 'bpm', projector_ids=[], effects=True):
+                self.effects_manager.set_bpm(bpm)
+    
+    def toggle_beat_sync(self):
+        """Cadence le strobe, le clignotement et le chaser sur le tempo (ou revient aux ticks)"""
+        synced = bool(self.effects_manager.beat_divisions)
+        with record_action(self.history, 'beat_sync', projector_ids=[], effects=True):
+            for target, division in BEAT_CONFIG['sync_divisions'].items():
+                self.effects_manager.set_beat_sync(target, None if synced else division)
+        self.btn_beat_sync.config(bg=BUTTON_STYLES['effect']['bg'] if synced else '#ff4400')
+    
+    def toggle_pixel_map(self):
+        """Active/désactive la lecture du contenu chargé sur les projecteurs"""
+        if self.effects_manager.pixel_map is None:
+            messagebox.showwarning(LABELS['pixel_map'], MESSAGES['pixel_map_missing'])
+            return
+        with record_action(self.history, 'pixel_map', projector_ids=[], effects=True):
+            self.effects_manager.toggle_pixel_map()
+        self._update_color_buttons()
+    
+    def load_pixel_map(self):
+        """Choisit une image PPM ou un fichier de trames brutes RGB24 pour le pixel map"""
+        path = filedialog.askopenfilename(title=LABELS['pixel_map_source'],
+                                          filetypes=[("Images PPM", "*.ppm"), ("Trames brutes RGB24", "*.rgb *.raw"),
+                                                     ("Tous les fichiers", "*.*")])
+        if not path:
+            return
+        width = height = None
+        if not path.lower().endswith('.ppm'):
+            size = simpledialog.askstring(LABELS['pixel_map_source'], MESSAGES['pixel_map_size_prompt'])
+            if not size:
+                return
+            try:
+                width, height = (int(value) for value in size.lower().split('x'))
+            except ValueError:
+                messagebox.showerror(LABELS['pixel_map_source'], MESSAGES['pixel_map_size_invalid'])
+                return
+        from pixel_mapping import load_pixel_map
+        try:
+            player = load_pixel_map(path, self.effects_manager.num_projectors, width, height)
+        except (OSError, ValueError) as e:
+            messagebox.showerror(LABELS['pixel_map_source'], MESSAGES['pixel_map_error'].format(error=e))
+            return
+        with state_lock(self.history):
+            self.effects_manager.set_pixel_map(player)
+        messagebox.showinfo(LABELS['pixel_map_source'], MESSAGES['pixel_map_loaded'].format(
+            count=player.frame_count, width=player.source.width, height=player.source.height))
+    
+    def set_color_temperature(self):
+        """Règle la température de couleur (K)"""
+        minimum, maximum, _ = EFFECTS_CONFIG['temperature_range']
+        kelvin = simpledialog.askinteger(LABELS['temperature'], MESSAGES['temperature_prompt'].format(
+            current=self.effects_manager.color_temperature), minvalue=minimum, maxvalue=maximum)
+        if kelvin:
+            with record_action(self.history, 'color_temperature', projector_ids=[], effects=True):
+                self.effects_manager.set_color_temperature(kelvin)
+    
+    def choose_chase_pattern(self):
+        """Choisit le motif du chaser, ou en crée un (un pas par projecteur sélectionné)"""
+        names = self.effects_manager.get_chase_pattern_list()
+        name = simpledialog.askstring(LABELS['chase_pattern'], MESSAGES['chase_pattern_prompt'].format(
+            patterns=", ".join(names) or "-"))
+        if name is None:
+            return
+        name = name.strip() or None
+        if name is not None and name not in names:
+            mask = self.get_selection_mask() if self.get_selection_mask else 0
+            steps = [[projector_id] for projector_id in ids_from_mask(mask)]
+            if len(steps) < 2:
+                messagebox.showwarning(LABELS['chase_pattern'], MESSAGES['chase_pattern_selection'])
+                return
+            with state_lock(self.history):
+                self.effects_manager.define_chase_pattern(name, {'steps': steps})
+        with record_action(self.history, 'chase_pattern', projector_ids=[], effects=True):
+            self.effects_manager.set_chase_pattern(name)
     
     def stop_all_effects(self):
         """Arrête tous les effets"""
-        self.effects_manager.stop_all_effects()
+        with record_action(self.history, 'stop_effects', projector_ids=[], effects=True):
+            self.effects_manager.stop_all_effects()
         self._update_rhythm_buttons()
         self.btn_fade.config(bg=BUTTON_STYLES['effect']['bg'])
+        self._update_color_buttons()
     
     def set_fade_colors(self):
         """Configure les couleurs du fondu"""
@@ -310,10 +726,40 @@ class EffectsPanel:
         if color1:
             color2 = colorchooser.askcolor(title=MESSAGES['fade_color2_title'])[1]
             if color2:
-                self.effects_manager.set_fade_colors(color1, color2)
+                with record_action(self.history, 'fade_colors', projector_ids=[], effects=True):
+                    self.effects_manager.set_fade_colors(color1, color2)
                 messagebox.showinfo(MESSAGES['fade_colors_title'], 
                                   MESSAGES['fade_configured'].format(color1=color1, color2=color2))
     
+    def sync_buttons(self):
+        """Resynchronise l'apparence des boutons avec l'état des effets (après annulation ou scène)"""
+        status = self.effects_manager.get_effects_status()
+        if status['strobe']:
+            self._update_rhythm_buttons('strobe')
+        elif status['chaser']:
+            self._update_rhythm_buttons('chaser')
+        elif status['blink_all']:
+            self._update_rhythm_buttons('blink_all')
+        elif any(status['individual_blinks'].values()):
+            self._update_rhythm_buttons('blink')
+        else:
+            self._update_rhythm_buttons()
+        
+        fade_bg = '#ff4400' if status['fade'] else BUTTON_STYLES['effect']['bg']
+        self.btn_fade.config(bg=fade_bg)
+        self._update_color_buttons()
+    
+    def on_effects_changed(self, event):
+        """Met à jour boutons et indicateurs lorsque l'état des effets change"""
+        self.sync_buttons()
+        self.update_status_indicators()
+    
+    def _set_status(self, key, text, fg):
+        """Reconfigure un indicateur uniquement si son contenu change"""
+        if self.status_texts.get(key) != (text, fg):
+            self.status_texts[key] = (text, fg)
+            self.status_labels[key].config(text=text, fg=fg)
+    
     def update_status_indicators(self):
         """Met à jour les indicateurs d'état des effets"""
         status = self.effects_manager.get_effects_status()
@@ -322,7 +768,7 @@ class EffectsPanel:
         if status['strobe']:
             rhythm_active = "STROBE"
         elif status['chaser']:
-            rhythm_active = "CHASER"
+            rhythm_active = f"CHASER {status['chase_pattern']}" if status['chase_pattern'] else "CHASER"
         elif status['blink_all']:
             rhythm_active = "BLINK ALL"
         elif any(status['individual_blinks'].values()):
@@ -330,25 +776,43 @@ class EffectsPanel:
             rhythm_active = f"BLINK P{',P'.join(active_blinks)}"
         
         if rhythm_active:
-            self.status_labels['rhythm'].config(text=f"RYTHME: {rhythm_active}", fg="lime")
+            self._set_status('rhythm', f"RYTHME: {rhythm_active}", "lime")
         else:
-            self.status_labels['rhythm'].config(text="RYTHME: OFF", fg="gray")
+            self._set_status('rhythm', "RYTHME: OFF", "gray")
         
         if status['fade']:
-            self.status_labels['fade'].config(text="FONDU: ON", fg="lime")
+            self._set_status('fade', "FONDU: ON", "lime")
+        else:
+            self._set_status('fade', "FONDU: OFF", "gray")
+        
+        if status['color_effect'] == 'color_temperature':
+            self._set_status('color', f"COULEUR: {status['color_temperature']} K", "lime")
+        elif status['color_effect']:
+            self._set_status('color', f"COULEUR: {LABELS[status['color_effect']]}", "lime")
+        elif status['pixel_map']:
+            self._set_status('color', f"COULEUR: {LABELS['pixel_map']}", "lime")
         else:
-            self.status_labels['fade'].config(text="FONDU: OFF", fg="gray")
+            self._set_status('color', "COULEUR: OFF", "gray")
+        
+        if status['beat_divisions']:
+            self._set_status('tempo', f"TEMPO: {status['bpm']:.1f} BPM (sync)", "lime")
+        else:
+            self._set_status('tempo', f"TEMPO: {status['bpm']:.1f} BPM", "gray")
 
 class GlobalControlPanel:
     """Panneau des contrôles globaux et scènes avec suppression"""
     
-    def __init__(self, parent, projectors, scene_manager):
+    def __init__(self, parent, projectors, scene_manager, history=None, bus=None, bulk=None):
         self.parent = parent
         self.projectors = projectors
         self.scene_manager = scene_manager
+        self.history = history
+        self.bulk = bulk
         self.scene_buttons = []
         
         self.create_global_controls()
+        if bus is not None:
+            bus.subscribe(ScenesChanged, self.on_scenes_changed)
     
     def create_global_controls(self):
 
@@ -421,13 +885,21 @@ class GlobalControlPanel:
     
     def all_lights_on(self):
         """Allume tous les projecteurs"""
-        for projector in self.projectors.values():
-            projector.turn_on()
+        if self.bulk is not None:
+            self.bulk.set_on(mask_from_ids(self.projectors), True)
+            return
+        with record_action(self.history, 'all_on'):
+            for projector in self.projectors.values():
+                projector.turn_on()
     
     def all_lights_off(self):
         """Éteint tous les projecteurs"""
-        for projector in self.projectors.values():
-            projector.turn_off()
+        if self.bulk is not None:
+            self.bulk.set_on(mask_from_ids(self.projectors), False)
+            return
+        with record_action(self.history, 'all_off'):
+            for projector in self.projectors.values():
+                projector.turn_off()
     
     def save_scene(self):
         """Sauvegarde une nouvelle scène"""
@@ -452,15 +924,44 @@ class GlobalControlPanel:
             return
         
         scene_name = simpledialog.askstring(MESSAGES['load_scene_title'], 
-            MESSAGES['load_scene_prompt'].format(scenes=', '.join(scene_list)))
+            MESSAGES['load_scene_prompt'].format(scenes=self._format_scene_list(scene_list)))
         
         if scene_name and scene_name.strip():
-            if self.scene_manager.load_scene(scene_name.strip()):
+            scene_name = self._resolve_scene_name(scene_name.strip())
+            if scene_name is None:
+                return
+            with record_action(self.history, 'load_scene', effects=True):
+                loaded = self.scene_manager.load_scene(scene_name)
+            if loaded:
                 messagebox.showinfo(MESSAGES['load_scene_title'], 
-                                  MESSAGES['scene_loaded'].format(name=scene_name.strip()))
+                                  MESSAGES['scene_loaded'].format(name=scene_name))
             else:
                 messagebox.showerror("Erreur", 
-                                   MESSAGES['scene_not_found'].format(name=scene_name.strip()))
+                                   MESSAGES['scene_not_found'].format(name=scene_name))
+    
+    def _format_scene_list(self, scene_list):
+        """Formate la liste des scènes pour une invite (tronquée pour les grandes bibliothèques)"""
+        max_names = UI_CONFIG['scene_prompt_max_names']
+        if len(scene_list) <= max_names:
+            return ', '.join(scene_list)
+        return MESSAGES['scene_list_truncated'].format(
+            scenes=', '.join(scene_list[:max_names]), count=len(scene_list) - max_names)
+    
+    def _resolve_scene_name(self, text):
+        """Résout un nom saisi : nom exact, sinon préfixe unique via l'index des scènes"""
+        if self.scene_manager.has_scene(text):
+            return text
+        
+        matches = self.scene_manager.find_scenes(prefix=text)
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            messagebox.showinfo(MESSAGES['load_scene_title'], 
+                              MESSAGES['scene_matches'].format(
+                                  prefix=text, scenes=self._format_scene_list(matches)))
+        else:
+            messagebox.showerror("Erreur", MESSAGES['scene_not_found'].format(name=text))
+        return None
     
     def delete_scene(self):
         """Supprime une scène existante"""
@@ -470,7 +971,7 @@ class GlobalControlPanel:
             return
         
         scene_name = simpledialog.askstring("Supprimer une scène", 
-            f"Scènes disponibles: {', '.join(scene_list)}\nNom de la scène à supprimer:")
+            f"Scènes disponibles: {self._format_scene_list(scene_list)}\nNom de la scène à supprimer:")
         
         if scene_name and scene_name.strip():
             if messagebox.askyesno("Confirmation", 
@@ -484,7 +985,9 @@ class GlobalControlPanel:
     def recall_quick_scene(self, scene_index):
         """Gère les scènes de rappel rapide"""
         if self.scene_manager.has_quick_scene(scene_index):
-            if self.scene_manager.load_quick_scene(scene_index):
+            with record_action(self.history, 'load_scene', effects=True):
+                loaded = self.scene_manager.load_quick_scene(scene_index)
+            if loaded:
                 messagebox.showinfo("Rappel rapide", f"Scène rapide {scene_index+1} chargée!")
             else:
                 messagebox.showerror("Erreur", f"Erreur lors du chargement de la scène rapide {scene_index+1}")
@@ -512,10 +1015,17 @@ class GlobalControlPanel:
             else:
                 messagebox.showinfo("Effacement", "Aucune scène rapide à effacer.")
     
+    def on_scenes_changed(self, event):
+        """Met à jour les boutons de scènes rapides si l'une d'elles a changé"""
+        if any(name.startswith('Quick_') for name in event.names):
+            self.update_quick_scene_buttons()
+    
     def update_quick_scene_buttons(self):
-        """Met à jour l'apparence des boutons de scènes rapides"""
+        """Met à jour l'apparence des boutons de scènes rapides (repeints par ScenesChanged
+        à la fin du chargement initial, sans l'attendre)"""
+        loaded = self.scene_manager.loaded
         for i, btn in enumerate(self.scene_buttons):
-            if self.scene_manager.has_quick_scene(i):
+            if loaded and self.scene_manager.has_quick_scene(i):
                 btn.config(bg=BUTTON_STYLES['programmed']['bg'])
             else:
                 btn.config(bg=BUTTON_STYLES['default']['bg'])
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""
+history.py - Historique annuler/rétablir basé sur des deltas par action
+"""
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from config import HISTORY_CONFIG
+
+class HistoryEntry:
+    """Une action enregistrée : seuls les projecteurs et effets modifiés sont conservés"""
+    __slots__ = ('label', 'merge_key', 'timestamp', 'projectors', 'effects', 'size')
+
+    def __init__(self, label, merge_key, projectors, effects):
+        self.label = label
+        self.merge_key = merge_key
+        self.timestamp = time.monotonic()
+        self.projectors = projectors
+        self.effects = effects
+        self.size = self._estimate_size()
+
+    def _estimate_size(self):
+        """Estime l'empreinte mémoire de l'entrée (en octets)"""
+        size = sys.getsizeof(self.projectors)
+        for before, after in self.projectors.values():
+            size += sys.getsizeof(before) + sys.getsizeof(after)
+        if self.effects is not None:
+            size += sys.getsizeof(self.effects)
+            for before, after in self.effects.values():
+                size += sys.getsizeof(str(before)) + sys.getsizeof(str(after))
+        return size
+
+class UndoHistory:
+    """Historique borné en profondeur et en mémoire des actions de l'opérateur"""
+
+    def __init__(self, projectors, effects_manager=None):
+        self.projectors = projectors
+        self.effects_manager = effects_manager
+        self.max_depth = HISTORY_CONFIG['max_depth']
+        self.max_memory = HISTORY_CONFIG['max_memory']
+        self.merge_window = HISTORY_CONFIG['merge_window'] / 1000.0
+
+        self.undo_stack = []
+        self.redo_stack = []
+        self.memory_used = 0
+        self._applying = False
+        # Verrou d'état : partagé avec le moteur, il sérialise les modifications de l'interface et les ticks
+        self.lock = threading.RLock()
+
+    def _projector_state(self, projector_id):
+        """Retourne l'état immuable d'un projecteur"""
+        projector = self.projectors[projector_id]
+        return (projector.base_color, projector.is_on, projector.intensity)
+
+    @contextmanager
+    def action(self, label, projector_ids=None, effects=False, merge_key=None):
+        """Enregistre les modifications faites dans le bloc comme une seule action
+
+        projector_ids: projecteurs susceptibles d'être modifiés (tous si None),
+        effects: True si l'état des effets peut changer,
+        merge_key: les actions successives de même clé sont fusionnées (ex: glissière).
+        Le verrou d'état (partagé avec le moteur) est détenu pendant tout le bloc.
+        """
+        if self._applying:
+            yield
+            return
+
+        with self.lock:
+            if projector_ids is None:
+                projector_ids = list(self.projectors.keys())
+            before = {i: self._projector_state(i) for i in projector_ids if i in self.projectors}
+            effects_before = None
+            if effects and self.effects_manager:
+                effects_before = self.effects_manager.get_state()
+
+            yield
+
+            changes = {}
+            for i, state in before.items():
+                after = self._projector_state(i)
+                if after != state:
+                    changes[i] = (state, after)
+
+            effects_change = None
+            if effects_before is not None:
+                effects_change = self._diff_effects(effects_before, self.effects_manager.get_state())
+
+            if changes or effects_change:
+                self._push_locked(HistoryEntry(label, merge_key, changes, effects_change))
+
+    def _diff_effects(self, before, after):
+        """Retourne uniquement les clés d'effets modifiées : {clé: (avant, après)}"""
+        delta = {}
+        for key in set(before) | set(after):
+            old_value = before.get(key)
+            new_value = after.get(key)
+            if old_value == new_value:
+                continue
+            if isinstance(old_value, dict) and isinstance(new_value, dict):
+                old_value, new_value = self._diff_mapping(old_value, new_value)
+            delta[key] = (old_value, new_value)
+        return delta or None
+
+    def _diff_mapping(self, before, after):
+        """Réduit deux dictionnaires à leurs entrées différentes"""
+        keys = [key for key in set(before) | set(after) if before.get(key) != after.get(key)]
+        return ({key: before.get(key) for key in keys}, {key: after.get(key) for key in keys})
+
+    def _push(self, entry):
+        """Ajoute une entrée (ou la fusionne avec la précédente) et applique les limites"""
+        with self.lock:
+            self._push_locked(entry)
+
+    def _push_locked(self, entry):
+        """Ajoute une entrée, le verrou de l'historique étant détenu"""
+        self._clear_redo()
+
+        last = self.undo_stack[-1] if self.undo_stack else None
+        if (last is not None and entry.merge_key is not None and last.merge_key == entry.merge_key
+                and entry.timestamp - last.timestamp <= self.merge_window and entry.effects is None
+                and last.effects is None):
+            self._merge(last, entry)
+            return
+
+        self.undo_stack.append(entry)
+        self.memory_used += entry.size
+        self._enforce_limits()
+
+    def _merge(self, last, entry):
+        """Fusionne une entrée dans la précédente en gardant l'état initial de celle-ci"""
+        self.memory_used -= last.size
+        for i, (before, after) in entry.projectors.items():
+            if i in last.projectors:
+                before = last.projectors[i][0]
+            last.projectors[i] = (before, after)
+        last.timestamp = entry.timestamp
+        last.size = last._estimate_size()
+        self.memory_used += last.size
+
+    def _clear_redo(self):
+        """Vide la pile de rétablissement"""
+        for entry in self.redo_stack:
+            self.memory_used -= entry.size
+        self.redo_stack = []
+
+    def _enforce_limits(self):
+        """Supprime les entrées les plus anciennes au-delà de la profondeur ou du budget mémoire"""
+        while self.undo_stack and (len(self.undo_stack) > self.max_depth
+                                   or self.memory_used > self.max_memory):
+            oldest = self.undo_stack.pop(0)
+            self.memory_used -= oldest.size
+
+    def can_undo(self):
+        """Indique si une action peut être annulée"""
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        """Indique si une action peut être rétablie"""
+        return bool(self.redo_stack)
+
+    def undo(self):
+        """Annule la dernière action ; retourne son libellé ou None"""
+        with self.lock:
+            if not self.undo_stack:
+                return None
+            entry = self.undo_stack.pop()
+            self._apply(entry, 0)
+            self.redo_stack.append(entry)
+            return entry.label
+
+    def redo(self):
+        """Rétablit la dernière action annulée ; retourne son libellé ou None"""
+        with self.lock:
+            if not self.redo_stack:
+                return None
+            entry = self.redo_stack.pop()
+            self._apply(entry, 1)
+            self.undo_stack.append(entry)
+            return entry.label
+
+    def _apply(self, entry, side):
+        """Applique l'état avant (side=0) ou après (side=1) d'une entrée"""
+        self._applying = True
+        try:
+            if entry.effects is not None and self.effects_manager:
+                state = self.effects_manager.get_state()
+                for key, values in entry.effects.items():
+                    if isinstance(values[side], dict) and isinstance(state.get(key), dict):
+                        state[key].update(values[side])
+                    else:
+                        state[key] = values[side]
+                self.effects_manager.set_state(state)
+            for i, states in entry.projectors.items():
+                color, is_on, intensity = states[side]
+                self.projectors[i].set_state({'color': color, 'is_on': is_on, 'intensity': intensity})
+        finally:
+            self._applying = False
+
+    def clear(self):
+        """Vide tout l'historique"""
+        with self.lock:
+            self.undo_stack = []
+            self.redo_stack = []
+            self.memory_used = 0
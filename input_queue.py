@@ -0,0 +1,136 @@
+"""
+input_queue.py - File de commandes opérateur fusionnées par projecteur et paramètre
+"""
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from config import INPUT_CONFIG
+
+class InputQueue:
+    """Fusionne les entrées (glissières, surfaces de contrôle) et les applique une fois par tick
+
+    Pour un même couple (projecteur, paramètre), seule la dernière valeur est appliquée.
+    """
+
+    PARAMETERS = ('intensity', 'color', 'is_on')
+
+    def __init__(self):
+        self.pending = {}
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.deferred = 0
+        self.superseded = 0
+        self.last_deferred = 0
+        self.max_depth = 0
+        self.latencies = deque(maxlen=INPUT_CONFIG['latency_samples'])
+
+    def submit(self, projector_id, parameter, value):
+        """Ajoute une commande ; remplace la valeur en attente pour le même projecteur/paramètre"""
+        if parameter not in self.PARAMETERS:
+            print(f"Paramètre d'entrée inconnu: '{parameter}'")
+            return False
+
+        key = (projector_id, parameter)
+        now = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+            previous = self.pending.get(key)
+            if previous is not None:
+                self.coalesced += 1
+                self.pending[key] = (value, previous[1])
+            else:
+                self.pending[key] = (value, now)
+                self.max_depth = max(self.max_depth, len(self.pending))
+        return True
+
+    def depth(self):
+        """Retourne le nombre de commandes en attente"""
+        with self._lock:
+            return len(self.pending)
+
+    def apply(self, projectors, history=None, limit=None):
+        """Applique les commandes en attente ; retourne le nombre appliqué
+
+        Avec une limite, seules les plus anciennes sont appliquées ; les autres restent en
+        attente et sont remplacées si une valeur plus récente arrive entre-temps.
+        """
+        self.last_deferred = 0
+        with self._lock:
+            if not self.pending:
+                return 0
+            pending, self.pending = self.pending, {}
+
+        if limit is not None and len(pending) > limit:
+            ordered = sorted(pending.items(), key=lambda item: item[1][1])
+            pending = dict(ordered[:limit])
+            self._defer(ordered[limit:])
+
+        now = time.perf_counter()
+        for (projector_id, parameter), (value, submitted_at) in pending.items():
+            projector = projectors.get(projector_id)
+            if projector is None:
+                continue
+
+            context = nullcontext()
+            if history is not None:
+                context = history.action(parameter, projector_ids=[projector_id],
+                                         merge_key=(parameter, projector_id))
+            with context:
+                self._apply_one(projector, parameter, value)
+            self.latencies.append(now - submitted_at)
+
+        self.applied += len(pending)
+        return len(pending)
+
+    def _defer(self, entries):
+        """Remet des commandes en attente ; une valeur arrivée entre-temps les remplace"""
+        with self._lock:
+            for key, (value, submitted_at) in entries:
+                newer = self.pending.get(key)
+                if newer is not None:
+                    self.superseded += 1
+                    self.pending[key] = (newer[0], submitted_at)
+                else:
+                    self.pending[key] = (value, submitted_at)
+        self.last_deferred = len(entries)
+        self.deferred += len(entries)
+
+    def _apply_one(self, projector, parameter, value):
+        """Applique une commande à un projecteur"""
+        if parameter == 'intensity':
+            projector.set_intensity(int(value))
+        elif parameter == 'color':
+            projector.set_color(value)
+        elif parameter == 'is_on':
+            if value:
+                projector.turn_on()
+            else:
+                projector.turn_off()
+
+    def get_metrics(self):
+        """Retourne les métriques : profondeur, fusions et latence entrée → sortie (ms)"""
+        with self._lock:
+            depth = len(self.pending)
+        latencies = sorted(self.latencies)
+        if latencies:
+            average = sum(latencies) / len(latencies) * 1000
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            maximum = latencies[-1] * 1000
+        else:
+            average = p99 = maximum = 0.0
+        return {
+            'depth': depth,
+            'max_depth': self.max_depth,
+            'submitted': self.submitted,
+            'coalesced': self.coalesced,
+            'applied': self.applied,
+            'deferred': self.deferred,
+            'superseded': self.superseded,
+            'latency_avg_ms': average,
+            'latency_p99_ms': p99,
+            'latency_max_ms': maximum
+        }
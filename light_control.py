@@ -1,48 +1,202 @@
+import threading
+import time
 import tkinter as tk
 from projector import Projector
 from effects_manager import EffectsManager
 from scene_manager import SceneManager
+from autosave import AutosaveManager
+from history import UndoHistory
+from events import EventBus
+from input_queue import InputQueue
+from engine import RenderEngine
+from engine import FrameBuffer
+from tick_metrics import TickMetrics
+from load_shedder import LoadShedder
+from startup import StartupReport
+from profiler_capture import ProfilerCapture
+from fixture_groups import BulkOperations, FixtureGroups
 from gui_components import ProjectorDisplay, ControlPanel, EffectsPanel, GlobalControlPanel
 from config import *
 
 class LightControlApp:
-    def __init__(self, root):
+    def __init__(self, root, started=None, profile_seconds=None):
+        self.startup = StartupReport(started)
+        self.startup.mark('imports')
         self.root = root
         self.root.title(UI_CONFIG['window_title'])
         self.root.geometry(UI_CONFIG['window_geometry'])
         self.root.configure(bg=UI_CONFIG['background_color'])
 
         self.num_projectors = PROJECTOR_CONFIG['default_count']
+        self.bus = EventBus()
+        self.remote_server = None
         
+        # === ÉTAPE 1 : SORTIE (moteur, écran de projection) ===
         self.init_projectors()
         self.init_managers()
         self.init_gui()
         
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.init_visualizer()
+        self.init_clock_sync()
+        self.init_audio()
+        self.init_profiler(profile_seconds)
+        self.engine.start()
+        self.startup.mark('engine')
+        
+        # === ÉTAPE 2 : CONSOLE (panneaux, contrôle à distance) après la première trame ===
+        self.panels_built = False
+        if not STARTUP_CONFIG['deferred_panels']:
+            self.init_panels()
         self.run_effects_loop()
     
     def init_projectors(self):
         """Initialise les projecteurs avec la configuration"""
         self.projectors = {}
         for i in range(self.num_projectors):
-            self.projectors[i] = Projector(i)
+            self.projectors[i] = Projector(i, self.bus)
             self.projectors[i].set_color(PROJECTOR_CONFIG['default_color'])
             self.projectors[i].set_intensity(PROJECTOR_CONFIG['default_intensity'])
     
     def init_managers(self):
         """Initialise les gestionnaires"""
-        self.effects_manager = EffectsManager(self.projectors)
-        self.scene_manager = SceneManager(self.projectors, self.effects_manager)
+        self.effects_manager = EffectsManager(self.projectors, self.bus)
+        self.history = UndoHistory(self.projectors, self.effects_manager)
+        self.scene_manager = SceneManager(self.projectors, self.effects_manager, self.bus,
+                                          STARTUP_CONFIG['background_scene_load'],
+                                          state_lock=self.history.lock)
+        self.groups = FixtureGroups(self.projectors)
+        self.bulk = BulkOperations(self.projectors, self.effects_manager, self.history)
+        self.input_queue = InputQueue()
+        self.metrics = TickMetrics() if METRICS_CONFIG['enabled'] else None
+        self.shedder = LoadShedder()
+        self.engine = RenderEngine(self.projectors, self.effects_manager,
+                                   self.input_queue, self.history, metrics=self.metrics,
+                                   shedder=self.shedder)
+        self.autosave = None
+        if AUTOSAVE_CONFIG['enabled']:
+            self.autosave = AutosaveManager(self.projectors, self.effects_manager)
+            if AUTOSAVE_CONFIG['restore_on_startup']:
+                self.autosave.restore(self.scene_manager)
+            self.autosave.start()
+            self.engine.add_tick_listener(self.autosave.tick)
+    
+    def init_visualizer(self):
+        """Lance l'écran de projection dans un processus séparé si configuré"""
+        self.frame_writer = None
+        self.visualizer_process = None
+        if not VISUALIZER_CONFIG['separate_process']:
+            return
+        
+        from shared_frames import SharedFrameWriter
+        from visualizer import start_visualizer_process
+        self.frame_writer = SharedFrameWriter(self.num_projectors, VISUALIZER_CONFIG['ring_slots'])
+        self.engine.add_output(self.frame_writer.write, secondary=True)
+        self.visualizer_process = start_visualizer_process(self.frame_writer.name)
+    
+    def init_remote_server(self):
+        """Démarre le serveur de contrôle à distance si configuré"""
+        if REMOTE_CONFIG['enabled']:
+            from remote_server import RemoteControlServer
+            self.remote_server = RemoteControlServer(self.projectors, self.effects_manager,
+                                                     self.scene_manager, self.engine, self.bus,
+                                                     groups=self.groups, profiler=self.profiler)
+            self.remote_server.start()
+    
+    def init_clock_sync(self):
+        """Partage l'horloge de spectacle avec les autres consoles (meneur ou suiveur)"""
+        self.clock_sync = None
+        role = SYNC_CONFIG['role']
+        if role not in ('leader', 'follower'):
+            return
+        
+        from clock_sync import ClockFollower, ClockLeader, ShowClock
+        clock = ShowClock()
+        if role == 'leader':
+            clock.reset_phase()
+            self.clock_sync = ClockLeader(clock, beat_clock=self.effects_manager.beat_clock)
+        else:
+            self.clock_sync = ClockFollower(clock, beat_clock=self.effects_manager.beat_clock)
+        # Le tempo passe sur l'heure de spectacle avant la première réponse du meneur
+        self.effects_manager.set_clock(clock)
+        self.clock_sync.start()
+        self.engine.clock = clock
+    
+    def init_profiler(self, seconds=None):
+        """Enveloppe la boucle d'affichage et le tick du moteur pour les captures à la demande"""
+        self.profiler = ProfilerCapture()
+        self.engine.tick = self.profiler.wrap('engine.tick', self.engine.tick)
+        self.run_effects_loop = self.profiler.wrap('run_effects_loop', self.run_effects_loop)
+        if seconds:
+            self.profiler.start(seconds)
+    
+    def toggle_profiler(self, event=None):
+        """Démarre une capture du profileur de durée configurée, ou termine la capture en cours (F6)"""
+        if self.profiler.active:
+            threading.Thread(target=self.profiler.stop, name="profiler-dump", daemon=True).start()
+        else:
+            self.profiler.start()
+    
+    def init_audio(self):
+        """Démarre l'analyse audio configurée (effets liés aux attaques et aux bandes)"""
+        if not AUDIO_CONFIG['enabled']:
+            return
+        from audio_analysis import open_audio
+        try:
+            analyzer = open_audio()
+        except Exception as e:
+            print(f"Analyse audio indisponible: {e}")
+            return
+        analyzer.start()
+        self.effects_manager.set_audio(analyzer)
     
     def init_gui(self):
-        """Initialise l'interface graphique"""
-        main_frame = tk.Frame(self.root, bg=UI_CONFIG['background_color'])
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        """Initialise l'interface graphique (la console est construite par init_panels)"""
+        self.main_frame = tk.Frame(self.root, bg=UI_CONFIG['background_color'])
+        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # === ZONE D'AFFICHAGE DES PROJECTEURS ===
-        self.create_display_area(main_frame)
+        self.projector_display = None
+        if not VISUALIZER_CONFIG['separate_process']:
+            self.create_display_area(self.main_frame)
+        
+        self.recorder = None
+        self.last_recording = None
+        self.replayer = None
+        self.replay_frames = FrameBuffer()
+    
+        self.metrics_overlay = None
+        self.metrics_overlay_job = None
+        self.last_display_tick = None
+        self.display_passes = 0
+    
+    def init_panels(self):
+        """Construit la console de contrôle, les raccourcis et le contrôle à distance"""
+        if self.panels_built:
+            return
+        self.panels_built = True
         
         # === CONSOLE DE CONTRÔLE ===
-        self.create_control_console(main_frame)
+        self.create_control_console(self.main_frame)
+        
+        self.root.bind('<Control-z>', self.undo)
+        self.root.bind('<Control-y>', self.redo)
+        self.root.bind('<Control-Shift-Z>', self.redo)
+        self.root.bind('<F9>', self.toggle_recording)
+        self.root.bind('<F10>', self.toggle_replay)
+        self.root.bind('<F8>', self.toggle_metrics_overlay)
+        self.root.bind('<Shift-F8>', self.export_metrics)
+        self.root.bind('<F7>', self.effects_panel.tap_tempo)
+        self.root.bind('<F6>', self.toggle_profiler)
+        
+        if self.metrics is not None:
+            self.control_panel.update_info_display = self.metrics.wrap(
+                'display.info_display', self.control_panel.update_info_display)
+            self.effects_panel.update_status_indicators = self.metrics.wrap(
+                'display.status_indicators', self.effects_panel.update_status_indicators)
+    
+        self.init_remote_server()
+        self.startup.mark('panels')
     
     def create_display_area(self, parent):
         """Crée la zone d'affichage des projecteurs"""
@@ -78,7 +232,12 @@ class LightControlApp:
             left_panel, 
             self.projectors, 
             self.on_projector_select,
-            self.on_intensity_change
+            self.on_intensity_change,
+            self.history,
+            self.bus,
+            self.input_queue,
+            self.groups,
+            self.bulk
         )
         
         center_panel = tk.Frame(console_frame, bg=UI_CONFIG['control_color'], 
@@ -89,27 +248,199 @@ class LightControlApp:
         self.effects_panel = EffectsPanel(
             center_panel, 
             self.effects_manager,
-            self.get_selected_projector
+            self.get_selected_projector,
+            self.history,
+            self.bus,
+            self.get_selection_mask
         )
         
         right_panel = tk.Frame(console_frame, bg=UI_CONFIG['control_color'], 
                               relief='raised', bd=2)
         right_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        self.global_panel = GlobalControlPanel(right_panel, self.projectors, self.scene_manager)
+        self.global_panel = GlobalControlPanel(right_panel, self.projectors, self.scene_manager,
+                                               self.history, self.bus, self.bulk)
     
     def run_effects_loop(self):
-        """Boucle principale pour les effets"""
-        self.effects_manager.process_all_effects()
-        self.projector_display.update_all_projectors()
-        self.effects_panel.update_status_indicators()
-        self.control_panel.update_info_display()
-        self.root.after(EFFECTS_CONFIG['loop_interval'], self.run_effects_loop)
+        """Boucle d'affichage : les trames sont calculées par le moteur, l'interface affiche la dernière"""
+        started = time.perf_counter()
+        self.display_passes += 1
+        coalesced = self.bus.coalesced
+        self.bus.drain(coalesce=self.shedder.coalesce_events())
+        self.shedder.count('events', self.bus.coalesced - coalesced)
+        events_done = time.perf_counter()
+        if self.replayer is not None and self.replayer.is_playing():
+            frame = self.replay_frames.latest()
+        else:
+            frame = self.engine.frames.latest()
+        if (frame is not None and self.projector_display is not None
+                and self.shedder.allows('canvas', self.display_passes)):
+            self.projector_display.show_frame(frame)
+        canvas_done = time.perf_counter()
+        self.scene_manager.poll_file_changes()
+        
+        if self.metrics is not None:
+            self.record_display_metrics(started, events_done, canvas_done)
+        if not self.startup.printed:
+            self.check_startup(frame)
+        budget = DISPLAY_CONFIG['refresh_interval'] / 1000.0
+        elapsed = time.perf_counter() - started
+        self.shedder.update('display', elapsed, budget)
+        delay = max(1, int((budget - elapsed) * 1000))
+        self.root.after(delay, self.run_effects_loop)
+    
+    def check_startup(self, frame):
+        """Suit les étapes du démarrage ; construit la console après la première trame"""
+        if frame is not None and not self.startup.has('first_frame'):
+            self.startup.mark('first_frame')
+            self.root.after_idle(self.init_panels)
+        if self.scene_manager.loaded:
+            self.startup.mark('scenes')
+        if self.startup.is_complete():
+            self.startup.printed = True
+            if STARTUP_CONFIG['report']:
+                print(self.startup.format_report())
+    
+    def record_display_metrics(self, started, events_done, canvas_done):
+        """Enregistre les phases de la boucle d'affichage et détecte les passages en retard"""
+        finished = time.perf_counter()
+        self.metrics.record('display.events', events_done - started)
+        self.metrics.record('display.canvas', canvas_done - events_done)
+        self.metrics.record('display.scenes', finished - canvas_done)
+        self.metrics.record('display.total', finished - started)
+        
+        expected = DISPLAY_CONFIG['refresh_interval'] / 1000.0 * METRICS_CONFIG['late_factor']
+        if self.last_display_tick is not None and started - self.last_display_tick > expected:
+            self.metrics.count_late('display')
+        self.last_display_tick = started
+    
+    def toggle_metrics_overlay(self, event=None):
+        """Affiche ou masque l'incrustation du chronométrage (F8)"""
+        if self.metrics is None:
+            return
+        if self.metrics_overlay is not None:
+            self.root.after_cancel(self.metrics_overlay_job)
+            self.metrics_overlay.destroy()
+            self.metrics_overlay = None
+            return
+        self.metrics_overlay = tk.Label(self.root, justify=tk.LEFT, anchor='nw',
+                                        bg='black', fg='#00ff00', font=('Courier', 9))
+        self.metrics_overlay.place(relx=1.0, x=-10, y=10, anchor='ne')
+        self.update_metrics_overlay()
+    
+    def update_metrics_overlay(self):
+        """Rafraîchit l'incrustation tant qu'elle est affichée"""
+        if self.metrics_overlay is None:
+            return
+        text = self.metrics.format_overlay() + "\n" + self.shedder.format_status()
+        if self.effects_manager.audio is not None:
+            text += "\n" + self.effects_manager.audio.format_status()
+        self.metrics_overlay.config(text=text)
+        self.metrics_overlay_job = self.root.after(METRICS_CONFIG['overlay_interval'],
+                                                   self.update_metrics_overlay)
+    
+    def export_metrics(self, event=None):
+        """Exporte le chronométrage dans un fichier JSON (Maj+F8)"""
+        if self.metrics is None:
+            return None
+        filename = self.metrics.export()
+        if filename:
+            print(f"Métriques exportées: {filename}")
+        return filename
+    
+    def on_close(self):
+        """Arrête le moteur, écrit la dernière sauvegarde automatique puis ferme l'application"""
+        if self.remote_server is not None:
+            self.remote_server.stop()
+        self.engine.stop()
+        self.profiler.stop()
+        self.effects_manager.set_pixel_map(None)
+        if self.effects_manager.audio is not None:
+            self.effects_manager.audio.stop()
+        self.stop_recording()
+        self.stop_replay()
+        if self.clock_sync is not None:
+            self.clock_sync.stop()
+        if self.visualizer_process is not None:
+            self.visualizer_process.terminate()
+            self.visualizer_process.join(timeout=2.0)
+        if self.frame_writer is not None:
+            self.frame_writer.close()
+        if self.autosave:
+            self.autosave.tick(force=True)
+            self.autosave.stop()
+        self.root.destroy()
+    
+    def start_recording(self, filename=None):
+        """Enregistre chaque trame de sortie dans un fichier ; retourne son nom"""
+        if self.recorder is not None:
+            return self.recorder.filename
+        from frame_recorder import FrameRecorder
+        filename = filename or time.strftime(RECORDER_CONFIG['file_pattern'])
+        self.recorder = FrameRecorder(filename, self.num_projectors)
+        self.engine.add_output(self.recorder.write)
+        return filename
+    
+    def stop_recording(self):
+        """Termine l'enregistrement en cours"""
+        if self.recorder is None:
+            return
+        self.engine.remove_output(self.recorder.write)
+        self.recorder.close()
+        self.last_recording = self.recorder.filename
+        self.recorder = None
+    
+    def toggle_recording(self, event=None):
+        """Démarre ou arrête l'enregistrement (F9)"""
+        if self.recorder is None:
+            print(f"Enregistrement des trames: {self.start_recording()}")
+        else:
+            self.stop_recording()
+            print(f"Enregistrement terminé: {self.last_recording}")
+    
+    def start_replay(self, filename, start=0.0, speed=1.0):
+        """Relit un enregistrement sur l'écran de projection, sans recalculer les effets"""
+        from frame_recorder import FrameReplayer
+        self.stop_replay()
+        self.replayer = FrameReplayer(filename)
+        self.replayer.play(self.replay_frames.publish, start, speed)
+    
+    def stop_replay(self):
+        """Arrête la relecture en cours"""
+        if self.replayer is not None:
+            self.replayer.close()
+            self.replayer = None
+    
+    def toggle_replay(self, event=None):
+        """Relit le dernier enregistrement ou arrête la relecture (F10)"""
+        if self.replayer is not None and self.replayer.is_playing():
+            self.stop_replay()
+        elif self.last_recording:
+            self.start_replay(self.last_recording)
+    
+    def undo(self, event=None):
+        """Annule la dernière action de l'opérateur"""
+        if self.history.undo() is not None:
+            self.refresh_panels()
+    
+    def redo(self, event=None):
+        """Rétablit la dernière action annulée"""
+        if self.history.redo() is not None:
+            self.refresh_panels()
+    
+    def refresh_panels(self):
+        """Resynchronise les panneaux après un changement d'état global"""
+        if self.panels_built:
+            self.control_panel.refresh()
     
     def get_selected_projector(self):
         """Retourne l'ID du projecteur actuellement sélectionné"""
         return self.control_panel.selected_projector
     
+    def get_selection_mask(self):
+        """Retourne le masque des projecteurs sélectionnés"""
+        return self.control_panel.selection_mask
+    
     def on_projector_select(self, projector_id):
         """Callback lors de la sélection d'un projecteur"""
         pass
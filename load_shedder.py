@@ -0,0 +1,87 @@
+"""
+load_shedder.py - Délestage progressif quand les ticks dépassent leur budget
+
+La trame est toujours calculée et publiée ; sous charge, on sacrifie dans l'ordre :
+    niveau 1 : sorties secondaires (écran de projection séparé, diffusion à distance) à cadence réduite
+    niveau 2 : + redessin du canevas une passe sur N, événements fusionnés (moins de mises à jour d'étiquettes)
+    niveau 3 : + entrées limitées par tick (les valeurs intermédiaires en attente sont remplacées)
+"""
+from config import SHEDDING_CONFIG
+
+class LoadShedder:
+    """Suit la charge de chaque boucle (durée / budget) et en déduit un niveau de délestage"""
+
+    MAX_LEVEL = 3
+
+    def __init__(self):
+        self.enabled = SHEDDING_CONFIG['enabled']
+        self.level = 0
+        self.loads = {}
+        self.shed = {'secondary_outputs': 0, 'canvas': 0, 'events': 0, 'inputs': 0}
+
+        self._over = 0
+        self._under = 0
+
+    def update(self, loop, elapsed, budget):
+        """Prend en compte la durée d'un passage de boucle ; retourne le niveau courant"""
+        if not self.enabled or budget <= 0:
+            return self.level
+        smoothing = SHEDDING_CONFIG['smoothing']
+        previous = self.loads.get(loop, 0.0)
+        self.loads[loop] = previous + smoothing * (elapsed / budget - previous)
+
+        load = max(self.loads.values())
+        if load > SHEDDING_CONFIG['high_water']:
+            self._over += 1
+            self._under = 0
+            if self._over >= SHEDDING_CONFIG['raise_after'] and self.level < self.MAX_LEVEL:
+                self.level += 1
+                self._over = 0
+        elif load < SHEDDING_CONFIG['low_water']:
+            self._under += 1
+            self._over = 0
+            if self._under >= SHEDDING_CONFIG['recover_after'] and self.level > 0:
+                self.level -= 1
+                self._under = 0
+        else:
+            self._over = self._under = 0
+        return self.level
+
+    def allows(self, kind, counter):
+        """Indique si un travail délestable doit être fait à ce passage ; compte sinon"""
+        if kind == 'secondary_outputs':
+            divisor = SHEDDING_CONFIG['secondary_divisor'] if self.level >= 1 else 1
+        elif kind == 'canvas':
+            divisor = SHEDDING_CONFIG['canvas_divisor'] if self.level >= 2 else 1
+        else:
+            divisor = 1
+        if counter % divisor == 0:
+            return True
+        self.shed[kind] += 1
+        return False
+
+    def coalesce_events(self):
+        """Indique si les événements en attente doivent être fusionnés"""
+        return self.level >= 2
+
+    def input_limit(self):
+        """Nombre maximal d'entrées appliquées par tick (None : sans limite)"""
+        return SHEDDING_CONFIG['input_limit'] if self.level >= 3 else None
+
+    def count(self, kind, amount):
+        """Ajoute du travail délesté au compteur"""
+        if amount:
+            self.shed[kind] += amount
+
+    def get_status(self):
+        """Retourne le niveau, la charge lissée de chaque boucle et les compteurs de délestage"""
+        return {
+            'level': self.level,
+            'loads': dict(self.loads),
+            'shed': dict(self.shed)
+        }
+
+    def format_status(self):
+        """Ligne d'état pour l'incrustation"""
+        shed = ", ".join(f"{kind}={count}" for kind, count in self.shed.items())
+        return f"délestage: niveau {self.level} ({shed})"
@@ -1,10 +1,18 @@
 """
 main.py - Application principale LightControl Pro
 """
+import time
+STARTED = time.perf_counter()
+
+import argparse
 import tkinter as tk
 from light_control import LightControlApp
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LightControl Pro")
+    parser.add_argument('--profile', type=float, metavar='SECONDES',
+                        help="capture cProfile de la boucle d'affichage et du moteur au démarrage")
+    args = parser.parse_args()
     root = tk.Tk()
-    app = LightControlApp(root)
+    app = LightControlApp(root, STARTED, profile_seconds=args.profile)
     root.mainloop()
\ No newline at end of file
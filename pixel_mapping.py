@@ -0,0 +1,227 @@
+"""
+pixel_mapping.py - Lecture d'images et de séquences de trames sur la grille des projecteurs
+
+Sources (sans dépendance externe, fichiers mappés en mémoire) :
+    - image PPM binaire (P6, 8 bits) ou dossier de fichiers PPM (une trame par fichier, ordre alphabétique)
+    - fichier brut RGB24 : trames de largeur × hauteur × 3 octets mises bout à bout
+
+Chaque projecteur a une position (u, v) dans [0, 1] : celle de son rectangle dans ProjectorDisplay,
+ou celle d'un fichier de disposition JSON {"id": [u, v]}. L'index d'échantillonnage convertit ces
+positions une fois pour toutes en décalages d'octets dans une trame ; un thread décode les trames
+à l'avance en listes de couleurs, et le moteur ne fait qu'une lecture par tick.
+"""
+import json
+import mmap
+import os
+import threading
+from config import DISPLAY_CONFIG, PIXELMAP_CONFIG
+
+def read_ppm_header(data):
+    """Lit l'en-tête d'une image PPM binaire ; retourne (largeur, hauteur, décalage des pixels)"""
+    if bytes(data[0:2]) != b'P6':
+        raise ValueError("format PPM binaire (P6) attendu")
+    fields = []
+    position = 2
+    while len(fields) < 3:
+        while data[position:position + 1].isspace():
+            position += 1
+        if data[position:position + 1] == b'#':
+            while data[position:position + 1] not in (b'\n', b''):
+                position += 1
+            continue
+        start = position
+        while data[position:position + 1].isdigit():
+            position += 1
+        if start == position:
+            raise ValueError("en-tête PPM invalide")
+        fields.append(int(data[start:position]))
+    width, height, maxval = fields
+    if maxval != 255:
+        raise ValueError(f"PPM 8 bits attendu (valeur maximale {maxval})")
+    return width, height, position + 1
+
+def _map_file(path):
+    """Mappe un fichier en lecture seule"""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class RawFrameSource:
+    """Trames RGB24 brutes consécutives dans un fichier mappé en mémoire"""
+
+    def __init__(self, path, width, height):
+        self.width = width
+        self.height = height
+        self.frame_size = width * height * 3
+        self._map = _map_file(path)
+        self.frame_count = len(self._map) // self.frame_size
+        if self.frame_count == 0:
+            raise ValueError(f"fichier trop court pour une trame {width}x{height}")
+
+    def frame(self, index):
+        """Pixels RGB d'une trame (vue sur le fichier, sans copie)"""
+        offset = (index % self.frame_count) * self.frame_size
+        return memoryview(self._map)[offset:offset + self.frame_size]
+
+    def close(self):
+        """Libère le fichier mappé"""
+        self._map.close()
+
+class PPMSequenceSource:
+    """Images PPM de même taille, une par trame, mappées à la demande"""
+
+    def __init__(self, paths):
+        if not paths:
+            raise ValueError("aucune image PPM")
+        self.paths = paths
+        self.frame_count = len(paths)
+        first = _map_file(paths[0])
+        self.width, self.height, _ = read_ppm_header(first)
+        first.close()
+
+    def frame(self, index):
+        """Pixels RGB d'une trame (copiés, le fichier est refermé aussitôt)"""
+        path = self.paths[index % self.frame_count]
+        data = _map_file(path)
+        try:
+            width, height, offset = read_ppm_header(data)
+            if (width, height) != (self.width, self.height):
+                raise ValueError(f"taille d'image différente: {path}")
+            end = offset + width * height * 3
+            if len(data) < end:
+                raise ValueError(f"image PPM tronquée: {path}")
+            return data[offset:end]
+        finally:
+            data.close()
+
+    def close(self):
+        """Rien à libérer : chaque image est refermée après lecture"""
+
+def open_source(path, width=None, height=None):
+    """Ouvre une image PPM, un dossier d'images PPM ou un fichier brut (taille requise)"""
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(path, name) for name in os.listdir(path)
+                       if name.lower().endswith('.ppm'))
+        return PPMSequenceSource(paths)
+    if path.lower().endswith('.ppm'):
+        return PPMSequenceSource([path])
+    if not width or not height:
+        raise ValueError("largeur et hauteur requises pour un fichier brut")
+    return RawFrameSource(path, int(width), int(height))
+
+def display_layout(projector_ids):
+    """Positions (u, v) des centres des rectangles dessinés par ProjectorDisplay"""
+    config = DISPLAY_CONFIG
+    pitch = config['projector_width'] + config['spacing']
+    count = max(1, len(projector_ids))
+    extent = config['start_x'] + (count - 1) * pitch + config['projector_width']
+    v = (20 + config['projector_height'] / 2) / config['canvas_height']
+    return {i: ((config['start_x'] + i * pitch + config['projector_width'] / 2) / extent, v)
+            for i in projector_ids}
+
+def load_layout(filename):
+    """Charge une disposition {"id": [u, v]} ; retourne None si le fichier est absent"""
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {int(projector_id): (float(u), float(v)) for projector_id, (u, v) in data.items()}
+
+class SamplingIndex:
+    """Décalage d'octets, dans une trame, du pixel échantillonné par chaque projecteur"""
+
+    def __init__(self, layout, num_projectors, width, height):
+        self.offsets = [None] * num_projectors
+        for projector_id, (u, v) in layout.items():
+            if 0 <= projector_id < num_projectors:
+                x = min(width - 1, max(0, int(u * width)))
+                y = min(height - 1, max(0, int(v * height)))
+                self.offsets[projector_id] = (y * width + x) * 3
+
+    def gather(self, pixels):
+        """Couleurs '#rrggbb' des projecteurs (None hors disposition)"""
+        return ['#' + pixels[offset:offset + 3].hex() if offset is not None else None
+                for offset in self.offsets]
+
+class PixelMapPlayer:
+    """Décode les trames à l'avance dans un thread ; la lecture par tick ne bloque jamais"""
+
+    def __init__(self, source, index, preload=None):
+        self.source = source
+        self.index = index
+        self.preload = PIXELMAP_CONFIG['preload_frames'] if preload is None else preload
+        self.frame_count = source.frame_count
+        self.decoded = {}
+        self.wanted = 0
+        self.last_colors = None
+        self.misses = 0
+
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="pixel-map-decoder", daemon=True)
+        self._thread.start()
+
+    def colors(self, frame_index):
+        """Couleurs d'une trame si elle est décodée, sinon celles de la dernière trame disponible"""
+        frame_index %= self.frame_count
+        colors = self.decoded.get(frame_index)
+        with self._condition:
+            if self.wanted != frame_index:
+                self.wanted = frame_index
+                self._condition.notify()
+        if colors is None:
+            self.misses += 1
+            return self.last_colors
+        self.last_colors = colors
+        return colors
+
+    def wait_ready(self, timeout=None):
+        """Attend que la trame demandée soit décodée (utile au chargement et hors ligne)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.wanted in self.decoded or not self._running,
+                                            timeout)
+
+    def _window(self):
+        """Indices des trames à garder décodées à partir de la trame demandée"""
+        count = min(self.frame_count, self.preload)
+        return [(self.wanted + offset) % self.frame_count for offset in range(count)]
+
+    def _run(self):
+        """Décode les trames de la fenêtre de préchargement et oublie les autres"""
+        while True:
+            with self._condition:
+                window = self._window()
+                missing = [i for i in window if i not in self.decoded]
+                while self._running and not missing:
+                    self._condition.wait()
+                    window = self._window()
+                    missing = [i for i in window if i not in self.decoded]
+                if not self._running:
+                    return
+            frame_index = missing[0]
+            try:
+                colors = self.index.gather(self.source.frame(frame_index))
+            except (OSError, ValueError) as e:
+                print(f"Erreur de décodage de la trame {frame_index}: {e}")
+                colors = [None] * len(self.index.offsets)
+            with self._condition:
+                keep = set(self._window())
+                self.decoded = {i: c for i, c in self.decoded.items() if i in keep}
+                self.decoded[frame_index] = colors
+                self._condition.notify_all()
+
+    def close(self):
+        """Arrête le thread de décodage et libère la source"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join(timeout=1.0)
+        self.source.close()
+
+def load_pixel_map(path, num_projectors, width=None, height=None, layout_file=None):
+    """Ouvre une source et prépare sa lecture sur la disposition configurée des projecteurs"""
+    source = open_source(path, width, height)
+    layout = load_layout(layout_file or PIXELMAP_CONFIG['layout_file'])
+    if layout is None:
+        layout = display_layout(list(range(num_projectors)))
+    index = SamplingIndex(layout, num_projectors, source.width, source.height)
+    return PixelMapPlayer(source, index)
@@ -0,0 +1,188 @@
+"""
+prerender.py - Pré-calcul hors ligne d'une conduite en trames, réparti sur un pool de processus
+
+La conduite (JSON) décrit le nombre de projecteurs, l'état initial et des tops horodatés :
+    {"projectors": 4, "duration": 60, "initial": {<scène>},
+     "cues": [{"time": 2.0, "cmd": "toggle_strobe"},
+              {"time": 8.5, "cmd": "set_color", "projector": 1, "color": "#00ff00"},
+              {"time": 12, "cmd": "load_scene", "scene": {<scène>}}]}
+
+Les effets sont évalués en mode horloge (pas dérivé de l'indice de tick), comme une console
+synchronisée : chaque tranche de temps peut donc être calculée indépendamment et le résultat
+est identique, octet pour octet, à la sortie en direct alignée sur la même origine de phase.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import EFFECTS_CONFIG, PRERENDER_CONFIG
+from effects_manager import EffectsManager
+from frame_recorder import FrameRecorder
+from projector import Projector
+from shared_frames import pack_colors
+
+PROJECTOR_COMMANDS = ('set_intensity', 'set_color', 'turn_on', 'turn_off', 'toggle')
+EFFECT_COMMANDS = ('toggle_blink_all', 'toggle_strobe', 'toggle_chaser', 'toggle_fade',
+                   'toggle_rainbow', 'toggle_hue_rotate', 'toggle_saturation_pulse',
+                   'toggle_color_temperature', 'stop_all_effects')
+
+class TickClock:
+    """Horloge virtuelle : l'indice de tick est fixé par le moteur de pré-calcul"""
+
+    def __init__(self, interval=None):
+        self.tick = 0
+        self.interval = (interval or EFFECTS_CONFIG['loop_interval']) / 1000.0
+
+    def effect_tick(self):
+        """Retourne l'indice de tick courant"""
+        return self.tick
+
+    def tick_time(self, tick):
+        """Retourne l'heure (secondes depuis le début de la conduite) du début d'un tick"""
+        return tick * self.interval
+
+    def now(self):
+        """Retourne l'heure du tick courant (base de temps du tempo)"""
+        return self.tick_time(self.tick)
+
+def cue_tick(cue, interval):
+    """Retourne l'indice de tick auquel un top est appliqué"""
+    return int(round(cue['time'] * 1000 / interval))
+
+def apply_scene(projectors, effects_manager, scene_data):
+    """Applique des données de scène (même logique que SceneManager.apply_scene_data)"""
+    if 'projectors' in scene_data:
+        projectors_data = scene_data['projectors']
+        effects_data = scene_data.get('effects')
+    else:
+        projectors_data = scene_data
+        effects_data = None
+
+    for proj_id_str, state in projectors_data.items():
+        proj_id = int(proj_id_str)
+        if proj_id in projectors:
+            projectors[proj_id].set_state(state)
+
+    if effects_data:
+        effects_manager.set_state(effects_data)
+    else:
+        effects_manager.stop_all_effects()
+
+def apply_cue(projectors, effects_manager, cue):
+    """Applique un top de la conduite"""
+    command = cue.get('cmd')
+    if command in PROJECTOR_COMMANDS:
+        projector = projectors[int(cue['projector'])]
+        if command == 'set_intensity':
+            projector.set_intensity(int(cue['value']))
+        elif command == 'set_color':
+            projector.set_color(cue['color'])
+        else:
+            getattr(projector, command)()
+    elif command in EFFECT_COMMANDS:
+        getattr(effects_manager, command)()
+    elif command == 'toggle_blink':
+        effects_manager.toggle_blink(int(cue['projector']))
+    elif command == 'set_fade_colors':
+        effects_manager.set_fade_colors(cue['color1'], cue['color2'])
+    elif command == 'set_color_temperature':
+        effects_manager.set_color_temperature(cue['kelvin'])
+    elif command == 'define_chase_pattern':
+        effects_manager.define_chase_pattern(cue['name'], {key: cue[key] for key in ('mode', 'steps', 'seed')
+                                                           if key in cue})
+    elif command == 'set_chase_pattern':
+        effects_manager.set_chase_pattern(cue.get('name'))
+    elif command == 'set_bpm':
+        effects_manager.set_bpm(cue['bpm'])
+    elif command == 'set_beat_sync':
+        effects_manager.set_beat_sync(cue['target'], cue.get('division'))
+    elif command == 'load_scene':
+        apply_scene(projectors, effects_manager, cue['scene'])
+    else:
+        print(f"Top ignoré (commande inconnue): {command}")
+
+def render_chunk(timeline, start_tick, end_tick):
+    """Calcule les trames [start_tick, end_tick) ; retourne les octets RGB empaquetés"""
+    interval = timeline.get('interval', EFFECTS_CONFIG['loop_interval'])
+    projectors = {i: Projector(i) for i in range(timeline['projectors'])}
+    effects_manager = EffectsManager(projectors)
+    clock = TickClock(interval)
+    effects_manager.set_clock(clock)
+    # Premier temps au début de la conduite, quelle que soit la tranche calculée
+    effects_manager.beat_clock.downbeat()
+
+    if timeline.get('initial'):
+        apply_scene(projectors, effects_manager, timeline['initial'])
+
+    cues = sorted(timeline.get('cues', []), key=lambda cue: cue['time'])
+    position = 0
+    while position < len(cues) and cue_tick(cues[position], interval) < start_tick:
+        clock.tick = cue_tick(cues[position], interval)
+        apply_cue(projectors, effects_manager, cues[position])
+        position += 1
+
+    projector_ids = tuple(projectors.keys())
+    chunk = bytearray()
+    for tick in range(start_tick, end_tick):
+        clock.tick = tick
+        while position < len(cues) and cue_tick(cues[position], interval) <= tick:
+            apply_cue(projectors, effects_manager, cues[position])
+            position += 1
+        effects_manager.process_all_effects()
+        chunk += pack_colors([projectors[i].get_dimmed_color() for i in projector_ids])
+    return bytes(chunk)
+
+def render_timeline(timeline, output_file, workers=None, chunk_frames=None):
+    """Pré-calcule une conduite dans un fichier de trames relisible ; retourne des statistiques"""
+    interval = timeline.get('interval', EFFECTS_CONFIG['loop_interval'])
+    total_frames = int(round(timeline['duration'] * 1000 / interval))
+    workers = workers or PRERENDER_CONFIG['workers'] or os.cpu_count() or 1
+    chunk_count = workers * PRERENDER_CONFIG['chunks_per_worker']
+    chunk_frames = chunk_frames or max(1, -(-total_frames // chunk_count))
+    bounds = [(start, min(start + chunk_frames, total_frames))
+              for start in range(0, total_frames, chunk_frames)]
+
+    started = time.perf_counter()
+    recorder = FrameRecorder(output_file, timeline['projectors'])
+    frame_size = 3 * timeline['projectors']
+    frame_index = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_chunk, timeline, start, end) for start, end in bounds]
+            for future in futures:
+                chunk = future.result()
+                for offset in range(0, len(chunk), frame_size):
+                    recorder.write_packed(frame_index * interval / 1000.0,
+                                          chunk[offset:offset + frame_size])
+                    frame_index += 1
+    finally:
+        recorder.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'frames': frame_index,
+        'chunks': len(bounds),
+        'workers': workers,
+        'seconds': elapsed,
+        'frames_per_second': frame_index / elapsed if elapsed > 0 else 0.0
+    }
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Pré-calcul d'une conduite en fichier de trames")
+    parser.add_argument('timeline', help="fichier JSON de la conduite")
+    parser.add_argument('output', help="fichier de trames à produire (.lcrec)")
+    parser.add_argument('--workers', type=int, default=None, help="nombre de processus")
+    parser.add_argument('--chunk-frames', type=int, default=None, help="trames par tranche")
+    args = parser.parse_args()
+
+    with open(args.timeline, 'r', encoding='utf-8') as f:
+        timeline = json.load(f)
+    stats = render_timeline(timeline, args.output, args.workers, args.chunk_frames)
+    print(f"{stats['frames']} trames en {stats['seconds']:.2f}s "
+          f"({stats['chunks']} tranches, {stats['workers']} processus, "
+          f"{stats['frames_per_second']:.0f} trames/s)")
+
+if __name__ == "__main__":
+    main()
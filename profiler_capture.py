@@ -0,0 +1,134 @@
+"""
+profiler_capture.py - Capture cProfile à la demande pendant le spectacle (F6, commande distante, --profile)
+
+Les boucles à observer (boucle d'affichage, tick du moteur) sont enveloppées une fois pour toutes :
+hors capture, l'enveloppe ne coûte qu'un test de booléen. Jusqu'à Python 3.11, chaque boucle a son
+propre profileur pendant une capture (cProfile ne suit que le thread qui l'active). Depuis Python 3.12,
+cProfile repose sur sys.monitoring : un seul profileur peut être actif et il suit tous les threads,
+la capture en utilise donc un seul, activé au démarrage. À la fin, les profils sont fusionnés
+dans un fichier pstats (.prof, lisible par pstats, snakeviz, flameprof ou gprof2dot) accompagné
+d'un résumé texte trié par temps cumulé. pstats n'est importé qu'à l'écriture d'un profil.
+"""
+import cProfile
+import io
+import sys
+import threading
+import time
+from config import PROFILER_CONFIG
+
+# Depuis Python 3.12, un seul profileur cProfile actif à la fois, pour tous les threads
+SHARED_PROFILER = sys.version_info >= (3, 12)
+
+class ProfilerCapture:
+    """Capture cProfile de durée limitée sur des fonctions enveloppées"""
+
+    def __init__(self):
+        self.active = False
+        self.deadline = None
+        self.filename = None
+        self.last_filename = None
+        self.profiles = {}
+        self.shared_profile = None
+        self.locks = {}
+        self._state_lock = threading.RLock()
+
+    def wrap(self, name, function):
+        """Retourne la fonction profilée sous le nom donné pendant les captures"""
+        lock = self.locks.setdefault(name, threading.RLock())
+
+        def profiled(*args, **kwargs):
+            if not self.active:
+                return function(*args, **kwargs)
+            if SHARED_PROFILER:
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self._check_deadline()
+            with lock:
+                profile = self.profiles.get(name) or cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Un autre outil de profilage est actif : l'appel n'est pas profilé
+                    return function(*args, **kwargs)
+                self.profiles[name] = profile
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    profile.disable()
+                    self._check_deadline()
+        return profiled
+
+    def _check_deadline(self):
+        """Termine la capture, depuis un thread à part, une fois sa durée écoulée"""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.deadline = None
+            threading.Thread(target=self.stop, name="profiler-dump", daemon=True).start()
+
+    def start(self, seconds=None, filename=None):
+        """Démarre une capture de 'seconds' secondes (0 : jusqu'à stop) ; retourne le nom du fichier"""
+        with self._state_lock:
+            if self.active:
+                return self.filename
+            seconds = PROFILER_CONFIG['default_seconds'] if seconds is None else float(seconds)
+            self.profiles = {}
+            if SHARED_PROFILER:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError as e:
+                    print(f"Capture du profileur impossible: {e}")
+                    return None
+                self.shared_profile = profile
+            self.filename = filename or time.strftime(PROFILER_CONFIG['filename_pattern'])
+            self.deadline = time.monotonic() + seconds if seconds > 0 else None
+            self.active = True
+        print(f"Capture du profileur démarrée ({seconds:g} s) -> {self.filename}")
+        return self.filename
+
+    def stop(self):
+        """Termine la capture et écrit le fichier de statistiques ; retourne son nom (None si inactif)"""
+        with self._state_lock:
+            if not self.active:
+                return None
+            self.active = False
+            self.deadline = None
+            filename = self.filename
+            profiles = []
+            if self.shared_profile is not None:
+                self.shared_profile.disable()
+                profiles.append(self.shared_profile)
+                self.shared_profile = None
+            for name, profile in list(self.profiles.items()):
+                with self.locks[name]:
+                    profiles.append(profile)
+            self.profiles = {}
+
+        if not profiles:
+            print("Capture du profileur terminée sans appel profilé")
+            return None
+        import pstats
+        stats = pstats.Stats(*profiles)
+        stats.dump_stats(filename)
+        summary = io.StringIO()
+        pstats.Stats(filename, stream=summary).sort_stats('cumulative').print_stats(
+            PROFILER_CONFIG['summary_lines'])
+        with open(filename + '.txt', 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        self.last_filename = filename
+        print(f"Profil écrit: {filename} (résumé: {filename}.txt)")
+        return filename
+
+    def toggle(self, seconds=None):
+        """Démarre une capture, ou arrête celle en cours ; retourne le nom du fichier"""
+        if self.active:
+            return self.stop()
+        return self.start(seconds)
+
+    def get_status(self):
+        """Capture en cours, temps restant (s) et dernier fichier écrit"""
+        remaining = None
+        if self.active and self.deadline is not None:
+            remaining = max(0.0, self.deadline - time.monotonic())
+        return {'active': self.active, 'remaining': remaining, 'filename': self.filename,
+                'last_filename': self.last_filename}
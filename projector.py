@@ -1,11 +1,14 @@
 """
 projector.py - Gestion d'un projecteur individuel utilisant config.py
 """
+from color_space import hex_to_rgb
 from config import PROJECTOR_CONFIG
+from events import ProjectorChanged
 
 class Projector:
-    def __init__(self, projector_id):
+    def __init__(self, projector_id, bus=None):
         self.id = projector_id
+        self.bus = bus
         self.color = PROJECTOR_CONFIG['default_color']
         self.base_color = PROJECTOR_CONFIG['default_color']
         self.is_on = False
@@ -14,37 +17,50 @@ class Projector:
         self.max_intensity = PROJECTOR_CONFIG['max_intensity']
         self.min_intensity = PROJECTOR_CONFIG['min_intensity']
         
+    def _notify(self, *fields):
+        """Publie un changement d'état sur le bus d'événements"""
+        if self.bus is not None:
+            self.bus.publish(ProjectorChanged(self.id, fields))
+        
     def set_color(self, color):
         """Définir la couleur du projecteur"""
+        changed = color != self.base_color
         self.color = color
         self.base_color = color
+        if changed:
+            self._notify('color')
         
     def set_intensity(self, intensity):
         """Définir l'intensité avec limites configurées"""
-        self.intensity = max(self.min_intensity, 
-                           min(self.max_intensity, intensity))
+        intensity = max(self.min_intensity, 
+                        min(self.max_intensity, intensity))
+        if intensity != self.intensity:
+            self.intensity = intensity
+            self._notify('intensity')
         
     def turn_on(self):
         """Allumer le projecteur"""
-        self.is_on = True
+        if not self.is_on:
+            self.is_on = True
+            self._notify('is_on')
         
     def turn_off(self):
         """Éteindre le projecteur"""
-        self.is_on = False
+        if self.is_on:
+            self.is_on = False
+            self._notify('is_on')
         
     def toggle(self):
         """Basculer l'état on/off"""
         self.is_on = not self.is_on
+        self._notify('is_on')
         
     def get_dimmed_color(self):
         """Calculer la couleur avec l'intensité appliquée"""
         if self.intensity == self.min_intensity or not self.is_on:
             return "black"
         
-        hex_color = self.color.lstrip('#')
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
+        r, g, b = hex_to_rgb(self.color)
         
         intensity_factor = self.intensity / self.max_intensity
         r = int(r * intensity_factor)
@@ -63,10 +79,17 @@ class Projector:
     
     def set_state(self, state):
         """Appliquer un état complet au projecteur"""
-        self.color = state['color']
-        self.base_color = state['color']
-        self.is_on = state['is_on']
-        self.set_intensity(state['intensity'])
+        bus, self.bus = self.bus, None
+        before = (self.base_color, self.is_on, self.intensity)
+        try:
+            self.color = state['color']
+            self.base_color = state['color']
+            self.is_on = state['is_on']
+            self.set_intensity(state['intensity'])
+        finally:
+            self.bus = bus
+        if (self.base_color, self.is_on, self.intensity) != before:
+            self._notify('color', 'is_on', 'intensity')
     
     def __str__(self):
         status = "ON" if self.is_on else "OFF"
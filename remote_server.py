@@ -0,0 +1,539 @@
+"""
+remote_server.py - Serveur de contrôle à distance (asyncio, TCP, JSON ligne par ligne)
+
+Chaque message est une ligne JSON : une commande {"cmd": "toggle_strobe"}, un lot
+{"batch": [...]} ou une liste de commandes. Les identifiants de projecteurs commencent à 0.
+La réponse contient un résultat par commande : {"results": [{"ok": true, "result": ...}]}.
+Après {"cmd": "subscribe"}, le client reçoit les différences de trames et d'état.
+
+Les commandes d'état sont exécutées par lots au début d'un tick du moteur. Les commandes de
+fichiers et de bibliothèque de scènes (FILE_COMMANDS) s'exécutent dans un thread de travail,
+dans l'ordre du message : elles ne prennent le verrou d'état du moteur que pour lire ou
+appliquer l'état, jamais pendant une lecture ou une écriture de fichier.
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from color_space import validate_hex_color
+from config import REMOTE_CONFIG
+from events import EffectsChanged, ProjectorChanged, ScenesChanged
+from fixture_groups import BulkOperations, mask_from_ids
+
+class RemoteControlServer:
+    """Expose les opérations projecteurs, effets et scènes à un logiciel de conduite"""
+    FILE_COMMANDS = ('save_scene', 'load_scene', 'list_scenes', 'find_scenes', 'define_group',
+                     'delete_group', 'load_pixel_map', 'audio_start')
+
+    def __init__(self, projectors, effects_manager, scene_manager, engine=None, bus=None,
+                 host=None, port=None, groups=None, profiler=None):
+        self.projectors = projectors
+        self.effects_manager = effects_manager
+        self.scene_manager = scene_manager
+        self.engine = engine
+        self.groups = groups
+        self.profiler = profiler
+        self.bulk = BulkOperations(projectors, effects_manager)
+        self.host = host or REMOTE_CONFIG['host']
+        self.port = REMOTE_CONFIG['port'] if port is None else port
+
+        self.subscribers = set()
+        self.connections = set()
+        self.last_colors = {}
+        self.commands = {
+            'set_intensity': self.cmd_set_intensity,
+            'set_color': self.cmd_set_color,
+            'turn_on': self.cmd_turn_on,
+            'turn_off': self.cmd_turn_off,
+            'toggle': self.cmd_toggle,
+            'toggle_blink': self.cmd_toggle_blink,
+            'toggle_blink_all': lambda command: self.effects_manager.toggle_blink_all(),
+            'toggle_strobe': lambda command: self.effects_manager.toggle_strobe(),
+            'toggle_chaser': lambda command: self.effects_manager.toggle_chaser(),
+            'toggle_fade': lambda command: self.effects_manager.toggle_fade(),
+            'set_fade_colors': self.cmd_set_fade_colors,
+            'toggle_rainbow': lambda command: self.effects_manager.toggle_rainbow(),
+            'toggle_hue_rotate': lambda command: self.effects_manager.toggle_hue_rotate(),
+            'toggle_saturation_pulse': lambda command: self.effects_manager.toggle_saturation_pulse(),
+            'toggle_color_temperature': lambda command: self.effects_manager.toggle_color_temperature(),
+            'set_color_temperature': lambda command: self.effects_manager.set_color_temperature(
+                int(command['kelvin'])),
+            'define_chase_pattern': self.cmd_define_chase_pattern,
+            'delete_chase_pattern': lambda command: self.effects_manager.remove_chase_pattern(
+                command['name']),
+            'set_chase_pattern': lambda command: self.effects_manager.set_chase_pattern(
+                command.get('name')),
+            'list_chase_patterns': lambda command: self.effects_manager.get_chase_pattern_list(),
+            'load_pixel_map': self.cmd_load_pixel_map,
+            'toggle_pixel_map': lambda command: self.effects_manager.toggle_pixel_map(),
+            'audio_start': self.cmd_audio_start,
+            'audio_stop': self.cmd_audio_stop,
+            'audio_bind': lambda command: self.effects_manager.bind_audio(command['target'],
+                                                                          command['feature']),
+            'audio_unbind': lambda command: self.effects_manager.unbind_audio(command['target']),
+            'get_audio_status': self.cmd_get_audio_status,
+            'set_bpm': lambda command: self.effects_manager.set_bpm(float(command['bpm'])),
+            'tap_tempo': lambda command: self.effects_manager.tap_tempo(),
+            'downbeat': self.cmd_downbeat,
+            'beat_sync': lambda command: self.effects_manager.set_beat_sync(command['target'],
+                                                                            command.get('division')),
+            'get_beat': self.cmd_get_beat,
+            'stop_all_effects': lambda command: self.effects_manager.stop_all_effects(),
+            'load_scene': lambda command: self.scene_manager.load_scene(command['name']),
+            'save_scene': lambda command: self.scene_manager.save_scene(command['name']),
+            'list_scenes': lambda command: self.scene_manager.get_scene_list(),
+            'find_scenes': self.cmd_find_scenes,
+            'get_state': lambda command: self.get_state(),
+            'get_metrics': lambda command: self.get_metrics(),
+            'profile_start': lambda command: self._require_profiler().start(command.get('seconds'),
+                                                                            command.get('filename')),
+            'profile_stop': self.cmd_profile_stop,
+            'get_profile_status': lambda command: self._require_profiler().get_status(),
+            'define_group': self.cmd_define_group,
+            'delete_group': lambda command: self._require_groups().remove(command['name']),
+            'list_groups': self.cmd_list_groups,
+            'group_set_color': lambda command: self.bulk.set_color(
+                self._mask(command), validate_hex_color(command['color'])),
+            'group_set_intensity': lambda command: self.bulk.set_intensity(self._mask(command),
+                                                                           int(command['value'])),
+            'group_turn_on': lambda command: self.bulk.set_on(self._mask(command), True),
+            'group_turn_off': lambda command: self.bulk.set_on(self._mask(command), False),
+            'group_toggle': lambda command: self.bulk.toggle(self._mask(command)),
+            'group_blink': lambda command: self.bulk.set_blink(self._mask(command),
+                                                               command.get('active', True))
+        }
+
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+        self._file_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="remote-files")
+
+        if engine is not None:
+            engine.add_output(self.on_frame, secondary=True)
+        if bus is not None:
+            bus.subscribe(ProjectorChanged, self.on_projector_changed)
+            bus.subscribe(EffectsChanged, self.on_effects_changed)
+            bus.subscribe(ScenesChanged, self.on_scenes_changed)
+
+    # === CYCLE DE VIE ===
+
+    def start(self):
+        """Démarre le serveur dans son propre thread ; retourne le port d'écoute"""
+        if self._thread is not None:
+            return self.port
+        self._thread = threading.Thread(target=self._run, name="remote-server", daemon=True)
+        self._thread.start()
+        self._started.wait(timeout=5.0)
+        return self.port
+
+    def stop(self):
+        """Arrête le serveur et ferme les connexions"""
+        if self._loop is None:
+            return
+        loop = self._loop
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=5.0)
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5.0)
+        self._thread = None
+
+    def _run(self):
+        """Boucle asyncio du serveur"""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+            self._started.set()
+            self._loop.run_forever()
+        except Exception as e:
+            print(f"Erreur du serveur de contrôle à distance: {e}")
+            self._started.set()
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _serve(self):
+        """Ouvre le socket d'écoute"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port,
+                                                  limit=REMOTE_CONFIG['max_message_size'])
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _shutdown(self):
+        """Ferme le socket d'écoute et toutes les connexions"""
+        self._server.close()
+        for writer in list(self.connections):
+            writer.close()
+        self.subscribers.clear()
+        await self._server.wait_closed()
+
+    # === CONNEXIONS ===
+
+    async def _handle_client(self, reader, writer):
+        """Traite les messages d'un client jusqu'à sa déconnexion"""
+        self.connections.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle_message(line, writer)
+                await self._send(writer, response)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            print(f"Connexion de contrôle à distance interrompue: {e}")
+        finally:
+            self.connections.discard(writer)
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def handle_message(self, line, writer=None):
+        """Décode un message, exécute ses commandes en un seul lot et retourne la réponse"""
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {'results': [{'ok': False, 'error': f"JSON invalide: {e}"}]}
+
+        if isinstance(message, list):
+            commands = message
+        elif isinstance(message, dict) and 'batch' in message:
+            commands = message['batch']
+        else:
+            commands = [message]
+
+        results = [None] * len(commands)
+        engine_commands = []
+        for position, command in enumerate(commands):
+            if not isinstance(command, dict):
+                results[position] = {'ok': False, 'error': "Commande invalide"}
+            elif command.get('cmd') in ('subscribe', 'unsubscribe'):
+                results[position] = self._subscription(command, writer)
+            elif command.get('cmd') in self.FILE_COMMANDS:
+                # Les commandes d'état qui précèdent sont appliquées avant, dans l'ordre du message
+                await self._flush_engine_commands(engine_commands, results)
+                results[position] = await self._execute_on_worker(command)
+            else:
+                engine_commands.append((position, command))
+
+        await self._flush_engine_commands(engine_commands, results)
+        return {'results': results}
+
+    async def _flush_engine_commands(self, engine_commands, results):
+        """Exécute les commandes d'état accumulées en un seul lot et range leurs résultats"""
+        if not engine_commands:
+            return
+        for position, result in await self._execute_on_engine(engine_commands):
+            results[position] = result
+        engine_commands.clear()
+
+    def _subscription(self, command, writer):
+        """Gère l'abonnement d'un client aux différences de trames et d'état"""
+        if writer is None:
+            return {'ok': False, 'error': "Abonnement impossible sans connexion"}
+        if command['cmd'] == 'subscribe':
+            self.subscribers.add(writer)
+        else:
+            self.subscribers.discard(writer)
+        return self._result(command, True)
+
+    async def _execute_on_engine(self, commands):
+        """Exécute un lot de commandes au début du prochain tick, sans bloquer le moteur"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def run_batch():
+            try:
+                results = [(position, self.execute(command)) for position, command in commands]
+            except Exception as e:
+                results = [(position, {'id': command.get('id'), 'ok': False,
+                                       'error': f"Erreur d'exécution: {e}"})
+                           for position, command in commands]
+            loop.call_soon_threadsafe(self._resolve, future, results)
+
+        if self.engine is not None and self.engine.is_running():
+            self.engine.call_soon(run_batch)
+        else:
+            run_batch()
+        return await future
+
+    async def _execute_on_worker(self, command):
+        """Exécute une commande de fichiers dans le thread de travail, hors du tick du moteur"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._file_worker, self.execute, command)
+
+    def _state_lock(self):
+        """Verrou d'état partagé avec le moteur (aucun sans moteur)"""
+        if self.engine is None:
+            return nullcontext()
+        return self.engine.state_lock
+
+    def _resolve(self, future, results):
+        """Transmet les résultats d'un lot, sauf si le client est déjà parti"""
+        if not future.done():
+            future.set_result(results)
+
+    def execute(self, command):
+        """Exécute une commande et retourne son résultat"""
+        name = command.get('cmd')
+        handler = self.commands.get(name)
+        if handler is None:
+            return {'id': command.get('id'), 'ok': False, 'error': f"Commande inconnue: {name}"}
+        try:
+            return self._result(command, handler(command))
+        except (KeyError, TypeError, ValueError) as e:
+            return {'id': command.get('id'), 'ok': False, 'error': f"Paramètre invalide: {e}"}
+        except OSError as e:
+            return {'id': command.get('id'), 'ok': False, 'error': f"Fichier inaccessible: {e}"}
+        except Exception as e:
+            return {'id': command.get('id'), 'ok': False, 'error': f"Erreur d'exécution: {e}"}
+
+    def _result(self, command, result):
+        """Formate un résultat de commande réussie"""
+        return {'id': command.get('id'), 'ok': True, 'result': result}
+
+    # === COMMANDES ===
+
+    def _projector(self, command):
+        """Retourne le projecteur désigné par une commande"""
+        return self.projectors[int(command['projector'])]
+
+    def cmd_set_intensity(self, command):
+        """Règle l'intensité d'un projecteur"""
+        projector = self._projector(command)
+        projector.set_intensity(int(command['value']))
+        return projector.intensity
+
+    def cmd_set_color(self, command):
+        """Règle la couleur d'un projecteur"""
+        projector = self._projector(command)
+        projector.set_color(validate_hex_color(command['color']))
+        return projector.base_color
+
+    def cmd_turn_on(self, command):
+        """Allume un projecteur"""
+        self._projector(command).turn_on()
+        return True
+
+    def cmd_turn_off(self, command):
+        """Éteint un projecteur"""
+        self._projector(command).turn_off()
+        return False
+
+    def cmd_toggle(self, command):
+        """Bascule l'état on/off d'un projecteur"""
+        projector = self._projector(command)
+        projector.toggle()
+        return projector.is_on
+
+    def cmd_toggle_blink(self, command):
+        """Active/désactive le clignotement d'un projecteur"""
+        return self.effects_manager.toggle_blink(int(command['projector']))
+
+    def cmd_set_fade_colors(self, command):
+        """Définit les couleurs du fondu"""
+        self.effects_manager.set_fade_colors(validate_hex_color(command['color1']),
+                                             validate_hex_color(command['color2']))
+        return True
+
+    def cmd_define_chase_pattern(self, command):
+        """Crée ou remplace un motif de chaser ; les pas peuvent désigner des groupes"""
+        steps = []
+        for step in command.get('steps', []):
+            if isinstance(step, dict) and 'group' in step:
+                step = {'fixtures': self._require_groups().get_ids(step['group']),
+                        'color': step.get('color')}
+            steps.append(step)
+        pattern = {'mode': command.get('mode', 'sequence'), 'seed': command.get('seed', 0)}
+        if steps:
+            pattern['steps'] = steps
+        return self.effects_manager.define_chase_pattern(command['name'], pattern)
+
+    def cmd_load_pixel_map(self, command):
+        """Charge une image ou une séquence de trames pour le pixel map ; retourne le nombre de trames"""
+        from pixel_mapping import load_pixel_map
+        player = load_pixel_map(command['path'], len(self.projectors), command.get('width'),
+                                command.get('height'), command.get('layout'))
+        with self._state_lock():
+            self.effects_manager.set_pixel_map(player)
+        return player.frame_count
+
+    def cmd_audio_start(self, command):
+        """Démarre l'analyse d'un fichier WAV (ou '-' : PCM brut sur l'entrée standard)"""
+        from audio_analysis import open_audio
+        analyzer = open_audio(command.get('path'))
+        analyzer.start()
+        with self._state_lock():
+            self.effects_manager.set_audio(analyzer)
+        return analyzer.source.sample_rate
+
+    def cmd_audio_stop(self, command):
+        """Arrête l'analyse audio en cours (hors du thread du moteur)"""
+        if self.effects_manager.audio is None:
+            return False
+        self.effects_manager.set_audio(None)
+        return True
+
+    def cmd_get_audio_status(self, command):
+        """Coût d'analyse, latence, niveaux et liaisons audio"""
+        analyzer = self.effects_manager.audio
+        status = analyzer.get_status() if analyzer is not None else {'running': False}
+        status['bindings'] = dict(self.effects_manager.audio_bindings)
+        return status
+
+    def cmd_downbeat(self, command):
+        """Place le premier temps de la mesure à l'instant de la commande"""
+        self.effects_manager.beat_clock.downbeat()
+        return True
+
+    def cmd_get_beat(self, command):
+        """Tempo, phase du temps et de la mesure, effets cadencés"""
+        clock = self.effects_manager.beat_clock
+        return {**clock.get_state(), 'beat_phase': clock.beat_phase(), 'bar_phase': clock.bar_phase(),
+                'beat_in_bar': clock.beat_in_bar(),
+                'divisions': dict(self.effects_manager.beat_divisions)}
+
+    def cmd_find_scenes(self, command):
+        """Recherche des scènes dans l'index"""
+        color = command.get('color')
+        if color is not None:
+            validate_hex_color(color)
+        return self.scene_manager.find_scenes(color=color, lit=command.get('lit'),
+                                              effect=command.get('effect'),
+                                              prefix=command.get('prefix'))
+
+    def _require_groups(self):
+        """Retourne les groupes de projecteurs (erreur si non configurés)"""
+        if self.groups is None:
+            raise ValueError("groupes non disponibles")
+        return self.groups
+
+    def _mask(self, command):
+        """Masque désigné par une commande groupée : 'group', 'groups' et/ou 'projectors'"""
+        mask = mask_from_ids(command.get('projectors', ()), len(self.projectors))
+        names = command.get('groups', [])
+        if 'group' in command:
+            names = [command['group']] + list(names)
+        if names:
+            groups = self._require_groups()
+            for name in names:
+                if name not in groups.groups:
+                    raise KeyError(name)
+            mask |= groups.union(names)
+        return mask
+
+    def _require_profiler(self):
+        """Retourne le profileur à la demande (erreur si non configuré)"""
+        if self.profiler is None:
+            raise ValueError("profileur non disponible")
+        return self.profiler
+
+    def cmd_profile_stop(self, command):
+        """Termine la capture en cours ; le fichier est écrit hors du tick du moteur"""
+        profiler = self._require_profiler()
+        if not profiler.active:
+            return None
+        filename = profiler.filename
+        threading.Thread(target=profiler.stop, name="profiler-dump", daemon=True).start()
+        return filename
+
+    def cmd_define_group(self, command):
+        """Crée ou remplace un groupe de projecteurs"""
+        mask = self._require_groups().define(command['name'], command['projectors'])
+        return bin(mask).count('1')
+
+    def cmd_list_groups(self, command):
+        """Retourne les groupes et leurs projecteurs"""
+        groups = self._require_groups()
+        return {name: groups.get_ids(name) for name in groups.get_group_list()}
+
+    def get_state(self):
+        """Retourne l'état complet des projecteurs et des effets"""
+        return {
+            'projectors': {str(i): projector.get_state() for i, projector in self.projectors.items()},
+            'effects': self.effects_manager.get_state()
+        }
+
+    def get_metrics(self):
+        """Retourne le chronométrage des ticks et l'état du délestage (None si non instrumenté)"""
+        metrics = getattr(self.engine, 'metrics', None)
+        if metrics is None:
+            return None
+        summary = metrics.summary()
+        if self.engine.shedder is not None:
+            summary['shedding'] = self.engine.shedder.get_status()
+        return summary
+
+    # === DIFFUSION AUX ABONNÉS ===
+
+    def on_frame(self, frame):
+        """Sortie du moteur : diffuse les couleurs qui ont changé depuis la trame précédente"""
+        if not self.subscribers or self._loop is None:
+            return
+        changes = {}
+        for projector_id, color in zip(frame.projector_ids, frame.colors):
+            if self.last_colors.get(projector_id) != color:
+                self.last_colors[projector_id] = color
+                changes[str(projector_id)] = color
+        if changes:
+            self._broadcast_threadsafe({'event': 'frame', 'sequence': frame.sequence,
+                                        'changes': changes})
+
+    def on_projector_changed(self, event):
+        """Diffuse le nouvel état d'un projecteur"""
+        self._broadcast_threadsafe({'event': 'projector', 'projector': event.projector_id,
+                                    'state': self.projectors[event.projector_id].get_state()})
+
+    def on_effects_changed(self, event):
+        """Diffuse le nouvel état des effets"""
+        self._broadcast_threadsafe({'event': 'effects', 'state': self.effects_manager.get_state()})
+
+    def on_scenes_changed(self, event):
+        """Diffuse les scènes modifiées"""
+        self._broadcast_threadsafe({'event': 'scenes', 'names': sorted(event.names)})
+
+    def _broadcast_threadsafe(self, message):
+        """Planifie la diffusion d'un message depuis n'importe quel thread"""
+        loop = self._loop
+        if self.subscribers and loop is not None:
+            loop.call_soon_threadsafe(self._broadcast, message)
+
+    def _broadcast(self, message):
+        """Envoie un message à tous les abonnés (thread du serveur)
+
+        Un abonné qui ne lit plus assez vite (tampon d'envoi au-delà de max_subscriber_backlog)
+        est déconnecté plutôt que de laisser la mémoire du serveur grossir sans limite.
+        """
+        data = (json.dumps(message) + '\n').encode('utf-8')
+        limit = REMOTE_CONFIG['max_subscriber_backlog']
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.subscribers.discard(writer)
+                continue
+            if writer.transport.get_write_buffer_size() + len(data) > limit:
+                print("Abonné de contrôle à distance trop lent: déconnexion")
+                self.subscribers.discard(writer)
+                writer.close()
+                continue
+            writer.write(data)
+
+    async def _send(self, writer, message):
+        """Envoie une réponse à un client"""
+        writer.write((json.dumps(message) + '\n').encode('utf-8'))
+        await writer.drain()
+
+async def send_message(host, port, message):
+    """Client minimal : envoie un message et retourne la réponse décodée"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write((json.dumps(message) + '\n').encode('utf-8'))
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+def request(message, host=None, port=None):
+    """Envoie un message au serveur depuis du code synchrone (scripts, tests)"""
+    return asyncio.run(send_message(host or REMOTE_CONFIG['host'],
+                                    REMOTE_CONFIG['port'] if port is None else port, message))
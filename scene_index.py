@@ -0,0 +1,166 @@
+"""
+scene_index.py - Index incrémental des scènes (couleurs, projecteurs allumés, effets, noms)
+"""
+from bisect import bisect_left, insort
+
+EFFECT_KEYS = {
+    'strobe': 'strobe_active',
+    'fade': 'fade_active',
+    'chaser': 'chaser_active',
+    'blink_all': 'blink_all_active',
+    'rainbow': 'rainbow_active',
+    'hue_rotate': 'hue_rotate_active',
+    'saturation_pulse': 'saturation_pulse_active',
+    'color_temperature': 'color_temperature_active'
+}
+
+class SceneIndex:
+    """Index des scènes maintenu à jour à chaque sauvegarde, suppression ou import"""
+
+    def __init__(self):
+        self.infos = {}
+        self.sorted_names = []
+        self.by_color = {}
+        self.by_lit_projector = {}
+        self.by_effect = {}
+
+    def rebuild(self, scenes):
+        """Reconstruit complètement l'index à partir d'un dictionnaire de scènes"""
+        self.__init__()
+        for scene_name, scene_data in scenes.items():
+            self.add(scene_name, scene_data)
+
+    def add(self, scene_name, scene_data):
+        """Ajoute ou remplace une scène dans l'index"""
+        if scene_name in self.infos:
+            self.remove(scene_name)
+
+        info = self.compute_info(scene_name, scene_data)
+        self.infos[scene_name] = info
+        insort(self.sorted_names, scene_name)
+
+        for color in info['colors']:
+            self.by_color.setdefault(color, set()).add(scene_name)
+        for proj_id in info['lit_projectors']:
+            self.by_lit_projector.setdefault(proj_id, set()).add(scene_name)
+        for effect in info['effects']:
+            self.by_effect.setdefault(effect, set()).add(scene_name)
+
+    def remove(self, scene_name):
+        """Retire une scène de l'index"""
+        info = self.infos.pop(scene_name, None)
+        if info is None:
+            return False
+
+        position = bisect_left(self.sorted_names, scene_name)
+        if position < len(self.sorted_names) and self.sorted_names[position] == scene_name:
+            del self.sorted_names[position]
+
+        self._discard(self.by_color, info['colors'], scene_name)
+        self._discard(self.by_lit_projector, info['lit_projectors'], scene_name)
+        self._discard(self.by_effect, info['effects'], scene_name)
+        return True
+
+    def _discard(self, mapping, keys, scene_name):
+        """Retire une scène des ensembles d'un index inversé"""
+        for key in keys:
+            names = mapping.get(key)
+            if names is None:
+                continue
+            names.discard(scene_name)
+            if not names:
+                del mapping[key]
+
+    def get_info(self, scene_name):
+        """Retourne les informations indexées d'une scène"""
+        return self.infos.get(scene_name)
+
+    def find_by_prefix(self, prefix):
+        """Retourne les noms de scènes commençant par un préfixe (ordre alphabétique)"""
+        start = bisect_left(self.sorted_names, prefix)
+        names = []
+        for scene_name in self.sorted_names[start:]:
+            if not scene_name.startswith(prefix):
+                break
+            names.append(scene_name)
+        return names
+
+    def query(self, color=None, lit=None, effect=None, prefix=None):
+        """Retourne les scènes correspondant à tous les critères donnés
+
+        color: couleur hex ('#ff0000'), lit: id ou liste d'ids de projecteurs allumés,
+        effect: nom ou liste d'effets ('strobe', 'fade', 'chaser', 'blink_all', 'blink',
+                'rainbow', 'hue_rotate', 'saturation_pulse', 'color_temperature'),
+        prefix: préfixe du nom.
+        """
+        candidates = None
+
+        if color is not None:
+            candidates = self._intersect(candidates, self.by_color.get(color.lower(), set()))
+
+        if lit is not None:
+            for proj_id in self._as_list(lit):
+                candidates = self._intersect(candidates, self.by_lit_projector.get(int(proj_id), set()))
+
+        if effect is not None:
+            for effect_name in self._as_list(effect):
+                candidates = self._intersect(candidates, self.by_effect.get(effect_name, set()))
+
+        if prefix is not None:
+            candidates = self._intersect(candidates, set(self.find_by_prefix(prefix)))
+
+        if candidates is None:
+            return list(self.sorted_names)
+        return sorted(candidates)
+
+    def _intersect(self, candidates, names):
+        """Intersecte l'ensemble courant de candidats avec un ensemble de noms"""
+        if candidates is None:
+            return set(names)
+        return candidates & names
+
+    def _as_list(self, value):
+        """Normalise un critère simple ou multiple en liste"""
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return list(value)
+        return [value]
+
+    @staticmethod
+    def compute_info(scene_name, scene_data):
+        """Calcule les informations d'une scène à partir de ses données brutes"""
+        if 'projectors' in scene_data:
+            projectors_data = scene_data['projectors']
+            effects_data = scene_data.get('effects')
+        else:
+            projectors_data = scene_data
+            effects_data = None
+
+        lit_projectors = set()
+        colors = set()
+        for proj_id_str, state in projectors_data.items():
+            if not isinstance(state, dict):
+                continue
+            colors.add(str(state.get('color', '#000000')).lower())
+            if state.get('is_on', False):
+                try:
+                    lit_projectors.add(int(proj_id_str))
+                except ValueError:
+                    pass
+
+        effects = set()
+        if effects_data:
+            for effect_name, state_key in EFFECT_KEYS.items():
+                if effects_data.get(state_key, False):
+                    effects.add(effect_name)
+            if any(effects_data.get('individual_blinks_active', {}).values()):
+                effects.add('blink')
+
+        return {
+            'name': scene_name,
+            'projectors_count': len(projectors_data),
+            'projectors_on': len(lit_projectors),
+            'colors': sorted(colors),
+            'has_effects': effects_data is not None,
+            'lit_projectors': sorted(lit_projectors),
+            'effects': sorted(effects)
+        }
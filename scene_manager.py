@@ -1,38 +1,86 @@
 """
 scene_manager.py - Gestionnaire des scènes utilisant config.py
+
+La bibliothèque de scènes a son propre verrou : l'interface, la relecture du fichier et le
+contrôle à distance (thread de travail) y accèdent sans passer par le moteur. L'état des
+projecteurs et des effets n'est lu ou appliqué que sous le verrou d'état partagé avec le
+moteur, et jamais pendant une écriture de fichier.
 """
 import json
 import os
+import threading
 from config import FILES_CONFIG
+from scene_index import SceneIndex
+from scene_watcher import SceneFileWatcher
+from events import ScenesChanged
 
 class SceneManager:
-    def __init__(self, projectors, effects_manager=None):
+    def __init__(self, projectors, effects_manager=None, bus=None, background_load=False,
+                 state_lock=None):
         self.projectors = projectors
         self.effects_manager = effects_manager
+        self.bus = bus
+        self.state_lock = state_lock if state_lock is not None else threading.RLock()
+        self.lock = threading.RLock()
+        self._file_lock = threading.Lock()
+        self._revision = 0
+        self._written_revision = 0
         self.scenes = {}
         self.quick_scenes = {}
+        self.index = SceneIndex()
         self.scenes_file = FILES_CONFIG['scenes_file']
-        self.load_scenes_from_file()
+        self.watcher = SceneFileWatcher(self.scenes_file, FILES_CONFIG['watch_interval'])
+        if background_load:
+            self.loaded = not self.watcher.reload()
+        else:
+            self.load_scenes_from_file()
+            self.loaded = True
+    
+    def ensure_loaded(self):
+        """Termine le chargement initial de manière synchrone s'il est encore en cours"""
+        if self.loaded:
+            return
+        with self.lock:
+            if self.loaded:
+                return
+            self.load_scenes_from_file()
+            self.watcher.mark_written()
+            self.loaded = True
+            names = list(self.scenes)
+        self._notify(names)
     
     def set_effects_manager(self, effects_manager):
         """Définit le gestionnaire d'effets (si créé après le SceneManager)"""
         self.effects_manager = effects_manager
     
-    def save_scene(self, scene_name):
-        """Sauvegarde l'état actuel des projecteurs ET des effets comme une scène"""
-        try:
-            scene_data = {
-                'projectors': {},
-                'effects': None
-            }
-            
+    def _notify(self, names):
+        """Publie un changement de la bibliothèque de scènes sur le bus d'événements"""
+        if self.bus is not None and names:
+            self.bus.publish(ScenesChanged(set(names)))
+    
+    def capture_scene(self):
+        """Retourne l'état actuel des projecteurs ET des effets (lu sous le verrou d'état)"""
+        scene_data = {
+            'projectors': {},
+            'effects': None
+        }
+        with self.state_lock:
             for i, projector in self.projectors.items():
                 scene_data['projectors'][str(i)] = projector.get_state()
             
             if self.effects_manager:
                 scene_data['effects'] = self.effects_manager.get_state()
-            
-            self.scenes[scene_name] = scene_data
+        return scene_data
+    
+    def save_scene(self, scene_name):
+        """Sauvegarde l'état actuel des projecteurs ET des effets comme une scène"""
+        self.ensure_loaded()
+        try:
+            scene_data = self.capture_scene()
+            with self.lock:
+                self.scenes[scene_name] = scene_data
+                self.index.add(scene_name, scene_data)
+            self._notify([scene_name])
             return self.save_scenes_to_file()
         except Exception as e:
             print(f"Erreur lors de la sauvegarde de la scène '{scene_name}': {e}")
@@ -40,53 +88,71 @@ class SceneManager:
     
     def load_scene(self, scene_name):
         """Charge une scène et l'applique aux projecteurs ET aux effets"""
+        self.ensure_loaded()
         try:
-            if scene_name not in self.scenes:
+            with self.lock:
+                scene_data = self.scenes.get(scene_name)
+            if scene_data is None:
                 print(f"Scène '{scene_name}' non trouvée")
                 return False
             
-            scene_data = self.scenes[scene_name]
-            
-            if 'projectors' in scene_data:
-                projectors_data = scene_data['projectors']
-                effects_data = scene_data.get('effects')
-            else:
-                projectors_data = scene_data
-                effects_data = None
-            
-            for proj_id_str, state in projectors_data.items():
-                proj_id = int(proj_id_str)
-                if proj_id in self.projectors:
-                    self.projectors[proj_id].set_state(state)
-            
-            if self.effects_manager and effects_data:
-                self.effects_manager.set_state(effects_data)
-            elif self.effects_manager:
-                self.effects_manager.stop_all_effects()
-            
+            with self.state_lock:
+                self.apply_scene_data(scene_data)
             return True
         except Exception as e:
             print(f"Erreur lors du chargement de la scene '{scene_name}': {e}")
             return False
     
+    def apply_scene_data(self, scene_data):
+        """Applique des données de scène brutes aux projecteurs ET aux effets"""
+        if 'projectors' in scene_data:
+            projectors_data = scene_data['projectors']
+            effects_data = scene_data.get('effects')
+        else:
+            projectors_data = scene_data
+            effects_data = None
+        
+        for proj_id_str, state in projectors_data.items():
+            proj_id = int(proj_id_str)
+            if proj_id in self.projectors:
+                self.projectors[proj_id].set_state(state)
+        
+        if self.effects_manager and effects_data:
+            self.effects_manager.set_state(effects_data)
+        elif self.effects_manager:
+            self.effects_manager.stop_all_effects()
+    
     def delete_scene(self, scene_name):
         """Supprime une scène"""
+        self.ensure_loaded()
         try:
-            if scene_name in self.scenes:
+            with self.lock:
+                if scene_name not in self.scenes:
+                    return False
                 del self.scenes[scene_name]
-                return self.save_scenes_to_file()
-            return False
+                self.index.remove(scene_name)
+            self._notify([scene_name])
+            return self.save_scenes_to_file()
         except Exception as e:
             print(f"Erreur lors de la suppression de la scene '{scene_name}': {e}")
             return False
     
     def get_scene_list(self):
         """Retourne la liste des noms de scènes (exclut les scènes rapides Quick_*)"""
-        return [name for name in self.scenes.keys() if not name.startswith('Quick_')]
+        self.ensure_loaded()
+        with self.lock:
+            return [name for name in self.scenes.keys() if not name.startswith('Quick_')]
     
     def get_all_scenes_list(self):
         """Retourne la liste complète des noms de scènes"""
-        return list(self.scenes.keys())
+        self.ensure_loaded()
+        with self.lock:
+            return list(self.scenes.keys())
+    
+    def has_scene(self, scene_name):
+        """Vérifie si une scène existe (attend la fin du chargement initial)"""
+        self.ensure_loaded()
+        return scene_name in self.scenes
     
     def save_quick_scene(self, scene_index):
         """Sauvegarde une scène de rappel rapide (0-5)"""
@@ -99,9 +165,8 @@ class SceneManager:
         return self.load_scene(scene_name)
     
     def has_quick_scene(self, scene_index):
-        """Vérifie si une scène rapide existe"""
-        scene_name = f"Quick_{scene_index}"
-        return scene_name in self.scenes
+        """Vérifie si une scène rapide existe (attend la fin du chargement initial)"""
+        return self.has_scene(f"Quick_{scene_index}")
     
     def delete_quick_scene(self, scene_index):
         """Supprime une scène de rappel rapide"""
@@ -109,12 +174,26 @@ class SceneManager:
         return self.delete_scene(scene_name)
     
     def save_scenes_to_file(self):
-        """Sauvegarde toutes les scènes dans un fichier JSON"""
+        """Sauvegarde toutes les scènes dans un fichier JSON
+
+        Le contenu est sérialisé sous le verrou de la bibliothèque, puis écrit hors de ce verrou ;
+        une écriture dépassée par une autre plus récente est abandonnée.
+        """
         try:
-            os.makedirs(os.path.dirname(self.scenes_file) if os.path.dirname(self.scenes_file) else '.', exist_ok=True)
-            
-            with open(self.scenes_file, 'w', encoding='utf-8') as f:
-                json.dump(self.scenes, f, indent=2, ensure_ascii=False)
+            with self.lock:
+                content = json.dumps(self.scenes, indent=2, ensure_ascii=False)
+                self._revision += 1
+                revision = self._revision
+            with self._file_lock:
+                if revision < self._written_revision:
+                    return True
+                os.makedirs(os.path.dirname(self.scenes_file) if os.path.dirname(self.scenes_file) else '.', exist_ok=True)
+                
+                with open(self.scenes_file, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                self._written_revision = revision
+                if getattr(self, 'watcher', None):
+                    self.watcher.mark_written()
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde des scènes: {e}")
@@ -122,27 +201,60 @@ class SceneManager:
     
     def load_scenes_from_file(self):
         """Charge les scènes depuis le fichier JSON"""
+        scenes = {}
         try:
             if os.path.exists(self.scenes_file):
                 with open(self.scenes_file, 'r', encoding='utf-8') as f:
                     loaded_scenes = json.load(f)
-                    self.scenes = {}
                     for scene_name, scene_data in loaded_scenes.items():
                         if isinstance(scene_data, dict):
-                            self.scenes[scene_name] = scene_data
-            else:
-                self.scenes = {}
+                            scenes[scene_name] = scene_data
         except Exception as e:
             print(f"Erreur lors du chargement des scènes: {e}")
-            self.scenes = {}
+            scenes = {}
+        with self.lock:
+            self.scenes = scenes
+            self.index.rebuild(self.scenes)
+    
+    def poll_file_changes(self):
+        """Applique les modifications externes du fichier de scènes ; retourne les noms modifiés"""
+        loaded_scenes = self.watcher.poll()
+        if loaded_scenes is None:
+            if not self.loaded and self.watcher.read_failed:
+                # Lecture initiale en échec : le chargement est terminé, avec une bibliothèque vide
+                self.loaded = True
+            return set()
+        self.loaded = True
+        return self.apply_reloaded_scenes(loaded_scenes)
+    
+    def apply_reloaded_scenes(self, loaded_scenes):
+        """Met à jour uniquement les scènes ajoutées, modifiées ou supprimées"""
+        changed = set()
+        with self.lock:
+            for scene_name in list(self.scenes.keys()):
+                if scene_name not in loaded_scenes:
+                    del self.scenes[scene_name]
+                    self.index.remove(scene_name)
+                    changed.add(scene_name)
+            
+            for scene_name, scene_data in loaded_scenes.items():
+                if self.scenes.get(scene_name) != scene_data:
+                    self.scenes[scene_name] = scene_data
+                    self.index.add(scene_name, scene_data)
+                    changed.add(scene_name)
+        self._notify(changed)
+        return changed
     
     def export_scenes(self, filename=None):
         """Exporte toutes les scènes vers un fichier"""
+        self.ensure_loaded()
         if filename is None:
             filename = f"scenes_export{FILES_CONFIG['export_extension']}"       
         try:
+            with self.lock:
+                content = json.dumps(self.scenes, indent=2, ensure_ascii=False)
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.scenes, f, indent=2, ensure_ascii=False)
+                f.write(content)
             return True
         except Exception as e:
             print(f"Erreur lors de l'export: {e}")
@@ -150,6 +262,7 @@ class SceneManager:
     
     def import_scenes(self, filename):
         """Importe des scènes depuis un fichier"""
+        self.ensure_loaded()
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 imported_scenes = json.load(f)
@@ -158,31 +271,35 @@ class SceneManager:
                     if isinstance(scene_data, dict):
                         valid_scenes[scene_name] = scene_data
                 
-                self.scenes.update(valid_scenes)
+                with self.lock:
+                    self.scenes.update(valid_scenes)
+                    for scene_name, scene_data in valid_scenes.items():
+                        self.index.add(scene_name, scene_data)
+                self._notify(valid_scenes.keys())
                 return self.save_scenes_to_file()
         except Exception as e:
             print(f"Erreur lors de l'import: {e}")
             return False
     
     def get_scene_info(self, scene_name):
-        """Retourne les informations d'une scène"""
-        if scene_name not in self.scenes:
-            return None
-        
-        scene_data = self.scenes[scene_name]
-        
-        if 'projectors' in scene_data:
-            projectors_data = scene_data['projectors']
-            has_effects = scene_data.get('effects') is not None
-        else:
-            projectors_data = scene_data
-            has_effects = False
-        
-        info = {
-            'name': scene_name,
-            'projectors_count': len(projectors_data),
-            'projectors_on': sum(1 for state in projectors_data.values() if state.get('is_on', False)),
-            'colors': list(set(state.get('color', '#000000') for state in projectors_data.values())),
-            'has_effects': has_effects
-        }
-        return info
+        """Retourne les informations d'une scène (depuis l'index)"""
+        with self.lock:
+            info = self.index.get_info(scene_name)
+            if info is None:
+                return None
+            return {
+                'name': info['name'],
+                'projectors_count': info['projectors_count'],
+                'projectors_on': info['projectors_on'],
+                'colors': list(info['colors']),
+                'has_effects': info['has_effects']
+            }
+    
+    def find_scenes(self, color=None, lit=None, effect=None, prefix=None, include_quick=False):
+        """Recherche des scènes par couleur, projecteurs allumés, effets actifs et préfixe"""
+        self.ensure_loaded()
+        with self.lock:
+            names = self.index.query(color=color, lit=lit, effect=effect, prefix=prefix)
+        if include_quick:
+            return names
+        return [name for name in names if not name.startswith('Quick_')]
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+scene_watcher.py - Surveillance du fichier de scènes et relecture en arrière-plan
+"""
+import json
+import os
+import threading
+import time
+
+class SceneFileWatcher:
+    """Détecte les modifications externes du fichier de scènes et le relit hors du thread UI"""
+
+    def __init__(self, scenes_file, poll_interval):
+        self.scenes_file = scenes_file
+        self.poll_interval = poll_interval / 1000.0
+        self.last_poll_time = 0.0
+        self.signature = self._read_signature()
+
+        self._lock = threading.Lock()
+        self._result = None
+        self._reading = False
+        self._generation = 0
+        self.read_failed = False
+
+    def _read_signature(self):
+        """Retourne la signature (mtime, taille) du fichier, None s'il n'existe pas"""
+        try:
+            stat = os.stat(self.scenes_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def mark_written(self):
+        """Enregistre la signature après une écriture locale pour ne pas la recharger"""
+        self.signature = self._read_signature()
+        with self._lock:
+            self._generation += 1
+            self._result = None
+
+    def reload(self):
+        """Lance immédiatement une lecture complète en arrière-plan ; retourne False si pas de fichier"""
+        self.signature = self._read_signature()
+        if self.signature is None:
+            return False
+        self._reading = True
+        threading.Thread(target=self._read_file, args=(self._generation,),
+                         name="scene-watcher", daemon=True).start()
+        return True
+
+    def poll(self):
+        """Vérifie le fichier si l'intervalle est écoulé ; retourne les scènes relues ou None"""
+        result = self._take_result()
+        if result is not None:
+            return result
+
+        now = time.monotonic()
+        if now - self.last_poll_time < self.poll_interval:
+            return None
+        self.last_poll_time = now
+
+        signature = self._read_signature()
+        if signature == self.signature or self._reading:
+            return None
+        self.signature = signature
+        if signature is None:
+            return None
+
+        self._reading = True
+        threading.Thread(target=self._read_file, args=(self._generation,),
+                         name="scene-watcher", daemon=True).start()
+        return None
+
+    def _take_result(self):
+        """Récupère le résultat d'une relecture terminée"""
+        with self._lock:
+            result = self._result
+            self._result = None
+        return result
+
+    def _read_file(self, generation):
+        """Relit et décode le fichier de scènes (thread de fond)"""
+        scenes = {}
+        try:
+            with open(self.scenes_file, 'r', encoding='utf-8') as f:
+                loaded_scenes = json.load(f)
+            for scene_name, scene_data in loaded_scenes.items():
+                if isinstance(scene_data, dict):
+                    scenes[scene_name] = scene_data
+        except Exception as e:
+            print(f"Erreur lors de la relecture des scènes: {e}")
+            scenes = None
+
+        with self._lock:
+            self._reading = False
+            if generation != self._generation:
+                return
+            self.read_failed = scenes is None
+            if scenes is None:
+                self.signature = None
+            else:
+                self._result = scenes
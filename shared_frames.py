@@ -0,0 +1,105 @@
+"""
+shared_frames.py - Anneau de trames en mémoire partagée (écrivain unique, lecteurs sans verrou)
+"""
+import struct
+from multiprocessing import shared_memory
+from color_space import hex_to_rgb
+
+HEADER = struct.Struct('<4sIIQ')
+SLOT_HEADER = struct.Struct('<Qd')
+MAGIC = b'LCFR'
+
+def color_to_rgb(color):
+    """Convertit une couleur de trame ('#rrggbb' ou 'black') en triplet RGB"""
+    if not color or color == 'black':
+        return (0, 0, 0)
+    return hex_to_rgb(color)
+
+def pack_colors(colors):
+    """Empaquette les couleurs d'une trame en octets RGB contigus"""
+    packed = bytearray(3 * len(colors))
+    for i, color in enumerate(colors):
+        packed[3 * i:3 * i + 3] = bytes(color_to_rgb(color))
+    return bytes(packed)
+
+def unpack_colors(data):
+    """Convertit des octets RGB contigus en couleurs '#rrggbb'"""
+    return tuple(f"#{data[i]:02x}{data[i + 1]:02x}{data[i + 2]:02x}"
+                 for i in range(0, len(data), 3))
+
+class SharedFrameWriter:
+    """Écrit les trames du moteur dans un anneau en mémoire partagée
+
+    Chaque emplacement porte son numéro de séquence, remis à zéro pendant l'écriture :
+    un lecteur qui observe un numéro différent avant et après sa copie ignore la trame.
+    L'écrivain n'attend donc jamais les lecteurs.
+    """
+
+    def __init__(self, num_projectors, slots, name=None):
+        self.num_projectors = num_projectors
+        self.slots = slots
+        self.slot_size = SLOT_HEADER.size + 3 * num_projectors
+        size = HEADER.size + slots * self.slot_size
+        self.memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self.memory.name
+        HEADER.pack_into(self.memory.buf, 0, MAGIC, slots, num_projectors, 0)
+
+    def write(self, frame):
+        """Écrit une trame du moteur (utilisable comme sortie de RenderEngine)"""
+        self.write_packed(frame.sequence, frame.timestamp, pack_colors(frame.colors))
+
+    def write_packed(self, sequence, timestamp, packed):
+        """Écrit une trame déjà empaquetée dans l'emplacement suivant de l'anneau"""
+        buf = self.memory.buf
+        offset = HEADER.size + (sequence % self.slots) * self.slot_size
+        SLOT_HEADER.pack_into(buf, offset, 0, timestamp)
+        data_offset = offset + SLOT_HEADER.size
+        buf[data_offset:data_offset + len(packed)] = packed
+        SLOT_HEADER.pack_into(buf, offset, sequence, timestamp)
+        HEADER.pack_into(buf, 0, MAGIC, self.slots, self.num_projectors, sequence)
+
+    def close(self):
+        """Libère la mémoire partagée"""
+        self.memory.close()
+        try:
+            self.memory.unlink()
+        except FileNotFoundError:
+            pass
+
+class SharedFrameReader:
+    """Lit la dernière trame complète de l'anneau sans jamais bloquer l'écrivain"""
+
+    def __init__(self, name):
+        self.memory = shared_memory.SharedMemory(name=name)
+        magic, self.slots, self.num_projectors, _ = HEADER.unpack_from(self.memory.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Mémoire partagée '{name}' invalide")
+        self.slot_size = SLOT_HEADER.size + 3 * self.num_projectors
+        self.last_sequence = 0
+        self.dropped = 0
+        self.torn = 0
+
+    def read_latest(self):
+        """Retourne (séquence, horodatage, octets RGB) de la dernière trame, None si rien de neuf"""
+        buf = self.memory.buf
+        sequence = HEADER.unpack_from(buf, 0)[3]
+        if sequence == 0 or sequence == self.last_sequence:
+            return None
+
+        offset = HEADER.size + (sequence % self.slots) * self.slot_size
+        before, timestamp = SLOT_HEADER.unpack_from(buf, offset)
+        data_offset = offset + SLOT_HEADER.size
+        data = bytes(buf[data_offset:data_offset + 3 * self.num_projectors])
+        after = SLOT_HEADER.unpack_from(buf, offset)[0]
+        if before != sequence or after != sequence:
+            self.torn += 1
+            return None
+
+        if self.last_sequence:
+            self.dropped += max(0, sequence - self.last_sequence - 1)
+        self.last_sequence = sequence
+        return sequence, timestamp, data
+
+    def close(self):
+        """Détache la mémoire partagée (sans la détruire)"""
+        self.memory.close()
@@ -0,0 +1,38 @@
+"""
+startup.py - Mesure du démarrage par étapes (moteur, première trame, panneaux, scènes)
+"""
+import time
+
+class StartupReport:
+    """Horodate les étapes du démarrage depuis le lancement du processus"""
+
+    STAGES = ('imports', 'engine', 'first_frame', 'panels', 'scenes')
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = {}
+        self.printed = False
+
+    def mark(self, stage):
+        """Enregistre la fin d'une étape (la première occurrence seulement)"""
+        if stage not in self.marks:
+            self.marks[stage] = time.perf_counter() - self.started
+
+    def has(self, stage):
+        """Indique si une étape est terminée"""
+        return stage in self.marks
+
+    def is_complete(self):
+        """Indique si toutes les étapes sont terminées"""
+        return all(stage in self.marks for stage in self.STAGES)
+
+    def get_report(self):
+        """Retourne le temps écoulé (ms) à la fin de chaque étape"""
+        return {stage: seconds * 1000 for stage, seconds in self.marks.items()}
+
+    def format_report(self):
+        """Rapport lisible : une ligne par étape, dans l'ordre chronologique"""
+        lines = ["Démarrage:"]
+        for stage, seconds in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {stage:<12}{seconds * 1000:>8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,7 @@
+"""
+conftest.py - Rend les modules de l'application importables depuis les tests (sans affichage)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
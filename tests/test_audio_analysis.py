@@ -0,0 +1,114 @@
+"""
+test_audio_analysis.py - FFT comparée à une DFT de référence, analyse de blocs et liaisons audio des effets
+"""
+import cmath
+import math
+import random
+import time
+import pytest
+from audio_analysis import FFT, AudioAnalyzer, AudioFeatures
+from effects_manager import EffectsManager
+from projector import Projector
+
+def reference_magnitudes(fft, samples):
+    """DFT directe du bloc fenêtré (coefficients 0 à size/2 - 1)"""
+    size = fft.size
+    windowed = [samples[n] * fft.window[n] for n in range(size)]
+    return [abs(sum(windowed[n] * cmath.exp(-2j * math.pi * k * n / size) for n in range(size)))
+            for k in range(size // 2)]
+
+@pytest.mark.parametrize('size', [2, 8, 64])
+def test_fft_matches_reference_dft(size):
+    rng = random.Random(size)
+    fft = FFT(size)
+    samples = [rng.uniform(-1.0, 1.0) for _ in range(size)]
+    assert fft.magnitudes(samples) == pytest.approx(reference_magnitudes(fft, samples), abs=1e-9)
+
+def test_fft_peak_at_sine_frequency():
+    fft = FFT(256)
+    samples = [math.sin(2 * math.pi * 16 * n / 256) for n in range(256)]
+    magnitudes = fft.magnitudes(samples)
+    assert magnitudes.index(max(magnitudes)) == 16
+
+@pytest.mark.parametrize('size', [0, 1, 12, 100])
+def test_fft_rejects_sizes_not_power_of_two(size):
+    with pytest.raises(ValueError):
+        FFT(size)
+
+class SilentSource:
+    sample_rate = 8000
+
+    def close(self):
+        pass
+
+def test_long_silence_keeps_levels_finite():
+    analyzer = AudioAnalyzer(SilentSource(), block_size=64)
+    analyzer.peaks = {name: 0.0 for name in analyzer.peaks}
+    for _ in range(3):
+        analyzer.analyze([0.0] * 64, time.perf_counter())
+    assert all(level == 0.0 for level in analyzer.features.levels.values())
+
+class FakeAnalyzer:
+    """Analyse audio dont on publie les mesures à la main"""
+
+    def __init__(self):
+        self.features = AudioFeatures(0.0, {'bass': 0.0}, False, 0)
+        self.stopped = False
+
+    def onset(self):
+        count = self.features.onset_count + 1
+        self.features = AudioFeatures(time.perf_counter(), {'bass': 0.0}, True, count)
+
+    def stop(self):
+        self.stopped = True
+
+def test_onset_bound_strobe_flashes_once_per_onset_on_every_fixture():
+    projectors = {i: Projector(i) for i in range(4)}
+    for projector in projectors.values():
+        projector.turn_on()
+    manager = EffectsManager(projectors)
+    analyzer = FakeAnalyzer()
+    manager.set_audio(analyzer)
+    manager.bind_audio('strobe', 'onset')
+    manager.toggle_strobe()
+
+    lit = []
+    for tick in range(8):
+        if tick in (1, 5):
+            analyzer.onset()
+        manager.process_all_effects()
+        colors = {p.color for p in projectors.values()}
+        assert len(colors) == 1
+        lit.append(colors != {'#000000'})
+    assert lit.count(True) == 2
+    assert lit[1] and lit[5]
+
+def test_replaced_analyzer_is_stopped():
+    manager = EffectsManager({0: Projector(0)})
+    first = FakeAnalyzer()
+    manager.set_audio(first)
+    manager.set_audio(FakeAnalyzer())
+    deadline = time.monotonic() + 2.0
+    while not first.stopped and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert first.stopped
+
+def test_band_bound_dimmer_scales_lit_colors():
+    projectors = {0: Projector(0), 1: Projector(1)}
+    projectors[0].set_color('#ff8040')
+    projectors[0].turn_on()
+    manager = EffectsManager(projectors)
+    analyzer = FakeAnalyzer()
+    analyzer.features = AudioFeatures(0.0, {'bass': 0.0}, False, 0)
+    manager.set_audio(analyzer)
+    manager.bind_audio('dimmer', 'bass')
+    manager.process_all_effects()
+    floor = manager.audio_dimmer
+    assert 0.0 <= floor < 1.0
+    assert projectors[0].color == f"#{int(255 * floor):02x}{int(128 * floor):02x}{int(64 * floor):02x}"
+    assert projectors[1].color == '#000000'
+
+    analyzer.features = AudioFeatures(1.0, {'bass': 1.0}, False, 0)
+    manager.process_all_effects()
+    assert manager.audio_dimmer == 1.0
+    assert projectors[0].color == '#ff8040'
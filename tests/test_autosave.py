@@ -0,0 +1,78 @@
+"""
+test_autosave.py - Sauvegarde automatique : instantanés inchangés ignorés et restauration au démarrage
+"""
+import json
+import pytest
+import config
+from autosave import AutosaveManager
+from effects_manager import EffectsManager
+from projector import Projector
+from scene_manager import SceneManager
+
+@pytest.fixture
+def rig(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.FILES_CONFIG, 'scenes_file', str(tmp_path / 'scenes.json'))
+    projectors = {i: Projector(i) for i in range(3)}
+    effects_manager = EffectsManager(projectors)
+    autosave = AutosaveManager(projectors, effects_manager, str(tmp_path / 'autosave.json'))
+    return projectors, effects_manager, autosave
+
+def test_unchanged_snapshot_is_skipped(rig):
+    projectors, _, autosave = rig
+    autosave.tick(force=True)
+    autosave._flush()
+    assert autosave.writes == 1
+
+    autosave.tick(force=True)
+    autosave._flush()
+    assert autosave.writes == 1
+    assert autosave.skipped == 1
+
+    projectors[1].set_color('#00ff00')
+    autosave.tick(force=True)
+    autosave._flush()
+    assert autosave.writes == 2
+
+def test_interval_limits_snapshots_unless_forced(rig):
+    projectors, _, autosave = rig
+    autosave.tick()
+    projectors[0].toggle()
+    autosave.tick()
+    assert autosave.pending[0][0][2] is False
+    autosave.tick(force=True)
+    assert autosave.pending[0][0][2] is True
+
+def test_pending_snapshots_are_coalesced(rig):
+    projectors, _, autosave = rig
+    for color in ('#111111', '#222222', '#333333'):
+        projectors[2].set_color(color)
+        autosave.tick(force=True)
+    autosave._flush()
+    assert autosave.writes == 1
+    with open(autosave.autosave_file, encoding='utf-8') as f:
+        assert json.load(f)['projectors']['2']['color'] == '#333333'
+
+def test_snapshot_is_restored_on_next_startup(rig):
+    projectors, effects_manager, autosave = rig
+    projectors[0].set_color('#abcdef')
+    projectors[0].toggle()
+    projectors[0].set_intensity(40)
+    effects_manager.toggle_strobe()
+    autosave.tick(force=True)
+    autosave._flush()
+
+    restarted = {i: Projector(i) for i in range(3)}
+    restarted_effects = EffectsManager(restarted)
+    restarted_autosave = AutosaveManager(restarted, restarted_effects, autosave.autosave_file)
+    assert restarted_autosave.restore(SceneManager(restarted, restarted_effects))
+    assert restarted[0].base_color == '#abcdef'
+    assert restarted[0].is_on
+    assert restarted[0].intensity == 40
+    assert restarted_effects.active_effects['strobe']['active']
+
+    restarted_autosave.tick(force=True)
+    assert restarted_autosave.skipped == 1
+
+def test_restore_without_file_returns_false(rig):
+    _, _, autosave = rig
+    assert not autosave.restore(None)
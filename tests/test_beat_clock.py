@@ -0,0 +1,72 @@
+"""
+test_beat_clock.py - Continuité de phase de l'horloge de tempo, tap tempo et synchronisation des effets
+"""
+import pytest
+from beat_clock import BeatClock
+from config import BEAT_CONFIG
+from effects_manager import EffectsManager
+from projector import Projector
+
+def test_set_bpm_keeps_position_continuous():
+    clock = BeatClock(bpm=120, beats_per_bar=4)
+    clock.origin = 0.0
+    assert clock.position(10.0) == pytest.approx(20.0)
+
+    clock.set_bpm(90, now=10.0)
+    assert clock.position(10.0) == pytest.approx(20.0)
+    assert clock.position(12.0) == pytest.approx(23.0)
+
+def test_phase_continuity_across_many_tempo_changes():
+    clock = BeatClock(bpm=100)
+    clock.origin = 0.0
+    now = 0.0
+    for bpm in (60, 180, 75.5, 300, 20):
+        now += 1.3
+        before = clock.position(now)
+        clock.set_bpm(bpm, now=now)
+        assert clock.position(now) == pytest.approx(before)
+        assert clock.beat_phase(now) == pytest.approx(before % 1.0)
+
+def test_set_bpm_is_clamped():
+    clock = BeatClock()
+    assert clock.set_bpm(10_000, now=0.0) == BEAT_CONFIG['max_bpm']
+    assert clock.set_bpm(1, now=0.0) == BEAT_CONFIG['min_bpm']
+
+def test_tap_tempo_follows_mean_interval_and_restarts_after_timeout():
+    clock = BeatClock(bpm=120)
+    for tap in (0.0, 0.4, 0.8, 1.2):
+        clock.tap(now=tap)
+    assert clock.bpm == pytest.approx(150.0)
+
+    late = 1.2 + BEAT_CONFIG['tap_timeout'] + 1.0
+    assert clock.tap(now=late) == pytest.approx(150.0)
+    assert list(clock.taps) == [late]
+
+def test_downbeat_and_bar_phase():
+    clock = BeatClock(bpm=120, beats_per_bar=4)
+    clock.downbeat(now=5.0)
+    assert clock.beat_in_bar(5.0) == 0
+    assert clock.beat_in_bar(6.6) == 3
+    assert clock.bar_phase(6.0) == pytest.approx(0.5)
+
+@pytest.mark.parametrize('division', [0, -1, float('nan'), float('inf'), 'x'])
+def test_invalid_beat_divisions_are_rejected(division):
+    manager = EffectsManager({0: Projector(0)})
+    with pytest.raises(ValueError):
+        manager.set_beat_sync('strobe', division)
+    assert manager.beat_divisions == {}
+
+def test_beat_sync_is_restored_with_the_state_and_cleared_by_stop():
+    manager = EffectsManager({0: Projector(0)})
+    manager.set_bpm(90)
+    manager.set_beat_sync('blink', 0.5)
+    state = manager.get_state()
+    state['beat']['divisions']['strobe'] = float('nan')
+
+    restored = EffectsManager({0: Projector(0)})
+    restored.set_state(state)
+    assert restored.beat_clock.bpm == 90
+    assert restored.beat_divisions == {'blink': 0.5}
+
+    restored.stop_all_effects()
+    assert restored.beat_divisions == {}
@@ -0,0 +1,81 @@
+"""
+test_chase_patterns.py - Motifs de chaser compilés : ordre des pas, avance par tick et sauvegarde
+"""
+import pytest
+from chase_patterns import ChaseTable, normalize_pattern
+from config import EFFECTS_CONFIG
+from effects_manager import EffectsManager
+from projector import Projector
+
+def test_sequence_and_bounce_orders():
+    sequence = ChaseTable(normalize_pattern({'mode': 'sequence'}, 4))
+    assert sequence.masks == [1, 2, 4, 8]
+
+    bounce = ChaseTable(normalize_pattern({'mode': 'bounce'}, 4))
+    assert bounce.masks == [1, 2, 4, 8, 4, 2]
+    assert bounce.lookup(7) == (2, None)
+
+def test_bounce_with_two_steps_does_not_repeat_ends():
+    assert ChaseTable(normalize_pattern({'mode': 'bounce'}, 2)).masks == [1, 2]
+
+def test_random_order_visits_each_step_once_per_cycle_without_repeats():
+    count = 5
+    table = ChaseTable(normalize_pattern({'mode': 'random', 'seed': 3}, count))
+    cycles = EFFECTS_CONFIG['chase_random_cycles']
+    assert len(table) == count * cycles
+    for start in range(0, len(table), count):
+        assert sorted(table.masks[start:start + count]) == [1 << i for i in range(count)]
+    for position in range(len(table)):
+        assert table.masks[position] != table.masks[(position + 1) % len(table)]
+
+def test_random_order_is_reproducible_from_seed():
+    pattern = normalize_pattern({'mode': 'random', 'seed': 11}, 6)
+    assert ChaseTable(pattern).masks == ChaseTable(pattern).masks
+
+def test_step_colors_follow_the_order():
+    pattern = normalize_pattern({'mode': 'bounce', 'steps': [[0], {'fixtures': [1], 'color': '#00ff00'}, [2]]}, 3)
+    assert ChaseTable(pattern).colors == [None, '#00ff00', None, '#00ff00']
+
+@pytest.mark.parametrize('pattern', [{'mode': 'spirale'}, {'steps': []},
+                                     {'steps': [{'fixtures': [0], 'color': 'vert'}]}])
+def test_invalid_patterns_raise_value_error(pattern):
+    with pytest.raises(ValueError):
+        normalize_pattern(pattern, 4)
+
+def lit_fixtures(effects_manager):
+    effects_manager.process_all_effects()
+    return [i for i, projector in effects_manager.projectors.items() if projector.color != '#000000']
+
+def make_chaser(count=4):
+    projectors = {i: Projector(i) for i in range(count)}
+    for projector in projectors.values():
+        projector.set_color('#ffffff')
+        projector.turn_on()
+    effects_manager = EffectsManager(projectors)
+    effects_manager.chaser_speed = 2
+    return effects_manager
+
+def test_chaser_advances_once_per_tick_whatever_the_fixture_count():
+    effects_manager = make_chaser()
+    effects_manager.toggle_chaser()
+    assert [lit_fixtures(effects_manager) for _ in range(5)] == [[0], [1], [1], [2], [2]]
+
+def test_pattern_switch_keeps_a_compiled_table_and_is_saved_in_state():
+    effects_manager = make_chaser()
+    effects_manager.toggle_chaser()
+    effects_manager.define_chase_pattern('paires', {'steps': [[0, 2], {'fixtures': [1, 3], 'color': '#00ff00'}]})
+    effects_manager.set_chase_pattern('paires')
+    assert effects_manager.chase_table is not None
+    assert lit_fixtures(effects_manager) == [0, 2]
+
+    restored = make_chaser()
+    restored.set_state(effects_manager.get_state())
+    assert restored.active_effects['chaser']['active']
+    assert restored.chase_pattern == 'paires'
+    assert restored.chase_table.colors == [None, '#00ff00']
+
+def test_saved_pattern_without_name_falls_back_to_id_order():
+    effects_manager = make_chaser()
+    effects_manager.set_state({'chaser_active': True, 'chase_pattern': {'steps': [[0]]}})
+    assert effects_manager.chase_pattern is None
+    assert lit_fixtures(effects_manager) == [0]
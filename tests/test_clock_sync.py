@@ -0,0 +1,102 @@
+"""
+test_clock_sync.py - Synchronisation meneur/suiveur de l'horloge de spectacle et du tempo sur localhost
+"""
+import socket
+import time
+import pytest
+from clock_sync import ClockFollower, ClockLeader, ShowClock
+from effects_manager import EffectsManager
+from projector import Projector
+
+@pytest.fixture
+def leader():
+    clock = ShowClock(interval=100)
+    clock.offset = 12.5
+    clock.reset_phase()
+    leader = ClockLeader(clock, host='127.0.0.1', port=0)
+    leader.start()
+    yield leader
+    leader.stop()
+
+@pytest.fixture
+def follower(leader):
+    follower = ClockFollower(ShowClock(interval=50), host='127.0.0.1', port=leader.port)
+    follower._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    follower._socket.settimeout(1.0)
+    yield follower
+    follower._socket.close()
+
+def test_follower_aligns_show_time_and_phase_origin(leader, follower):
+    for _ in range(5):
+        assert follower.sync_once()
+    status = follower.get_status()
+    assert status['synchronized']
+    assert leader.requests == 5
+    assert abs(follower.clock.now() - leader.clock.now()) < 0.005
+    assert follower.clock.phase_origin == leader.clock.phase_origin
+    assert follower.clock.interval == leader.clock.interval
+    assert status['error_ms'] == pytest.approx(status['rtt_ms'] / 2)
+
+def test_effects_on_both_nodes_share_the_same_step(leader, follower):
+    assert follower.sync_once()
+    managers = []
+    for clock in (leader.clock, follower.clock):
+        projectors = {i: Projector(i) for i in range(4)}
+        for projector in projectors.values():
+            projector.turn_on()
+        manager = EffectsManager(projectors)
+        manager.set_clock(clock)
+        manager.toggle_chaser()
+        managers.append(manager)
+
+    # Au milieu d'un tick de l'horloge du meneur, loin de toute frontière
+    time.sleep((leader.clock.next_tick_delay() + leader.clock.interval / 2) % leader.clock.interval)
+    for manager in managers:
+        manager.process_all_effects()
+    assert managers[0].clock_tick == managers[1].clock_tick
+    assert ([p.color for p in managers[0].projectors.values()]
+            == [p.color for p in managers[1].projectors.values()])
+
+def test_follower_without_leader_stays_unsynchronized():
+    unused = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    unused.bind(('127.0.0.1', 0))
+    port = unused.getsockname()[1]
+    unused.close()
+
+    follower = ClockFollower(ShowClock(), host='127.0.0.1', port=port)
+    follower._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    follower._socket.settimeout(0.05)
+    try:
+        assert not follower.sync_once()
+    finally:
+        follower._socket.close()
+    assert not follower.get_status()['synchronized']
+
+def test_follower_takes_the_leader_tempo_and_beat_phase(leader, follower):
+    managers = []
+    for node in (leader, follower):
+        projectors = {i: Projector(i) for i in range(2)}
+        for projector in projectors.values():
+            projector.turn_on()
+        manager = EffectsManager(projectors)
+        manager.set_clock(node.clock)
+        node.beat_clock = manager.beat_clock
+        managers.append(manager)
+    managers[0].set_bpm(137)
+    managers[0].beat_clock.downbeat()
+    managers[1].set_bpm(90)
+
+    assert follower.sync_once()
+    assert follower.beat_clock.bpm == 137
+    assert follower.beat_clock.origin == leader.beat_clock.origin
+
+    for manager in managers:
+        manager.set_beat_sync('strobe', 0.25)
+        manager.toggle_strobe()
+    lit = [[], []]
+    for _ in range(8):
+        time.sleep((leader.clock.next_tick_delay() + leader.clock.interval / 2) % leader.clock.interval)
+        for manager, pattern in zip(managers, lit):
+            manager.process_all_effects()
+            pattern.append(manager.projectors[0].color != '#000000')
+    assert lit[0] == lit[1]
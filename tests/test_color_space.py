@@ -0,0 +1,43 @@
+"""
+test_color_space.py - Conversions de l'espace colorimétrique et tables précalculées
+"""
+import pytest
+from color_space import (HueTable, build_temperature_table, hex_to_rgb, hsv_to_rgb_batch, rgb_to_hex,
+                         rgb_to_hsv_batch, validate_hex_color)
+
+COLORS = ['#000000', '#ffffff', '#ff0000', '#00ff00', '#0000ff', '#ff8800', '#123456', '#7f7f7f']
+
+def test_hex_round_trip_and_clamping():
+    for color in COLORS:
+        assert rgb_to_hex(hex_to_rgb(color)) == color
+    assert rgb_to_hex((300, -5, 127.6)) == '#ff0080'
+
+def test_hsv_batch_round_trip():
+    hsv_values = rgb_to_hsv_batch(COLORS)
+    assert len(hsv_values) == len(COLORS)
+    assert hsv_values[2] == (0.0, 1.0, 1.0)
+    assert hsv_to_rgb_batch(hsv_values) == COLORS
+
+def test_hue_table_matches_direct_conversion():
+    table = HueTable(360)
+    for degrees in (0, 60, 120, 200, 300):
+        hue = degrees / 360
+        assert table.color(table.index(hue)) == hsv_to_rgb_batch([(hue, 1.0, 1.0)])[0]
+        assert table.color(table.index(hue), 0.5, 0.5) == hsv_to_rgb_batch([(hue, 0.5, 0.5)])[0]
+    assert table.index(1.0) == 0
+
+def test_temperature_table_goes_from_warm_to_cool():
+    table = build_temperature_table(1000, 12000, 100)
+    assert len(table) == 111
+    warm = hex_to_rgb(table[2000])
+    cool = hex_to_rgb(table[12000])
+    assert warm[0] == 255 and warm[2] < warm[1]
+    assert cool[2] == 255 and cool[0] < cool[2]
+
+@pytest.mark.parametrize('color', ['red', '#12345', '#1234567', '#gg0000', 5, None])
+def test_validate_hex_color_rejects_other_formats(color):
+    with pytest.raises(ValueError):
+        validate_hex_color(color)
+
+def test_validate_hex_color_accepts_both_cases():
+    assert validate_hex_color('#AbCdEf') == '#AbCdEf'
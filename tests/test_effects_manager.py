@@ -0,0 +1,64 @@
+"""
+test_effects_manager.py - Effets avancés une fois par tick, quel que soit le nombre de projecteurs
+"""
+import pytest
+from effects_manager import EffectsManager
+from projector import Projector
+
+def lit_rig(count):
+    projectors = {i: Projector(i) for i in range(count)}
+    for projector in projectors.values():
+        projector.turn_on()
+    return projectors, EffectsManager(projectors)
+
+def fade_colors(count, ticks):
+    projectors, manager = lit_rig(count)
+    manager.toggle_fade()
+    colors = []
+    for _ in range(ticks):
+        manager.process_all_effects()
+        tick_colors = {p.color for p in projectors.values()}
+        assert len(tick_colors) == 1
+        colors.append(tick_colors.pop())
+    return colors
+
+def test_fade_speed_does_not_depend_on_the_number_of_fixtures():
+    assert fade_colors(1, 60) == fade_colors(8, 60)
+
+def test_fade_cycle_lasts_fade_speed_ticks():
+    _, manager = lit_rig(4)
+    colors = fade_colors(4, manager.fade_speed * 2)
+    assert colors[:manager.fade_speed] == colors[manager.fade_speed:]
+    assert colors[0] != colors[manager.fade_speed // 2]
+
+@pytest.mark.parametrize('toggle', ['toggle_strobe', 'toggle_blink_all'])
+def test_rhythm_effects_do_not_depend_on_the_number_of_fixtures(toggle):
+    lit = []
+    for count in (1, 8):
+        projectors, manager = lit_rig(count)
+        getattr(manager, toggle)()
+        pattern = []
+        for _ in range(12):
+            manager.process_all_effects()
+            pattern.append(projectors[0].color != '#000000')
+        lit.append(pattern)
+    assert lit[0] == lit[1]
+    assert True in lit[0] and False in lit[0]
+
+def test_base_colors_are_converted_in_one_batch_per_tick(monkeypatch):
+    import effects_manager
+    batches = []
+    convert = effects_manager.rgb_to_hsv_batch
+    monkeypatch.setattr(effects_manager, 'rgb_to_hsv_batch',
+                        lambda colors: batches.append(sorted(colors)) or convert(colors))
+    projectors, manager = lit_rig(8)
+    for i, projector in projectors.items():
+        projector.set_color(('#ff0000', '#00ff00', '#123456')[i % 3])
+    manager.toggle_hue_rotate()
+    manager.process_all_effects()
+    assert batches == [['#00ff00', '#123456', '#ff0000']]
+
+    projectors[0].set_color('#abcdef')
+    manager.process_all_effects()
+    manager.process_all_effects()
+    assert batches[1:] == [['#abcdef']]
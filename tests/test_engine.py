@@ -0,0 +1,69 @@
+"""
+test_engine.py - Thread du moteur : trames publiées, erreurs dans un tick, verrou d'état partagé
+"""
+import threading
+import time
+from effects_manager import EffectsManager
+from engine import RenderEngine
+from history import UndoHistory
+from projector import Projector
+
+class FailingEffects(EffectsManager):
+    """Gestionnaire d'effets dont les premiers ticks échouent"""
+
+    def __init__(self, projectors, failures):
+        super().__init__(projectors)
+        self.failures = failures
+
+    def process_all_effects(self):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("effet en panne")
+        super().process_all_effects()
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+def test_tick_publishes_dimmed_frame():
+    projectors = {i: Projector(i) for i in range(2)}
+    projectors[1].set_color('#ff0000')
+    projectors[1].turn_on()
+    projectors[1].set_intensity(50)
+    engine = RenderEngine(projectors, EffectsManager(projectors))
+    frame = engine.tick()
+    assert engine.frames.latest() is frame
+    assert frame.projector_ids == (0, 1)
+    assert frame.colors == (projectors[0].get_dimmed_color(), '#7f0000')
+
+def test_engine_survives_an_exception_in_a_tick(capsys):
+    projectors = {i: Projector(i) for i in range(2)}
+    engine = RenderEngine(projectors, FailingEffects(projectors, failures=2))
+    engine.interval = 0.001
+    engine.start()
+    try:
+        assert wait_for(lambda: engine.frames.latest() is not None)
+        assert engine._thread.is_alive()
+    finally:
+        engine.stop()
+    assert "Erreur dans le tick du moteur: effet en panne" in capsys.readouterr().out
+
+def test_gui_action_does_not_interleave_with_a_tick():
+    projectors = {i: Projector(i) for i in range(2)}
+    history = UndoHistory(projectors)
+    engine = RenderEngine(projectors, EffectsManager(projectors), history=history)
+    ticked = threading.Event()
+
+    with history.action('color', projector_ids=[0]):
+        projectors[0].set_color('#00ff00')
+        projectors[0].turn_on()
+        worker = threading.Thread(target=lambda: (engine.tick(), ticked.set()))
+        worker.start()
+        assert not ticked.wait(0.05)
+    worker.join(timeout=2.0)
+    assert ticked.is_set()
+    assert engine.frames.latest().colors[0] == '#00ff00'
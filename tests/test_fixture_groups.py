@@ -0,0 +1,68 @@
+"""
+test_fixture_groups.py - Masques de sélection, groupes nommés et opérations groupées annulables
+"""
+import pytest
+from effects_manager import EffectsManager
+from fixture_groups import BulkOperations, FixtureGroups, ids_from_mask, mask_from_ids
+from history import UndoHistory
+from projector import Projector
+
+@pytest.fixture
+def rig():
+    projectors = {i: Projector(i) for i in range(6)}
+    effects_manager = EffectsManager(projectors)
+    history = UndoHistory(projectors, effects_manager)
+    return projectors, effects_manager, history, BulkOperations(projectors, effects_manager, history)
+
+def test_mask_round_trip():
+    assert mask_from_ids([0, 3, 5]) == 0b101001
+    assert ids_from_mask(0b101001) == [0, 3, 5]
+    assert ids_from_mask(0) == []
+
+@pytest.mark.parametrize('projector_ids', [[-1], [6], [0, 10 ** 9]])
+def test_mask_from_ids_rejects_out_of_range_ids(projector_ids):
+    with pytest.raises(ValueError):
+        mask_from_ids(projector_ids, count=6)
+
+def test_bulk_color_and_intensity_are_one_undo_step(rig):
+    projectors, _, history, bulk = rig
+    mask = mask_from_ids([1, 2, 4])
+    assert bulk.set_color(mask, '#00ffff') == 3
+    assert [projectors[i].base_color == '#00ffff' for i in range(6)] == [False, True, True, False, True, False]
+
+    assert history.undo() == 'group_color'
+    assert not any(projectors[i].base_color == '#00ffff' for i in range(6))
+
+    bulk.set_intensity(mask, 25)
+    assert {projectors[i].intensity for i in (1, 2, 4)} == {25}
+
+def test_toggle_turns_all_on_unless_all_are_on(rig):
+    projectors, _, _, bulk = rig
+    mask = mask_from_ids([0, 1])
+    projectors[0].turn_on()
+    bulk.toggle(mask)
+    assert projectors[0].is_on and projectors[1].is_on
+    bulk.toggle(mask)
+    assert not projectors[0].is_on and not projectors[1].is_on
+
+def test_blink_assignment_updates_the_effect_mask(rig):
+    _, effects_manager, history, bulk = rig
+    assert bulk.set_blink(mask_from_ids([2, 3]), True) == 0b1100
+    assert effects_manager.is_blinking(3)
+    assert bulk.set_blink(mask_from_ids([3]), False) == 0b100
+    history.undo()
+    assert effects_manager.blink_mask == 0b1100
+
+def test_groups_are_saved_and_out_of_range_ids_dropped_on_load(rig, tmp_path):
+    projectors = rig[0]
+    groups_file = str(tmp_path / 'groups.json')
+    groups = FixtureGroups(projectors, groups_file)
+    groups.define('Face', [0, 1])
+    groups.define('Contre', [4, 5])
+    with pytest.raises(ValueError):
+        groups.define('Trop', [7])
+    assert ids_from_mask(groups.union(['Face', 'Contre'])) == [0, 1, 4, 5]
+
+    smaller = FixtureGroups({i: Projector(i) for i in range(5)}, groups_file)
+    assert smaller.get_ids('Contre') == [4]
+    assert smaller.get_group_list() == ['Contre', 'Face']
@@ -0,0 +1,53 @@
+"""
+test_frame_recorder.py - Aller-retour enregistrement/relecture et fichiers invalides
+"""
+import pytest
+import config
+from engine import Frame
+from frame_recorder import HEADER, MAGIC, FrameRecorder, FrameReplayer
+
+COLORS = [('#102030', 'black', '#ffffff'), ('#000001', '#abcdef', '#fedcba'), ('black', 'black', '#010203')]
+
+def record(path, frames, monkeypatch, capacity=1):
+    monkeypatch.setitem(config.RECORDER_CONFIG, 'initial_capacity', capacity)
+    recorder = FrameRecorder(str(path), 3)
+    for sequence, (timestamp, colors) in enumerate(frames):
+        recorder.write(Frame(sequence, timestamp, (0, 1, 2), colors))
+    recorder.close()
+
+def test_round_trip_preserves_colors_and_relative_timestamps(tmp_path, monkeypatch):
+    path = tmp_path / 'show.lcrec'
+    record(path, [(100.0 + 0.1 * i, colors) for i, colors in enumerate(COLORS)], monkeypatch)
+
+    replayer = FrameReplayer(str(path))
+    try:
+        assert len(replayer) == 3
+        assert replayer.num_projectors == 3
+        assert replayer.duration() == pytest.approx(0.2)
+        for index, colors in enumerate(COLORS):
+            frame = replayer.frame_at(index)
+            assert frame.colors == tuple('#000000' if color == 'black' else color for color in colors)
+            assert frame.timestamp == pytest.approx(0.1 * index)
+        assert replayer.index_at(0.15) == 1
+        assert [frame.sequence for frame in replayer.frames_between(0.05, 0.25)] == [2, 3]
+    finally:
+        replayer.close()
+
+def test_frame_count_is_limited_to_records_present(tmp_path, monkeypatch):
+    path = tmp_path / 'cut.lcrec'
+    record(path, [(float(i), colors) for i, colors in enumerate(COLORS)], monkeypatch)
+    data = path.read_bytes()
+    path.write_bytes(data[:-1])
+
+    replayer = FrameReplayer(str(path))
+    try:
+        assert len(replayer) == 2
+    finally:
+        replayer.close()
+
+@pytest.mark.parametrize('content', [b'', b'LC', HEADER.pack(b'XXXX', 1, 3, 0), HEADER.pack(MAGIC, 99, 3, 0)])
+def test_invalid_files_raise_value_error(tmp_path, content):
+    path = tmp_path / 'bad.lcrec'
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        FrameReplayer(str(path))
@@ -0,0 +1,92 @@
+"""
+test_history.py - Annuler/rétablir par deltas et fusion des actions successives
+"""
+from effects_manager import EffectsManager
+from history import UndoHistory
+from projector import Projector
+
+def make_history(count=3):
+    projectors = {i: Projector(i) for i in range(count)}
+    effects_manager = EffectsManager(projectors)
+    return projectors, effects_manager, UndoHistory(projectors, effects_manager)
+
+def test_undo_and_redo_restore_projector_state():
+    projectors, _, history = make_history()
+    with history.action('color', projector_ids=[1]):
+        projectors[1].set_color('#123456')
+    with history.action('toggle', projector_ids=[2]):
+        projectors[2].toggle()
+
+    assert history.undo() == 'toggle'
+    assert not projectors[2].is_on
+    assert history.undo() == 'color'
+    assert projectors[1].base_color != '#123456'
+    assert history.undo() is None
+
+    assert history.redo() == 'color'
+    assert projectors[1].base_color == '#123456'
+    assert history.can_redo()
+
+def test_unchanged_action_is_not_recorded():
+    projectors, _, history = make_history()
+    with history.action('noop', projector_ids=[0]):
+        projectors[0].set_intensity(projectors[0].intensity)
+    assert not history.can_undo()
+
+def test_same_merge_key_merges_into_one_entry():
+    projectors, _, history = make_history()
+    initial = projectors[0].intensity
+    for value in (10, 20, 30):
+        with history.action('intensity', projector_ids=[0], merge_key=('intensity', 0)):
+            projectors[0].set_intensity(value)
+
+    assert len(history.undo_stack) == 1
+    history.undo()
+    assert projectors[0].intensity == initial
+    history.redo()
+    assert projectors[0].intensity == 30
+
+def test_different_merge_keys_or_expired_window_do_not_merge():
+    projectors, _, history = make_history()
+    with history.action('intensity', projector_ids=[0], merge_key=('intensity', 0)):
+        projectors[0].set_intensity(10)
+    with history.action('intensity', projector_ids=[1], merge_key=('intensity', 1)):
+        projectors[1].set_intensity(10)
+    assert len(history.undo_stack) == 2
+
+    history.merge_window = 0.0
+    history.undo_stack[-1].timestamp -= 1.0
+    with history.action('intensity', projector_ids=[1], merge_key=('intensity', 1)):
+        projectors[1].set_intensity(20)
+    assert len(history.undo_stack) == 3
+
+def test_new_action_clears_redo_stack():
+    projectors, _, history = make_history()
+    with history.action('on', projector_ids=[0]):
+        projectors[0].turn_on()
+    history.undo()
+    with history.action('color', projector_ids=[0]):
+        projectors[0].set_color('#00ff00')
+    assert not history.can_redo()
+
+def test_effects_undo_restores_effect_state():
+    _, effects_manager, history = make_history()
+    with history.action('strobe', projector_ids=[], effects=True):
+        effects_manager.toggle_strobe()
+    assert effects_manager.active_effects['strobe']['active']
+
+    history.undo()
+    assert not effects_manager.active_effects['strobe']['active']
+    history.redo()
+    assert effects_manager.active_effects['strobe']['active']
+
+def test_depth_limit_drops_oldest_entries():
+    projectors, _, history = make_history()
+    history.max_depth = 2
+    for value in (10, 20, 30):
+        with history.action('intensity', projector_ids=[0]):
+            projectors[0].set_intensity(value)
+    assert len(history.undo_stack) == 2
+    history.undo()
+    history.undo()
+    assert projectors[0].intensity == 10
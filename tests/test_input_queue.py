@@ -0,0 +1,60 @@
+"""
+test_input_queue.py - Fusion des entrées opérateur (dernière valeur gagnante) et métriques de latence
+"""
+import time
+from history import UndoHistory
+from input_queue import InputQueue
+from projector import Projector
+
+def test_last_value_wins_per_fixture_and_parameter():
+    projectors = {i: Projector(i) for i in range(2)}
+    queue = InputQueue()
+    for value in (10, 55, 80):
+        queue.submit(0, 'intensity', value)
+    queue.submit(1, 'intensity', 30)
+    queue.submit(0, 'color', '#00ff00')
+    assert queue.depth() == 3
+
+    assert queue.apply(projectors) == 3
+    assert projectors[0].intensity == 80
+    assert projectors[1].intensity == 30
+    assert projectors[0].base_color == '#00ff00'
+    assert queue.depth() == 0
+    assert queue.apply(projectors) == 0
+
+def test_unknown_parameter_and_fixture_are_ignored():
+    projectors = {0: Projector(0)}
+    queue = InputQueue()
+    assert not queue.submit(0, 'pan', 12)
+    assert queue.submit(7, 'is_on', True)
+    assert queue.apply(projectors) == 1
+    assert not projectors[0].is_on
+
+def test_metrics_report_depth_coalescing_and_latency():
+    projectors = {0: Projector(0)}
+    queue = InputQueue()
+    queue.submit(0, 'intensity', 10)
+    time.sleep(0.01)
+    queue.submit(0, 'intensity', 20)
+    metrics = queue.get_metrics()
+    assert (metrics['depth'], metrics['max_depth'], metrics['submitted'], metrics['coalesced']) == (1, 1, 2, 1)
+
+    queue.apply(projectors)
+    metrics = queue.get_metrics()
+    assert metrics['applied'] == 1
+    assert metrics['depth'] == 0
+    # La latence part de la première entrée fusionnée, pas de la dernière
+    assert metrics['latency_max_ms'] >= 10
+    assert metrics['latency_avg_ms'] == metrics['latency_max_ms']
+
+def test_coalesced_drag_is_one_undo_step():
+    projectors = {0: Projector(0)}
+    history = UndoHistory(projectors)
+    queue = InputQueue()
+    initial = projectors[0].intensity
+    for value in (15, 25):
+        queue.submit(0, 'intensity', value)
+        queue.apply(projectors, history)
+    assert projectors[0].intensity == 25
+    assert history.undo() == 'intensity'
+    assert projectors[0].intensity == initial
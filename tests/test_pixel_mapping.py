@@ -0,0 +1,61 @@
+"""
+test_pixel_mapping.py - Index d'échantillonnage, lecture de trames PPM et brutes
+"""
+import pytest
+from pixel_mapping import PixelMapPlayer, SamplingIndex, display_layout, open_source
+
+def write_ppm(path, width, height, pixels, truncate=0):
+    data = f"P6\n# test\n{width} {height}\n255\n".encode() + bytes(pixels)
+    path.write_bytes(data[:len(data) - truncate])
+
+def test_sampling_index_maps_positions_to_byte_offsets():
+    index = SamplingIndex({0: (0.0, 0.0), 1: (0.99, 0.5), 2: (1.5, -1.0), 7: (0.5, 0.5)},
+                          num_projectors=4, width=4, height=2)
+    assert index.offsets == [0, (1 * 4 + 3) * 3, 3 * 3, None]
+
+def test_gather_reads_one_pixel_per_projector():
+    pixels = bytes([255, 0, 0, 0, 255, 0, 0, 0, 255, 16, 32, 48])
+    index = SamplingIndex({0: (0.0, 0.0), 1: (0.3, 0.0), 3: (0.9, 0.0)}, 4, width=4, height=1)
+    assert index.gather(memoryview(pixels)) == ['#ff0000', '#00ff00', None, '#102030']
+
+def test_display_layout_orders_projectors_left_to_right():
+    layout = display_layout(list(range(5)))
+    us = [layout[i][0] for i in range(5)]
+    assert us == sorted(us)
+    assert all(0 < u < 1 for u in us)
+    assert len({v for _, v in layout.values()}) == 1
+
+def test_ppm_frame_and_truncated_image(tmp_path):
+    pixels = [10, 20, 30, 40, 50, 60]
+    write_ppm(tmp_path / 'ok.ppm', 2, 1, pixels)
+    source = open_source(str(tmp_path / 'ok.ppm'))
+    assert (source.width, source.height, source.frame_count) == (2, 1, 1)
+    assert bytes(source.frame(0)) == bytes(pixels)
+
+    write_ppm(tmp_path / 'short.ppm', 2, 1, pixels, truncate=2)
+    with pytest.raises(ValueError):
+        open_source(str(tmp_path / 'short.ppm')).frame(0)
+
+def test_raw_source_requires_size_and_wraps_frames(tmp_path):
+    path = tmp_path / 'frames.rgb'
+    path.write_bytes(bytes([1, 1, 1, 2, 2, 2]))
+    with pytest.raises(ValueError):
+        open_source(str(path))
+    source = open_source(str(path), width=1, height=1)
+    try:
+        assert source.frame_count == 2
+        assert bytes(source.frame(3)) == bytes([2, 2, 2])
+    finally:
+        source.close()
+
+def test_player_decodes_requested_frame_in_background(tmp_path):
+    path = tmp_path / 'frames.rgb'
+    path.write_bytes(bytes([255, 0, 0, 0, 0, 255]))
+    source = open_source(str(path), width=1, height=1)
+    player = PixelMapPlayer(source, SamplingIndex({0: (0.5, 0.5)}, 1, 1, 1), preload=1)
+    try:
+        player.colors(1)
+        assert player.wait_ready(timeout=2.0)
+        assert player.colors(1) == ['#0000ff']
+    finally:
+        player.close()
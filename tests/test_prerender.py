@@ -0,0 +1,69 @@
+"""
+test_prerender.py - Le pré-calcul ne dépend pas du découpage de la conduite en tranches ni de l'heure réelle
+"""
+import pytest
+from effects_manager import EffectsManager
+from prerender import render_chunk
+from projector import Projector
+
+TIMELINE = {
+    'projectors': 5,
+    'duration': 6,
+    'interval': 100,
+    'initial': {'projectors': {str(i): {'color': '#ff8800', 'is_on': True, 'intensity': 80}
+                               for i in range(5)}},
+    'cues': [
+        {'time': 0.5, 'cmd': 'toggle_strobe'},
+        {'time': 1.2, 'cmd': 'define_chase_pattern', 'name': 'aller', 'mode': 'bounce',
+         'steps': [[0, 1], {'fixtures': [2], 'color': '#00ff00'}, [3, 4]]},
+        {'time': 1.2, 'cmd': 'set_chase_pattern', 'name': 'aller'},
+        {'time': 1.5, 'cmd': 'toggle_chaser'},
+        {'time': 2.8, 'cmd': 'toggle_fade'},
+        {'time': 3.7, 'cmd': 'set_color', 'projector': 2, 'color': '#0000ff'},
+        {'time': 4.1, 'cmd': 'toggle_rainbow'},
+        {'time': 5.0, 'cmd': 'toggle_blink', 'projector': 1}
+    ]
+}
+TOTAL = 60
+
+def render_in_chunks(size):
+    return b''.join(render_chunk(TIMELINE, start, min(start + size, TOTAL))
+                    for start in range(0, TOTAL, size))
+
+@pytest.mark.parametrize('size', [1, 7, 13, 59])
+def test_output_is_identical_for_any_chunking(size):
+    assert render_in_chunks(size) == render_chunk(TIMELINE, 0, TOTAL)
+
+def test_output_has_one_record_per_tick_and_changes_over_time():
+    frames = render_chunk(TIMELINE, 0, TOTAL)
+    frame_size = 3 * TIMELINE['projectors']
+    assert len(frames) == TOTAL * frame_size
+    assert len({frames[i:i + frame_size] for i in range(0, len(frames), frame_size)}) > 3
+
+def beat_synced_timeline():
+    """Strobe à 120 BPM synchronisé sur les demi-temps, décrit par une scène"""
+    projectors = {i: Projector(i) for i in range(2)}
+    for projector in projectors.values():
+        projector.turn_on()
+    effects_manager = EffectsManager(projectors)
+    effects_manager.set_bpm(120)
+    effects_manager.set_beat_sync('strobe', 0.5)
+    effects_manager.toggle_strobe()
+    scene = {'projectors': {str(i): p.get_state() for i, p in projectors.items()},
+             'effects': effects_manager.get_state()}
+    return {'projectors': 2, 'duration': 6, 'interval': 100, 'initial': scene,
+            'cues': [{'time': 3.0, 'cmd': 'set_bpm', 'bpm': 60}]}
+
+def lit_frames(frames, frame_size):
+    return [frames[i:i + frame_size] != bytes(frame_size) for i in range(0, len(frames), frame_size)]
+
+def test_beat_synced_strobe_follows_the_timeline_tempo():
+    timeline = beat_synced_timeline()
+    frames = render_chunk(timeline, 0, TOTAL)
+    lit = lit_frames(frames, 6)
+    # 120 BPM : un demi-temps dure 2,5 ticks, allumé sur le premier tiers de chaque période
+    assert lit[:30] == [tick % 5 in (0, 3) for tick in range(30)]
+    # 60 BPM à partir de 3 s, sans saut de phase : un demi-temps dure 5 ticks
+    assert lit[30:] == [tick % 5 in (0, 1) for tick in range(30)]
+    assert b''.join(render_chunk(timeline, start, min(start + 7, TOTAL))
+                    for start in range(0, TOTAL, 7)) == frames
@@ -0,0 +1,45 @@
+"""
+test_profiler_capture.py - Capture cProfile à la demande : enveloppes, fichiers écrits, durée limitée
+"""
+import pstats
+import time
+from profiler_capture import ProfilerCapture
+
+def busy_tick(count):
+    return sum(i * i for i in range(count))
+
+def test_wrapper_only_passes_through_outside_a_capture():
+    profiler = ProfilerCapture()
+    tick = profiler.wrap('engine.tick', busy_tick)
+    assert tick(10) == busy_tick(10)
+    assert profiler.profiles == {}
+    assert profiler.stop() is None
+
+def test_capture_writes_stats_and_summary(tmp_path):
+    filename = str(tmp_path / 'capture.prof')
+    profiler = ProfilerCapture()
+    tick = profiler.wrap('engine.tick', busy_tick)
+    assert profiler.start(0, filename) == filename
+    assert profiler.get_status()['active']
+    for _ in range(3):
+        tick(1000)
+
+    assert profiler.stop() == filename
+    assert not profiler.active
+    assert profiler.get_status()['last_filename'] == filename
+    functions = {name for _, _, name in pstats.Stats(filename).stats}
+    assert 'busy_tick' in functions
+    assert 'busy_tick' in (tmp_path / 'capture.prof.txt').read_text(encoding='utf-8')
+
+def test_capture_stops_itself_after_its_duration(tmp_path):
+    filename = str(tmp_path / 'timed.prof')
+    profiler = ProfilerCapture()
+    tick = profiler.wrap('engine.tick', busy_tick)
+    profiler.start(0.01, filename)
+    time.sleep(0.02)
+    tick(10)
+    deadline = time.monotonic() + 2.0
+    while profiler.last_filename is None and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert not profiler.active
+    assert (tmp_path / 'timed.prof').exists()
@@ -0,0 +1,142 @@
+"""
+test_remote_server.py - Protocole de contrôle à distance : chemins d'erreur, client local, commandes de fichiers
+"""
+import asyncio
+import json
+import threading
+import time
+import pytest
+import config
+from effects_manager import EffectsManager
+from engine import RenderEngine
+from projector import Projector
+from remote_server import RemoteControlServer
+from scene_manager import SceneManager
+
+class ThreadEngine:
+    """Moteur minimal : exécute chaque commande planifiée dans un autre thread"""
+
+    def is_running(self):
+        return True
+
+    def call_soon(self, callback):
+        threading.Thread(target=callback).start()
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.FILES_CONFIG, 'scenes_file', str(tmp_path / 'scenes.json'))
+    projectors = {i: Projector(i) for i in range(4)}
+    effects_manager = EffectsManager(projectors)
+    scene_manager = SceneManager(projectors, effects_manager)
+    return RemoteControlServer(projectors, effects_manager, scene_manager)
+
+def send(server, message):
+    line = message if isinstance(message, bytes) else json.dumps(message).encode('utf-8')
+    return asyncio.run(server.handle_message(line))['results']
+
+def test_invalid_json_returns_error(server):
+    results = send(server, b'{pas du json')
+    assert not results[0]['ok']
+    assert 'JSON invalide' in results[0]['error']
+
+def test_unknown_and_malformed_commands_in_batch(server):
+    results = send(server, {'batch': [{'cmd': 'inconnue', 'id': 1}, 42, {'cmd': 'turn_on', 'projector': 0}]})
+    assert results[0] == {'id': 1, 'ok': False, 'error': 'Commande inconnue: inconnue'}
+    assert results[1]['error'] == 'Commande invalide'
+    assert results[2]['ok']
+
+def test_missing_or_invalid_parameters(server):
+    results = send(server, [{'cmd': 'set_intensity', 'projector': 0},
+                            {'cmd': 'set_intensity', 'projector': 99, 'value': 10},
+                            {'cmd': 'set_intensity', 'projector': 'x', 'value': 10}])
+    assert [result['ok'] for result in results] == [False, False, False]
+
+def test_invalid_colours_are_rejected_before_mutation(server):
+    before = server.projectors[0].base_color
+    results = send(server, [{'cmd': 'set_color', 'projector': 0, 'color': 'red'},
+                            {'cmd': 'set_fade_colors', 'color1': '#000000', 'color2': '#12345'},
+                            {'cmd': 'find_scenes', 'color': 5},
+                            {'cmd': 'group_set_color', 'projectors': [0], 'color': '#zzzzzz'}])
+    assert not any(result['ok'] for result in results)
+    assert server.projectors[0].base_color == before
+
+def test_out_of_range_group_ids_are_rejected(server):
+    results = send(server, {'cmd': 'group_turn_on', 'projectors': [0, 10 ** 9]})
+    assert not results[0]['ok']
+
+def test_unexpected_handler_error_still_answers(server):
+    def broken(command):
+        raise RuntimeError("panne")
+    server.commands['broken'] = broken
+    results = send(server, {'cmd': 'broken', 'id': 'a'})
+    assert results == [{'id': 'a', 'ok': False, 'error': "Erreur d'exécution: panne"}]
+
+def test_batch_failure_on_engine_thread_resolves_every_command(server, monkeypatch):
+    server.engine = ThreadEngine()
+    def failing_execute(command):
+        raise RuntimeError("moteur")
+    monkeypatch.setattr(server, 'execute', failing_execute)
+    results = send(server, [{'cmd': 'turn_on', 'projector': 0, 'id': 1}, {'cmd': 'turn_off', 'projector': 1, 'id': 2}])
+    assert [(result['id'], result['ok']) for result in results] == [(1, False), (2, False)]
+
+def test_subscribe_requires_a_connection(server):
+    results = send(server, {'cmd': 'subscribe'})
+    assert not results[0]['ok']
+
+def test_local_client_sends_a_batch_over_tcp(server):
+    server.port = 0
+    port = server.start()
+
+    async def client():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        batch = {'batch': [{'cmd': 'turn_on', 'projector': 1, 'id': 1},
+                           {'cmd': 'set_intensity', 'projector': 1, 'value': 40, 'id': 2},
+                           {'cmd': 'toggle_strobe', 'id': 3}]}
+        writer.write((json.dumps(batch) + '\n').encode('utf-8'))
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        writer.close()
+        await writer.wait_closed()
+        return response['results']
+
+    try:
+        results = asyncio.run(client())
+    finally:
+        server.stop()
+    assert results == [{'id': 1, 'ok': True, 'result': True},
+                       {'id': 2, 'ok': True, 'result': 40},
+                       {'id': 3, 'ok': True, 'result': True}]
+    assert server.projectors[1].is_on
+
+class SlowSceneManager(SceneManager):
+    """Bibliothèque dont l'écriture du fichier prend du temps"""
+
+    def save_scenes_to_file(self):
+        self.writer_thread = threading.current_thread()
+        time.sleep(0.3)
+        return super().save_scenes_to_file()
+
+def test_scene_file_commands_run_off_the_engine_tick(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.FILES_CONFIG, 'scenes_file', str(tmp_path / 'scenes.json'))
+    projectors = {i: Projector(i) for i in range(2)}
+    effects_manager = EffectsManager(projectors)
+    engine = RenderEngine(projectors, effects_manager)
+    engine.interval = 0.01
+    scene_manager = SlowSceneManager(projectors, effects_manager, state_lock=engine.state_lock)
+    server = RemoteControlServer(projectors, effects_manager, scene_manager, engine)
+    engine.start()
+    try:
+        sequence = engine.sequence
+        results = send(server, [{'cmd': 'set_color', 'projector': 0, 'color': '#00ff00'},
+                                {'cmd': 'save_scene', 'name': 'Vert'},
+                                {'cmd': 'set_color', 'projector': 0, 'color': '#0000ff'},
+                                {'cmd': 'list_scenes'}])
+        # Le moteur a continué de tourner pendant l'écriture du fichier
+        assert engine.sequence - sequence > 10
+    finally:
+        engine.stop()
+    assert [result['ok'] for result in results] == [True, True, True, True]
+    assert results[3]['result'] == ['Vert']
+    assert scene_manager.writer_thread.name.startswith('remote-files')
+    assert scene_manager.scenes['Vert']['projectors']['0']['color'] == '#00ff00'
+    assert projectors[0].base_color == '#0000ff'
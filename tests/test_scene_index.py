@@ -0,0 +1,57 @@
+"""
+test_scene_index.py - Requêtes de l'index des scènes et maintien à jour incrémental
+"""
+from scene_index import SceneIndex
+
+def scene(colors, lit=(), effects=None):
+    """Scène au format sauvegardé : une couleur par projecteur, certains allumés"""
+    return {
+        'projectors': {str(i): {'color': color, 'is_on': i in lit, 'intensity': 100}
+                       for i, color in enumerate(colors)},
+        'effects': effects
+    }
+
+def build_index():
+    index = SceneIndex()
+    index.rebuild({
+        'Intro': scene(['#FF0000', '#000000'], lit=[0]),
+        'Interlude': scene(['#ff0000', '#00ff00'], lit=[0, 1], effects={'strobe_active': True}),
+        'Final': scene(['#0000ff', '#0000ff'], lit=[1],
+                       effects={'chaser_active': True, 'individual_blinks_active': {'1': True}})
+    })
+    return index
+
+def test_query_by_each_criterion():
+    index = build_index()
+    assert index.query(color='#ff0000') == ['Interlude', 'Intro']
+    assert index.query(lit=1) == ['Final', 'Interlude']
+    assert index.query(effect='blink') == ['Final']
+    assert index.query(prefix='Int') == ['Interlude', 'Intro']
+
+def test_query_intersects_criteria():
+    index = build_index()
+    assert index.query(color='#FF0000', lit=[0, 1]) == ['Interlude']
+    assert index.query(prefix='Int', effect='strobe') == ['Interlude']
+    assert index.query(color='#0000ff', effect='strobe') == []
+
+def test_query_without_criteria_returns_all_names_sorted():
+    assert build_index().query() == ['Final', 'Interlude', 'Intro']
+
+def test_replace_and_remove_update_inverted_indexes():
+    index = build_index()
+    index.add('Intro', scene(['#00ff00', '#00ff00'], lit=[1]))
+    assert index.query(color='#ff0000') == ['Interlude']
+    assert index.query(lit=0) == ['Interlude']
+
+    assert index.remove('Interlude')
+    assert not index.remove('Interlude')
+    assert 'Interlude' not in index.sorted_names
+    assert '#ff0000' not in index.by_color
+    assert index.query(effect='strobe') == []
+
+def test_compute_info_accepts_legacy_scene_format():
+    info = SceneIndex.compute_info('Ancienne', {'0': {'color': '#ABCDEF', 'is_on': True}, '1': 'invalide'})
+    assert info['colors'] == ['#abcdef']
+    assert info['lit_projectors'] == [0]
+    assert info['projectors_count'] == 2
+    assert not info['has_effects']
@@ -0,0 +1,101 @@
+"""
+test_scene_watcher.py - Relecture incrémentale du fichier de scènes modifié par un autre outil
+"""
+import json
+import threading
+import time
+import pytest
+import config
+from projector import Projector
+from scene_manager import SceneManager
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.FILES_CONFIG, 'scenes_file', str(tmp_path / 'scenes.json'))
+    projectors = {i: Projector(i) for i in range(2)}
+    manager = SceneManager(projectors)
+    manager.save_scene('Intro')
+    manager.save_scene('Final')
+    return manager
+
+def poll_until_changed(manager, timeout=2.0):
+    """Interroge le gestionnaire jusqu'à ce que la relecture de fond soit appliquée"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        manager.watcher.last_poll_time = 0.0
+        changed = manager.poll_file_changes()
+        if changed:
+            return changed
+        time.sleep(0.01)
+    return set()
+
+def edit_file(manager, edit):
+    with open(manager.scenes_file, encoding='utf-8') as f:
+        scenes = json.load(f)
+    edit(scenes)
+    with open(manager.scenes_file, 'w', encoding='utf-8') as f:
+        json.dump(scenes, f, indent=4)
+
+def test_external_edit_reloads_only_changed_scenes(manager):
+    final_before = manager.scenes['Final']
+
+    def edit(scenes):
+        scenes['Intro']['projectors']['0']['color'] = '#123456'
+        scenes['Nouvelle'] = scenes['Final']
+    edit_file(manager, edit)
+
+    assert poll_until_changed(manager) == {'Intro', 'Nouvelle'}
+    assert manager.scenes['Final'] is final_before
+    assert manager.find_scenes(color='#123456') == ['Intro']
+
+def test_scene_removed_externally_leaves_the_index(manager):
+    edit_file(manager, lambda scenes: scenes.pop('Final'))
+    assert poll_until_changed(manager) == {'Final'}
+    assert 'Final' not in manager.scenes
+    assert manager.find_scenes(prefix='Fin') == []
+
+def test_local_writes_are_not_reloaded(manager):
+    manager.save_scene('Locale')
+    assert poll_until_changed(manager, timeout=0.2) == set()
+
+def test_quick_scene_is_found_while_the_background_load_runs(manager):
+    manager.projectors[0].set_color('#00ff00')
+    manager.save_quick_scene(0)
+    saved = manager.scenes['Quick_0']
+
+    projectors = {i: Projector(i) for i in range(2)}
+    starting = SceneManager(projectors, background_load=True)
+    assert not starting.loaded
+    # Un rappel rapide pendant le chargement ne doit pas reprogrammer la scène
+    assert starting.has_quick_scene(0)
+    assert starting.loaded
+    assert starting.scenes['Quick_0'] == saved
+    assert not starting.has_quick_scene(1)
+
+def test_library_is_consistent_when_written_from_two_threads(manager):
+    for i in range(300):
+        manager.scenes[f"Archive_{i}"] = manager.scenes['Intro']
+    errors = []
+
+    def save_many():
+        try:
+            for i in range(100):
+                manager.save_scene(f"Auto_{i % 20}")
+                if i % 3 == 0:
+                    manager.delete_scene(f"Auto_{(i + 7) % 20}")
+        except Exception as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=save_many)
+    worker.start()
+    saved = []
+    while worker.is_alive():
+        manager.get_scene_list()
+        manager.find_scenes(prefix='Auto_')
+        saved.append(manager.save_scenes_to_file())
+    worker.join()
+    assert errors == []
+    assert all(saved)
+
+    with open(manager.scenes_file, encoding='utf-8') as f:
+        assert json.load(f) == manager.scenes
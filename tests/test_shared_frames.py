@@ -0,0 +1,57 @@
+"""
+test_shared_frames.py - Anneau de trames en mémoire partagée : lecture, trames sautées et déchirées
+"""
+import pytest
+from shared_frames import HEADER, MAGIC, SLOT_HEADER, SharedFrameReader, SharedFrameWriter, pack_colors, unpack_colors
+
+@pytest.fixture
+def ring():
+    writer = SharedFrameWriter(num_projectors=2, slots=4)
+    reader = SharedFrameReader(writer.name)
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+def test_colors_round_trip_through_packed_bytes():
+    assert unpack_colors(pack_colors(('#ff8000', 'black'))) == ('#ff8000', '#000000')
+
+def test_reader_returns_latest_frame_once(ring):
+    writer, reader = ring
+    assert reader.read_latest() is None
+    writer.write_packed(1, 10.0, pack_colors(('#010203', '#040506')))
+    sequence, timestamp, data = reader.read_latest()
+    assert (sequence, timestamp) == (1, 10.0)
+    assert unpack_colors(data) == ('#010203', '#040506')
+    assert reader.read_latest() is None
+
+def test_frames_overtaken_by_the_writer_are_counted_as_dropped(ring):
+    writer, reader = ring
+    writer.write_packed(1, 1.0, pack_colors(('#000000', '#000000')))
+    reader.read_latest()
+    for sequence in (2, 3, 4):
+        writer.write_packed(sequence, float(sequence), pack_colors(('#ffffff', '#000000')))
+    assert reader.read_latest()[0] == 4
+    assert reader.dropped == 2
+
+def test_slot_being_written_is_skipped_as_torn(ring):
+    writer, reader = ring
+    writer.write_packed(1, 1.0, pack_colors(('#000000', '#000000')))
+    reader.read_latest()
+
+    # Écriture interrompue : le numéro de l'emplacement est encore à zéro
+    offset = HEADER.size + (2 % writer.slots) * writer.slot_size
+    SLOT_HEADER.pack_into(writer.memory.buf, offset, 0, 2.0)
+    HEADER.pack_into(writer.memory.buf, 0, MAGIC, writer.slots, writer.num_projectors, 2)
+    assert reader.read_latest() is None
+    assert reader.torn == 1
+    assert reader.last_sequence == 1
+
+    writer.write_packed(2, 2.0, pack_colors(('#00ff00', '#000000')))
+    assert reader.read_latest()[0] == 2
+    assert reader.dropped == 0
+
+def test_reader_rejects_foreign_memory(ring):
+    writer, reader = ring
+    HEADER.pack_into(writer.memory.buf, 0, b'XXXX', 4, 2, 0)
+    with pytest.raises(ValueError):
+        SharedFrameReader(writer.name)
@@ -0,0 +1,99 @@
+"""
+tick_metrics.py - Chronométrage des phases de chaque tick (moteur et boucle d'affichage)
+
+Chaque phase conserve une fenêtre glissante de durées (p50/p99, histogramme) ; les ticks
+en retard sont comptés par boucle. Le coût d'enregistrement se limite à un ajout en file.
+"""
+import json
+import time
+from collections import deque
+from config import METRICS_CONFIG
+
+class TickMetrics:
+    """Fenêtres glissantes de durées par phase et compteurs de ticks en retard"""
+
+    def __init__(self, window=None):
+        self.window = window or METRICS_CONFIG['window']
+        self.phases = {}
+        self.counts = {}
+        self.late = {}
+
+    def record(self, phase, seconds):
+        """Enregistre la durée d'une phase (secondes)"""
+        samples = self.phases.get(phase)
+        if samples is None:
+            samples = self.phases[phase] = deque(maxlen=self.window)
+            self.counts[phase] = 0
+        samples.append(seconds)
+        self.counts[phase] += 1
+
+    def count_late(self, loop, count=1):
+        """Compte des ticks en retard pour une boucle ('engine', 'display')"""
+        self.late[loop] = self.late.get(loop, 0) + count
+
+    def wrap(self, phase, function):
+        """Retourne la fonction chronométrée sous le nom de phase donné"""
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(phase, time.perf_counter() - started)
+        return timed
+
+    def _sorted_samples(self, phase):
+        """Copie triée de la fenêtre d'une phase"""
+        return sorted(tuple(self.phases.get(phase, ())))
+
+    def summary(self):
+        """Retourne, par phase, le nombre d'appels et les durées p50/p99/max (ms)"""
+        phases = {}
+        for phase in sorted(self.phases):
+            samples = self._sorted_samples(phase)
+            if not samples:
+                continue
+            phases[phase] = {
+                'count': self.counts[phase],
+                'avg_ms': sum(samples) / len(samples) * 1000,
+                'p50_ms': samples[len(samples) // 2] * 1000,
+                'p99_ms': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+                'max_ms': samples[-1] * 1000
+            }
+        return {'phases': phases, 'late_ticks': dict(self.late)}
+
+    def histogram(self, phase):
+        """Retourne la répartition de la fenêtre d'une phase par tranche de durée (ms)"""
+        bounds = METRICS_CONFIG['histogram_buckets_ms']
+        buckets = [0] * (len(bounds) + 1)
+        for seconds in tuple(self.phases.get(phase, ())):
+            milliseconds = seconds * 1000
+            position = 0
+            while position < len(bounds) and milliseconds > bounds[position]:
+                position += 1
+            buckets[position] += 1
+        labels = [f"<={bound}" for bound in bounds] + [f">{bounds[-1]}"]
+        return dict(zip(labels, buckets))
+
+    def format_overlay(self):
+        """Texte de l'incrustation : une ligne par phase, puis les ticks en retard"""
+        summary = self.summary()
+        lines = [f"{'phase':<28}{'p50':>8}{'p99':>8}"]
+        for phase, stats in summary['phases'].items():
+            lines.append(f"{phase:<28}{stats['p50_ms']:>8.2f}{stats['p99_ms']:>8.2f}")
+        late = ", ".join(f"{loop}={count}" for loop, count in sorted(summary['late_ticks'].items()))
+        lines.append(f"retards: {late or '0'}")
+        return "\n".join(lines)
+
+    def export(self, filename=None):
+        """Écrit le résumé et les histogrammes dans un fichier JSON ; retourne son nom"""
+        filename = filename or time.strftime(METRICS_CONFIG['export_pattern'])
+        report = self.summary()
+        report['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        report['histograms'] = {phase: self.histogram(phase) for phase in sorted(self.phases)}
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            print(f"Erreur lors de l'export des métriques: {e}")
+            return None
+        return filename
@@ -0,0 +1,66 @@
+"""
+visualizer.py - Écran de projection dans un processus séparé, alimenté par la mémoire partagée
+"""
+import multiprocessing
+import tkinter as tk
+from config import DISPLAY_CONFIG, LABELS, UI_CONFIG, VISUALIZER_CONFIG
+from engine import Frame
+from gui_components import ProjectorDisplay
+from projector import Projector
+from shared_frames import SharedFrameReader, unpack_colors
+
+class VisualizerWindow:
+    """Fenêtre autonome qui affiche les trames lues dans l'anneau de mémoire partagée"""
+
+    def __init__(self, root, shm_name):
+        self.root = root
+        self.reader = SharedFrameReader(shm_name)
+        self.projectors = {i: Projector(i) for i in range(self.reader.num_projectors)}
+
+        self.root.title(f"{UI_CONFIG['window_title']} - {LABELS['projection_screen']}")
+        self.root.configure(bg=UI_CONFIG['panel_color'])
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        tk.Label(self.root, text=LABELS['projection_screen'],
+                bg=UI_CONFIG['panel_color'], fg="white", font=('Arial', 10, 'bold')).pack(pady=5)
+
+        width = (DISPLAY_CONFIG['start_x'] * 2 + len(self.projectors)
+                 * (DISPLAY_CONFIG['projector_width'] + DISPLAY_CONFIG['spacing']))
+        self.canvas = tk.Canvas(self.root, width=width,
+                               height=DISPLAY_CONFIG['canvas_height'], bg="black")
+        self.canvas.pack(padx=10, pady=10)
+        self.display = ProjectorDisplay(self.canvas, self.projectors)
+
+        self.refresh()
+
+    def refresh(self):
+        """Affiche la dernière trame disponible ; les trames intermédiaires sont abandonnées"""
+        latest = self.reader.read_latest()
+        if latest is not None:
+            sequence, timestamp, data = latest
+            frame = Frame(sequence, timestamp, tuple(self.projectors.keys()), unpack_colors(data))
+            self.display.show_frame(frame)
+        self.root.after(VISUALIZER_CONFIG['refresh_interval'], self.refresh)
+
+    def close(self):
+        """Ferme la fenêtre et détache la mémoire partagée"""
+        self.reader.close()
+        self.root.destroy()
+
+def run_visualizer(shm_name):
+    """Point d'entrée du processus de visualisation"""
+    root = tk.Tk()
+    VisualizerWindow(root, shm_name)
+    root.mainloop()
+
+def start_visualizer_process(shm_name):
+    """Lance le visualiseur dans un processus séparé
+
+    Le processus est toujours démarré par 'spawn' : un fork copierait l'état Tk et les threads
+    (moteur, serveur, sauvegarde) du processus principal, ce que Tk ne supporte pas.
+    """
+    context = multiprocessing.get_context('spawn')
+    process = context.Process(target=run_visualizer, args=(shm_name,),
+                              name="visualizer", daemon=True)
+    process.start()
+    return process